@@ -3,6 +3,7 @@
 import os
 import platform
 import shutil
+import sys
 from contextlib import chdir
 from pathlib import Path
 
@@ -10,6 +11,11 @@ import pytest
 from pyrig.src.processes import run_subprocess
 
 import video_vault
+from video_vault import main as main_module
+
+# imported when they are first used, not to show the downloads
+LAZY_MODULES = ("yt_dlp", "imageio_ffmpeg", "pyqttoast", "PySide6.QtWebEngineCore")
+IMPORT_TIME_BUDGET_US = 3_000_000
 
 
 def test_main(main_test_fixture: None) -> None:
@@ -54,3 +60,27 @@ def test_run(tmp_path: Path) -> None:
         # python -m video_vault.main
 
         run_subprocess(["uv", "run", "-m", "video_vault.main"], env=env)
+
+
+def test_import_time() -> None:
+    """Test the import time of the main module stays within its budget."""
+    result = run_subprocess(
+        [sys.executable, "-X", "importtime", "-c", f"import {main_module.__name__}"],
+        text=True,
+    )
+    # lines are "import time: <self us> | <cumulative us> | <indented module name>"
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            cumulative_us[name.strip()] = int(cumulative)
+
+    for module_name in LAZY_MODULES:
+        assert module_name not in cumulative_us, (
+            f"{module_name} should be imported when first used"
+        )
+    assert cumulative_us[main_module.__name__] < IMPORT_TIME_BUDGET_US, (
+        f"Import of {main_module.__name__} should stay within its budget"
+    )
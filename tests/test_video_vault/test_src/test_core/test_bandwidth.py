@@ -0,0 +1,302 @@
+"""module."""
+
+import io
+import math
+from typing import Any
+
+import pytest
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture, MockType
+
+from video_vault.src.core import bandwidth as bandwidth_module
+from video_vault.src.core.bandwidth import (
+    BURST_S,
+    SCHEDULE_REFRESH_S,
+    BandwidthGovernor,
+    BandwidthLimiter,
+    LimitedReader,
+    TokenBucket,
+    get_fair_rates,
+)
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
+
+
+@pytest.fixture
+def mock_monotonic(mocker: MockerFixture) -> MockType:
+    """Mock the clock of the bandwidth module, starting at 0."""
+    mock: MockType = mocker.patch(
+        make_obj_importpath(bandwidth_module) + ".time.monotonic", return_value=0.0
+    )
+    return mock
+
+
+@pytest.fixture
+def mock_get_rate_limit(mocker: MockerFixture) -> MockType:
+    """Mock the schedule, unlimited by default."""
+    mock: MockType = mocker.patch(
+        make_obj_importpath(bandwidth_module) + ".BandwidthSchedule.get_rate_limit",
+        return_value=None,
+    )
+    return mock
+
+
+def test_get_fair_rates() -> None:
+    """Test func for get_fair_rates."""
+    assert get_fair_rates(None, {1: None, 2: 100}) == {1: None, 2: 100}, (
+        "Without a total only the caps apply"
+    )
+    assert get_fair_rates(300, {1: None, 2: None, 3: None}) == {
+        1: 100,
+        2: 100,
+        3: 100,
+    }, "Should split the total equally"
+    assert get_fair_rates(300, {1: None, 2: 50, 3: None}) == {
+        1: 125,
+        2: 50,
+        3: 125,
+    }, "Leftover of capped jobs should go to the others"
+    assert get_fair_rates(300, {}) == {}, "Nothing to split without jobs"
+
+
+class TestTokenBucket:
+    """Test class for TokenBucket."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        rate = 100
+        bucket = TokenBucket(rate)
+
+        assert bucket.rate == rate, "Rate should be set"
+        assert bucket.tokens == bucket.capacity, "Bucket should start full"
+
+    def test_capacity(self) -> None:
+        """Test method for capacity."""
+        assert TokenBucket(100).capacity == 100 * BURST_S, (
+            "Should hold BURST_S seconds of the rate"
+        )
+        assert TokenBucket().capacity == 0, "Unlimited bucket holds nothing"
+
+    def test_set_rate(self, mock_monotonic: MockType) -> None:
+        """Test method for set_rate."""
+        bucket = TokenBucket(1000)
+        rate = 10
+
+        bucket.set_rate(rate)
+
+        assert bucket.rate == rate, "Rate should be changed"
+        assert bucket.tokens == rate * BURST_S, "Tokens should fit the new capacity"
+        mock_monotonic.assert_called()
+
+    def test_reserve(self, mock_monotonic: MockType) -> None:
+        """Test method for reserve."""
+        bucket = TokenBucket(100)
+
+        bucket.reserve(300)
+
+        assert bucket.tokens == 100 * BURST_S - 300, "Should go into debt"
+        mock_monotonic.assert_called()
+
+        unlimited = TokenBucket()
+        unlimited.reserve(300)
+        assert unlimited.tokens == 0, "Unlimited bucket should not take tokens"
+
+    def test_get_wait(self, mock_monotonic: MockType) -> None:
+        """Test method for get_wait."""
+        bucket = TokenBucket(100)
+        assert bucket.get_wait() == 0, "Full bucket should not wait"
+
+        bucket.reserve(300)
+        assert bucket.get_wait() == pytest.approx(2.0), "Should wait off the debt"
+
+        mock_monotonic.return_value = 1.0
+        assert bucket.get_wait() == pytest.approx(1.0), "Debt should be paid off"
+
+        bucket.set_rate(0)
+        assert math.isinf(bucket.get_wait()), "Paused bucket should wait"
+        bucket.set_rate(None)
+        assert bucket.get_wait() == 0, "Unlimited bucket should not wait"
+
+    def test_refill(self, mock_monotonic: MockType) -> None:
+        """Test method for refill."""
+        bucket = TokenBucket(100)
+        bucket.tokens = 0
+
+        mock_monotonic.return_value = 0.5
+        bucket.refill()
+        assert bucket.tokens == pytest.approx(50), "Should refill at the rate"
+
+        mock_monotonic.return_value = 10.0
+        bucket.refill()
+        assert bucket.tokens == bucket.capacity, "Should not exceed the capacity"
+
+
+class TestBandwidthLimiter:
+    """Test class for BandwidthLimiter."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test method for __init__."""
+        governor = mocker.Mock()
+
+        rate_limit = 100
+        limiter = BandwidthLimiter(governor, rate_limit)
+
+        assert limiter.governor is governor, "Governor should be set"
+        assert limiter.rate_limit == rate_limit, "Rate limit should be set"
+        assert limiter.bucket.rate is None, "Governor should set the rate"
+        assert limiter.downloaded_bytes == {}, "Nothing should be downloaded"
+
+    def test_consume(self, mocker: MockerFixture, mock_monotonic: MockType) -> None:
+        """Test method for consume."""
+        governor = mocker.Mock()
+        cancel_token = CancelToken()
+        limiter = BandwidthLimiter(governor, cancel_token=cancel_token)
+        # a new bucket starts empty
+        limiter.bucket.set_rate(100)
+
+        def advance_clock(seconds: float) -> None:
+            mock_monotonic.return_value += seconds
+
+        mock_sleep = mocker.patch(
+            make_obj_importpath(bandwidth_module) + ".time.sleep",
+            side_effect=advance_clock,
+        )
+
+        limiter.consume(150)
+
+        assert sum(call.args[0] for call in mock_sleep.call_args_list) == (
+            pytest.approx(1.5)
+        ), "Should wait until the bytes are covered"
+        governor.refresh_schedule.assert_called()
+
+        # a cancelled download stops waiting
+        cancel_token.cancel()
+        with pytest.raises(DownloadCancelledError):
+            limiter.consume(1000)
+
+    def test_progress_hook(self, mocker: MockerFixture) -> None:
+        """Test method for progress_hook."""
+        limiter = BandwidthLimiter(mocker.Mock())
+        mock_consume = mocker.patch.object(limiter, "consume")
+
+        def downloading(filename: str, downloaded_bytes: int) -> dict[str, Any]:
+            return {
+                "status": "downloading",
+                "tmpfilename": filename,
+                "downloaded_bytes": downloaded_bytes,
+            }
+
+        limiter.progress_hook(downloading("video.part", 0))
+        limiter.progress_hook(downloading("video.part", 10))
+        limiter.progress_hook(downloading("video.part", 25))
+        limiter.progress_hook(downloading("video.part", 25))
+        limiter.progress_hook(downloading("audio.part", 0))
+        limiter.progress_hook(downloading("audio.part", 5))
+
+        assert mock_consume.call_args_list == [
+            mocker.call(10),
+            mocker.call(15),
+            mocker.call(5),
+        ], "Should consume the new bytes of each file"
+
+        # the finished status reports the whole file under its final name
+        mock_consume.reset_mock()
+        limiter.progress_hook(
+            {"status": "finished", "filename": "video.mp4", "downloaded_bytes": 25}
+        )
+        mock_consume.assert_not_called()
+
+        # a resumed file starts at the bytes already on disk
+        limiter = BandwidthLimiter(mocker.Mock())
+        mock_consume = mocker.patch.object(limiter, "consume")
+        limiter.progress_hook(downloading("video.part", 2_000_000))
+        limiter.progress_hook(downloading("video.part", 2_000_100))
+
+        expected_size = 100
+        mock_consume.assert_called_once_with(expected_size)
+
+
+class TestLimitedReader:
+    """Test class for LimitedReader."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test method for __init__."""
+        stream = io.BytesIO()
+        limiter = mocker.Mock()
+
+        reader = LimitedReader(stream, limiter)
+
+        assert reader.stream is stream, "Stream should be set"
+        assert reader.limiter is limiter, "Limiter should be set"
+
+    def test_read(self, mocker: MockerFixture) -> None:
+        """Test method for read."""
+        limiter = mocker.Mock()
+        reader = LimitedReader(io.BytesIO(b"abcdef"), limiter)
+
+        assert reader.read(4) == b"abcd", "Should read from the stream"
+        limiter.consume.assert_called_once_with(4)
+
+
+class TestBandwidthGovernor:
+    """Test class for BandwidthGovernor."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        governor = BandwidthGovernor()
+
+        assert governor.limiters == {}, "Nothing should be limited"
+        assert governor.rate_limit is None, "Should be unlimited"
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert BandwidthGovernor.get_instance() is BandwidthGovernor.get_instance(), (
+            "Should always return the same governor"
+        )
+
+    def test_limit(self, mock_get_rate_limit: MockType) -> None:
+        """Test method for limit."""
+        total, cap = 300, 100
+        mock_get_rate_limit.return_value = total
+        governor = BandwidthGovernor()
+
+        with governor.limit(1) as first:
+            assert first.bucket.rate == total, "Single job gets everything"
+            with governor.limit(2, rate_limit=cap) as second:
+                assert second.bucket.rate == cap, "Capped job gets its cap"
+                assert first.bucket.rate == total - cap, "Leftover goes to the other"
+            assert first.bucket.rate == total, "Finished job frees its share"
+        assert governor.limiters == {}, "Finished jobs should be removed"
+
+    def test_refresh_schedule(
+        self, mock_get_rate_limit: MockType, mock_monotonic: MockType
+    ) -> None:
+        """Test method for refresh_schedule."""
+        governor = BandwidthGovernor()
+        governor.refresh_schedule()
+        day_rate, evening_rate = 100, 50
+        mock_get_rate_limit.return_value = day_rate
+
+        governor.refresh_schedule()
+        assert governor.rate_limit != day_rate, "Schedule should be read once a while"
+
+        mock_monotonic.return_value = SCHEDULE_REFRESH_S
+        governor.refresh_schedule()
+        assert governor.rate_limit == day_rate, "Schedule should be read again"
+
+        mock_get_rate_limit.return_value = evening_rate
+        governor.refresh_schedule(force=True)
+        assert governor.rate_limit == evening_rate, "Forced refresh should read it"
+
+    def test_rebalance(self) -> None:
+        """Test method for rebalance."""
+        governor = BandwidthGovernor()
+        governor.rate_limit = 100
+        first = BandwidthLimiter(governor)
+        second = BandwidthLimiter(governor)
+        governor.limiters = {1: first, 2: second}
+
+        governor.rebalance()
+
+        expected_rate = 50
+        assert first.bucket.rate == expected_rate, "Should split the rate"
+        assert second.bucket.rate == expected_rate, "Should split the rate"
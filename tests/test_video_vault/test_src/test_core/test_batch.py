@@ -0,0 +1,221 @@
+"""module."""
+
+from typing import TYPE_CHECKING
+
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.core import batch as batch_module
+from video_vault.src.core.batch import (
+    BatchImportWorker,
+    DownloadBatch,
+    expand_urls,
+    extract_entry_urls,
+    get_entry_urls,
+    parse_urls,
+)
+
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie
+
+
+def test_parse_urls() -> None:
+    """Test func for parse_urls."""
+    text = """
+    https://a.com/1
+    not a url
+    http://b.com/2
+
+    https://a.com/1
+    """
+
+    assert parse_urls(text) == ["https://a.com/1", "http://b.com/2"], (
+        "Should keep unique urls in order"
+    )
+
+
+def test_extract_entry_urls(mocker: MockerFixture) -> None:
+    """Test func for extract_entry_urls."""
+    cookies: list[Cookie] = []
+    playlist_url = "https://a.com/playlist"
+    mock_ydl_instance = mocker.Mock()
+    mock_ydl_instance.extract_info.return_value = {
+        "_type": "playlist",
+        "entries": [{"url": "https://a.com/1"}, {"url": "https://a.com/2"}],
+    }
+    mock_ydl_class = mocker.patch(
+        make_obj_importpath(batch_module) + ".yt_dlp.YoutubeDL"
+    )
+    mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+
+    result = extract_entry_urls(playlist_url, cookies)
+
+    assert result == ["https://a.com/1", "https://a.com/2"], (
+        "Should return the entry urls"
+    )
+    assert mock_ydl_class.call_args[0][0]["extract_flat"] == "in_playlist", (
+        "Entries should not be resolved"
+    )
+    mock_ydl_instance.extract_info.assert_called_once_with(playlist_url, download=False)
+
+    # failed extractions keep the url so the download job records the error
+    mock_ydl_instance.extract_info.side_effect = Exception("Network error")
+    assert extract_entry_urls(playlist_url, cookies) == [playlist_url], (
+        "Should fall back to the url"
+    )
+
+
+def test_get_entry_urls() -> None:
+    """Test func for get_entry_urls."""
+    video = {"webpage_url": "https://a.com/video"}
+    assert get_entry_urls(video) == ["https://a.com/video"], (
+        "A video should return its own url"
+    )
+
+    channel = {
+        "_type": "playlist",
+        "entries": [
+            {"_type": "url", "url": "https://a.com/1"},
+            None,
+            {
+                "_type": "playlist",
+                "entries": [{"_type": "url", "url": "https://a.com/2"}],
+            },
+        ],
+    }
+    assert get_entry_urls(channel) == ["https://a.com/1", "https://a.com/2"], (
+        "Should flatten nested playlists and skip unavailable entries"
+    )
+
+    assert get_entry_urls({"_type": "playlist", "entries": []}) == [], (
+        "Empty playlist should have no urls"
+    )
+
+
+def test_expand_urls(mocker: MockerFixture) -> None:
+    """Test func for expand_urls."""
+    entries = {
+        "https://a.com/playlist": ["https://a.com/1", "https://a.com/2"],
+        "https://a.com/1": ["https://a.com/1"],
+        "https://b.com/video": ["https://b.com/video"],
+    }
+    mock_extract_entry_urls = mocker.patch(
+        make_obj_importpath(batch_module) + ".extract_entry_urls",
+        side_effect=lambda url, _cookies: entries[url],
+    )
+
+    result = expand_urls(list(entries), [], max_workers=2)
+
+    assert result == ["https://a.com/1", "https://a.com/2", "https://b.com/video"], (
+        "Should keep the order and remove duplicates"
+    )
+    assert mock_extract_entry_urls.call_count == len(entries), (
+        "Should extract every url"
+    )
+
+
+class TestBatchImportWorker:
+    """Test class for BatchImportWorker."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        urls = ["https://a.com/playlist"]
+        cookies: list[Cookie] = []
+
+        worker = BatchImportWorker(urls, cookies)
+
+        assert worker.urls == urls, "Urls should be set"
+        assert worker.cookies is cookies, "Cookies should be set"
+        assert worker.entry_urls == [], "Nothing should be expanded yet"
+
+    def test_run(self, mocker: MockerFixture) -> None:
+        """Test method for run."""
+        mock_expand_urls = mocker.patch(
+            make_obj_importpath(batch_module) + ".expand_urls",
+            return_value=["https://a.com/1", "https://a.com/2"],
+        )
+        cookies: list[Cookie] = []
+        worker = BatchImportWorker(["https://a.com/playlist"], cookies)
+
+        worker.run()
+
+        mock_expand_urls.assert_called_once_with(["https://a.com/playlist"], cookies)
+        assert worker.entry_urls == ["https://a.com/1", "https://a.com/2"], (
+            "Expanded urls should be stored"
+        )
+
+
+class TestDownloadBatch:
+    """Test class for DownloadBatch."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        batch = DownloadBatch()
+
+        assert batch.workers == [], "Batch should be empty"
+        assert batch.total == 0, "Nothing should be scheduled"
+        assert batch.succeeded == 0, "Nothing should have succeeded"
+        assert batch.failed == 0, "Nothing should have failed"
+
+    def test_is_done(self, mocker: MockerFixture) -> None:
+        """Test method for is_done."""
+        batch = DownloadBatch()
+        worker = mocker.Mock(successful=False, retrying=False)
+        batch.add_downloads(1)
+        batch.add_worker(worker)
+
+        assert batch.is_done is False, "Batch should run until all workers finished"
+        batch.on_worker_finished(worker)
+        assert batch.is_done is True, "Batch should be done"
+
+    def test_add_downloads(self, mocker: MockerFixture) -> None:
+        """Test method for add_downloads."""
+        batch = DownloadBatch()
+        on_progress = mocker.Mock()
+        batch.progress.connect(on_progress)
+
+        batch.add_downloads(2)
+        batch.add_downloads(1)
+
+        expected_total = 3
+        assert batch.total == expected_total, "Total should count the downloads"
+        on_progress.assert_called_with(0, 0, expected_total)
+
+    def test_add_worker(self, mocker: MockerFixture) -> None:
+        """Test method for add_worker."""
+        batch = DownloadBatch()
+        worker = mocker.Mock()
+
+        batch.add_worker(worker)
+
+        assert batch.workers == [worker], "Worker should be added"
+        worker.finished.connect.assert_called_once()
+
+    def test_on_worker_finished(self, mocker: MockerFixture) -> None:
+        """Test method for on_worker_finished."""
+        batch = DownloadBatch()
+        succeeded = mocker.Mock(successful=True, retrying=False)
+        failed = mocker.Mock(successful=False, retrying=False)
+        retried = mocker.Mock(successful=False, retrying=True)
+        batch.add_downloads(3)
+        batch.add_worker(succeeded)
+        batch.add_worker(failed)
+        batch.add_worker(retried)
+
+        batch.on_worker_finished(succeeded)
+        batch.on_worker_finished(failed)
+        batch.on_worker_finished(retried)
+
+        assert batch.succeeded == 1, "Should count the succeeded download"
+        assert batch.failed == 1, "Should count the failed download"
+        assert batch.is_done is False, "Retried download should finish later"
+
+    def test_emit_progress(self, mocker: MockerFixture) -> None:
+        """Test method for emit_progress."""
+        batch = DownloadBatch()
+        on_progress = mocker.Mock()
+        batch.progress.connect(on_progress)
+
+        batch.emit_progress()
+
+        on_progress.assert_called_once_with(0, 0, 0)
@@ -0,0 +1,133 @@
+"""module."""
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
+
+
+class TestDownloadCancelledError:
+    """Test class for DownloadCancelledError."""
+
+
+class TestCancelToken:
+    """Test class for CancelToken."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        token = CancelToken()
+
+        assert token.is_cancelled is False, "Token should not be cancelled"
+        assert token.processes == set(), "No process should be tracked"
+
+    def test_is_cancelled(self) -> None:
+        """Test method for is_cancelled."""
+        token = CancelToken()
+        assert token.is_cancelled is False, "Token should not be cancelled"
+
+        token.cancel()
+        assert token.is_cancelled is True, "Token should be cancelled"
+
+    def test_cancel(self, mocker: MockerFixture) -> None:
+        """Test method for cancel."""
+        token = CancelToken()
+        process = mocker.Mock()
+        token.processes.add(process)
+
+        token.cancel()
+
+        assert token.is_cancelled is True, "Token should be cancelled"
+        process.kill.assert_called_once()
+
+    def test_raise_if_cancelled(self) -> None:
+        """Test method for raise_if_cancelled."""
+        token = CancelToken()
+        token.raise_if_cancelled()
+
+        token.cancel()
+        with pytest.raises(DownloadCancelledError):
+            token.raise_if_cancelled()
+
+    def test_check_hook(self) -> None:
+        """Test method for check_hook."""
+        token = CancelToken()
+        token.check_hook({"status": "downloading"})
+
+        token.cancel()
+        with pytest.raises(DownloadCancelledError):
+            token.check_hook({"status": "downloading"})
+
+    def test_iter_checked(self) -> None:
+        """Test method for iter_checked."""
+        token = CancelToken()
+        items = token.iter_checked([1, 2, 3])
+
+        assert next(items) == 1, "Should yield the items"
+        token.cancel()
+        with pytest.raises(DownloadCancelledError):
+            next(items)
+
+    def test_track_process(self, mocker: MockerFixture) -> None:
+        """Test method for track_process."""
+        token = CancelToken()
+        process = mocker.Mock()
+
+        with token.track_process(process) as tracked:
+            assert tracked == process, "Should yield the process"
+            assert token.processes == {process}, "Process should be tracked"
+            token.cancel()
+            process.kill.assert_called_once()
+        assert token.processes == set(), "Process should not be tracked anymore"
+
+        # processes started after cancelling are killed right away
+        late_process = mocker.Mock()
+        with token.track_process(late_process):
+            late_process.kill.assert_called_once()
+        assert token.processes == set(), "Late process should not be tracked"
+
+    def test_get_active(self) -> None:
+        """Test method for get_active."""
+        token = CancelToken()
+        assert CancelToken.get_active() is None, "No token should be active"
+
+        with token.activate():
+            assert CancelToken.get_active() is token, "Token should be active"
+
+    def test_activate(self) -> None:
+        """Test method for activate."""
+        outer = CancelToken()
+        inner = CancelToken()
+
+        with outer.activate() as activated:
+            assert activated is outer, "Should yield the token"
+            with inner.activate():
+                assert CancelToken.get_active() is inner, "Inner should be active"
+            assert CancelToken.get_active() is outer, "Outer should be restored"
+        assert CancelToken.get_active() is None, "No token should be active anymore"
+
+    def test_add_process(self, mocker: MockerFixture) -> None:
+        """Test method for add_process."""
+        token = CancelToken()
+        process = mocker.Mock()
+
+        token.add_process(process)
+        assert token.processes == {process}, "Process should be tracked"
+        process.kill.assert_not_called()
+
+        # processes added after cancelling are killed right away
+        token.cancel()
+        late_process = mocker.Mock()
+        token.add_process(late_process)
+        late_process.kill.assert_called_once()
+        assert late_process not in token.processes, "Late process is not tracked"
+
+    def test_discard_process(self, mocker: MockerFixture) -> None:
+        """Test method for discard_process."""
+        token = CancelToken()
+        process = mocker.Mock()
+        token.add_process(process)
+
+        token.discard_process(process)
+        assert token.processes == set(), "Process should not be tracked anymore"
+        # discarding twice is fine
+        token.discard_process(process)
@@ -0,0 +1,94 @@
+"""module."""
+
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from video_vault.src.core.deletion import DeletionQueue
+from video_vault.src.db.models import File, PendingDeletion
+
+
+class TestDeletionQueue:
+    """Test class for DeletionQueue."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        queue = DeletionQueue()
+
+        assert queue.removed == 0, "Nothing should be removed"
+        assert queue.total == 0, "Nothing should be queued"
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert DeletionQueue.get_instance() is DeletionQueue.get_instance(), (
+            "Should always return the same queue"
+        )
+
+    @pytest.mark.django_db
+    def test_delete(self, mocker: MockerFixture) -> None:
+        """Test method for delete."""
+        File.objects.create(file="a.mp4")
+        File.objects.create(file="b.mp4")
+        queue = DeletionQueue()
+        mock_start = mocker.patch.object(queue, "start")
+
+        count = queue.delete(File.objects.all())
+
+        expected_count = 2
+        assert count == expected_count, "Should queue both files"
+        assert queue.total == expected_count, "Total should count queued files"
+        assert not File.objects.exists(), "Rows should be deleted at once"
+        mock_start.assert_called_once()
+
+    @pytest.mark.django_db
+    def test_resume(self, mocker: MockerFixture) -> None:
+        """Test method for resume."""
+        queue = DeletionQueue()
+        mock_start = mocker.patch.object(queue, "start")
+
+        queue.resume()
+        mock_start.assert_not_called()
+
+        PendingDeletion.objects.create(name="downloads/a.mp4")
+        queue.resume()
+        assert queue.total == 1, "Total should count the pending files"
+        mock_start.assert_called_once()
+
+    @pytest.mark.django_db
+    def test_run(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test method for run."""
+        test_file = tmp_path / "test_video.mp4"
+        test_file.write_bytes(b"fake video content for testing")
+        stored = File.create_encrypted(test_file)
+        PendingDeletion.objects.create(name=stored.file.name)
+        PendingDeletion.objects.create(name="downloads/missing.mp4")
+        queue = DeletionQueue()
+        queue.total = 2
+        on_progress = mocker.Mock()
+        queue.progress.connect(on_progress)
+
+        queue.run()
+
+        assert not Path(stored.file.path).exists(), "File should be removed"
+        assert not PendingDeletion.objects.exists(), "Queue should be empty"
+        on_progress.assert_any_call(1, 2)
+        on_progress.assert_called_with(2, 2)
+
+    @pytest.mark.django_db
+    def test_on_finished(self, mocker: MockerFixture) -> None:
+        """Test method for on_finished."""
+        queue = DeletionQueue()
+        mock_start = mocker.patch.object(queue, "start")
+        queue.removed = 1
+        queue.total = 2
+        PendingDeletion.objects.create(name="downloads/a.mp4")
+
+        queue.on_finished()
+        mock_start.assert_called_once()
+
+        PendingDeletion.objects.all().delete()
+        queue.on_finished()
+        mock_start.assert_called_once()
+        assert queue.removed == 0, "Progress should be reset"
+        assert queue.total == 0, "Progress should be reset"
@@ -1,20 +1,49 @@
 """module."""
 
+import importlib
+import sys
 import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
+import yt_dlp
+from django.core.files.storage import default_storage
 from pyrig.src.modules.module import make_obj_importpath
+from pytest_django.fixtures import SettingsWrapper
 from pytest_mock import MockerFixture
+from winipyside.src.core.py_qiodevice import EncryptedPyQFile
+from yt_dlp.utils import DownloadError
 
 from video_vault.src.core import downloads as downloads_module
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
 from video_vault.src.core.downloads import (
+    Conversion,
     DownloadWorker,
     add_download,
+    can_stream_download,
+    clean_staging_dirs,
+    deduplicate_download,
     do_download,
+    extract_download_info,
+    get_conversion,
+    get_network_opts,
+    get_postprocessors,
+    get_source_fields,
+    get_staging_dir,
+    get_staging_root,
+    get_stream_ffmpeg_args,
+    get_ydl_opts,
+    open_staging_dir,
+    read_tail,
     save_download,
+    stream_download,
+    track_yt_dlp_processes,
 )
+from video_vault.src.core.ffmpeg import get_ffmpeg_path
+from video_vault.src.core.progress import DownloadProgress, Stage
+from video_vault.src.core.security import get_or_create_app_aes_gcm
+from video_vault.src.db.models import DownloadJob, File, NetworkSettings
 from video_vault.src.ui.pages import downloads as downloads_page_module
 
 if TYPE_CHECKING:
@@ -32,8 +61,15 @@ def test_add_download(mocker: MockerFixture, tmp_path: Path) -> None:
     fake_video_file.write_bytes(b"fake video content for testing")
 
     # Mock the YoutubeDL instance methods
+    info = {
+        "title": "Test Video",
+        "extractor_key": "Youtube",
+        "id": "805SIqgDZIE",
+        "webpage_url": test_url,
+    }
     mock_ydl_instance = mocker.Mock()
-    mock_ydl_instance.extract_info.return_value = {"title": "Test Video"}
+    mock_ydl_instance.extract_info.return_value = info
+    mock_ydl_instance.process_ie_result.return_value = info
     mock_ydl_instance.prepare_filename.return_value = str(fake_video_file)
 
     # Mock the YoutubeDL constructor to return our mock instance
@@ -42,25 +78,460 @@ def test_add_download(mocker: MockerFixture, tmp_path: Path) -> None:
     )
     mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
 
-    result = add_download(test_url, cookies)
+    on_state = mocker.Mock()
+    on_conversion = mocker.Mock()
+    on_progress = mocker.Mock()
+    result = add_download(
+        test_url,
+        cookies,
+        on_state=on_state,
+        on_conversion=on_conversion,
+        on_progress=on_progress,
+    )
 
     assert result.file.name != "", "File should have a name"
     assert result.display_name != "", "File should have a display name"
-    mock_ydl_instance.extract_info.assert_called_once_with(test_url, download=True)
+    mock_ydl_instance.extract_info.assert_called_once_with(test_url, download=False)
+    mock_ydl_instance.process_ie_result.assert_called_once_with(info, download=True)
+    on_state.assert_called_with(DownloadJob.State.ENCRYPTING)
+    # without codecs or a known extension the download has to be transcoded
+    on_conversion.assert_called_once_with(Conversion.TRANSCODE)
+    assert [call.args[0].stage for call in on_progress.call_args_list] == [
+        Stage.ENCRYPT,
+        Stage.SAVE,
+    ], "Should report the stages after the download"
+    assert result.video_id == "805SIqgDZIE", "Should store the video id"
+
+    # the same video is not fetched again
+    mock_ydl_instance.process_ie_result.reset_mock()
+    assert add_download(test_url, cookies) == result, "Should return the existing file"
+    mock_ydl_instance.process_ie_result.assert_not_called()
+
+    # streamable formats are downloaded without a temporary directory
+    mock_stream_download = mocker.patch(
+        make_obj_importpath(downloads_module) + ".stream_download"
+    )
+    mock_stream_download.return_value.get_duplicate.return_value = None
+    mock_ydl_instance.extract_info.return_value = {
+        "url": "https://example.com/video.mp4",
+        "protocol": "https",
+        "ext": "mp4",
+    }
+    mock_ydl_instance.process_ie_result.reset_mock()
+
+    cancel_token = CancelToken()
+    limiter = mocker.Mock()
+    result = add_download(
+        test_url,
+        cookies,
+        on_progress=on_progress,
+        cancel_token=cancel_token,
+        limiter=limiter,
+    )
+
+    assert result == mock_stream_download.return_value, "Should stream the download"
+    mock_stream_download.assert_called_once_with(
+        mock_ydl_instance.extract_info.return_value,
+        cookies,
+        on_progress=on_progress,
+        cancel_token=cancel_token,
+        limiter=limiter,
+    )
+
+    # a cancelled download stops before anything is downloaded
+    cancel_token.cancel()
+    mock_stream_download.reset_mock()
+    with pytest.raises(DownloadCancelledError):
+        add_download(test_url, cookies, cancel_token=cancel_token)
+    mock_stream_download.assert_not_called()
+    mock_ydl_instance.process_ie_result.assert_not_called()
+
+
+def test_get_source_fields() -> None:
+    """Test func for get_source_fields."""
+    info = {
+        "extractor_key": "Youtube",
+        "id": 123,
+        "webpage_url": "https://www.youtube.com/watch?v=123",
+    }
+
+    assert get_source_fields(info) == {
+        "extractor_key": "Youtube",
+        "video_id": "123",
+        "webpage_url": "https://www.youtube.com/watch?v=123",
+    }, "Should map the info to the File fields"
+    assert get_source_fields({}) == {
+        "extractor_key": "",
+        "video_id": "",
+        "webpage_url": "",
+    }, "Missing fields should be empty"
+
+
+@pytest.mark.django_db
+def test_deduplicate_download(tmp_path: Path) -> None:
+    """Test func for deduplicate_download."""
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"same content")
+    first = File.create_encrypted(path)
+
+    assert deduplicate_download(first) == first, "A new file should be kept"
+
+    second = File.create_encrypted(path, webpage_url="https://b.com/video")
+
+    assert deduplicate_download(second) == first, "Should return the older file"
+    assert not File.objects.filter(pk=second.pk).exists(), (
+        "The duplicate should be removed"
+    )
+
+
+def test_get_staging_root(settings: SettingsWrapper, tmp_path: Path) -> None:
+    """Test func for get_staging_root."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+    assert get_staging_root() == tmp_path / "staging", (
+        "Staging root should be next to the media root"
+    )
+
+
+def test_get_staging_dir(settings: SettingsWrapper, tmp_path: Path) -> None:
+    """Test func for get_staging_dir."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+    job_id = 42
+    assert get_staging_dir(job_id) == tmp_path / "staging" / "42", (
+        "Staging dir should be stable for a job"
+    )
+
+
+def test_open_staging_dir(tmp_path: Path) -> None:
+    """Test func for open_staging_dir."""
+    # without a staging dir a temporary directory is used and removed
+    with open_staging_dir(None) as tempdir:
+        assert Path(tempdir).is_dir(), "Temporary directory should exist"
+    assert not Path(tempdir).exists(), "Temporary directory should be removed"
+
+    # a staging dir is kept on failure so the next attempt can resume
+    staging_dir = tmp_path / "staging" / "1"
+
+    def interrupted_download() -> None:
+        with open_staging_dir(staging_dir) as directory:
+            (Path(directory) / "video.mp4.part").write_bytes(b"partial")
+            msg = "interrupted"
+            raise DownloadError(msg)
+
+    with pytest.raises(DownloadError):
+        interrupted_download()
+    assert (staging_dir / "video.mp4.part").exists(), (
+        "Partial files should be kept on failure"
+    )
+
+    # and removed once the download succeeded
+    with open_staging_dir(staging_dir) as directory:
+        assert (Path(directory) / "video.mp4.part").exists(), (
+            "Partial files should be available to resume"
+        )
+    assert not staging_dir.exists(), "Staging dir should be removed on success"
+
+    # and when the download is cancelled, it is not resumed
+    def cancelled_download() -> None:
+        with open_staging_dir(staging_dir) as directory:
+            (Path(directory) / "video.mp4.part").write_bytes(b"partial")
+            msg = "cancelled"
+            raise DownloadCancelledError(msg)
+
+    with pytest.raises(DownloadCancelledError):
+        cancelled_download()
+    assert not staging_dir.exists(), "Staging dir should be removed on cancel"
+
+
+def test_clean_staging_dirs(settings: SettingsWrapper, tmp_path: Path) -> None:
+    """Test func for clean_staging_dirs."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+
+    # nothing to clean if there never was a staging dir
+    clean_staging_dirs([])
+
+    keep_id, stale_id = 1, 2
+    get_staging_dir(keep_id).mkdir(parents=True)
+    get_staging_dir(stale_id).mkdir(parents=True)
+
+    clean_staging_dirs([keep_id])
 
+    assert get_staging_dir(keep_id).exists(), "Resumable staging dir should be kept"
+    assert not get_staging_dir(stale_id).exists(), "Stale staging dir should be gone"
 
+
+def test_get_ydl_opts() -> None:
+    """Test func for get_ydl_opts."""
+    cookies: list[Cookie] = []
+
+    opts = get_ydl_opts(cookies)
+
+    assert opts["cookies"] is cookies, "Cookies should be passed"
+    assert opts["merge_output_format"] == "mp4", "Should merge to mp4"
+    assert opts["continuedl"] is True, "Should resume partial downloads"
+    assert opts["nopart"] is False, "Should keep part files to resume"
+    assert opts["ffmpeg_location"], "Should set the ffmpeg location"
+    assert "paths" not in opts, "Paths depend on the download mode"
+
+
+def test_extract_download_info(mocker: MockerFixture) -> None:
+    """Test func for extract_download_info."""
+    test_url = "https://www.youtube.com/watch?v=805SIqgDZIE"
+
+    mock_ydl_instance = mocker.Mock()
+    mock_ydl_instance.extract_info.return_value = {"title": "Test Video"}
+    mock_ydl_class = mocker.patch(
+        make_obj_importpath(downloads_module) + ".yt_dlp.YoutubeDL"
+    )
+    mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+
+    info = extract_download_info(test_url, [])
+
+    assert info == {"title": "Test Video"}, "Should return the info"
+    mock_ydl_instance.extract_info.assert_called_once_with(test_url, download=False)
+
+    mock_ydl_instance.extract_info.side_effect = RuntimeError("no video")
+    with pytest.raises(DownloadError, match="no video"):
+        extract_download_info(test_url, [])
+
+
+@pytest.mark.django_db
+def test_can_stream_download(mocker: MockerFixture) -> None:
+    """Test func for can_stream_download."""
+    video = {"url": "https://a/v.mp4", "protocol": "https", "ext": "mp4"}
+    audio = {"url": "https://a/a.m4a", "protocol": "https", "ext": "m4a"}
+    assert can_stream_download({"requested_formats": [video, audio]}), (
+        "Http mp4 and m4a formats should be streamable"
+    )
+    assert can_stream_download(video), "A single http mp4 should be streamable"
+
+    dash = {**video, "protocol": "http_dash_segments"}
+    assert not can_stream_download({"requested_formats": [dash, audio]}), (
+        "Fragmented protocols should not be streamable"
+    )
+    webm = {**video, "ext": "webm"}
+    assert not can_stream_download(webm), "Webm should not be streamable"
+    assert not can_stream_download({"title": "Test Video"}), (
+        "Formats without url should not be streamable"
+    )
+    vp8 = {**video, "vcodec": "vp8"}
+    assert not can_stream_download(vp8), "Formats to transcode should not be streamed"
+
+    # HLS goes through yt-dlp while it may fetch fragments concurrently
+    hls = {**video, "protocol": "m3u8_native", "webpage_url": "https://a.com/v/1"}
+    assert not can_stream_download(hls), "HLS should use concurrent fragments"
+    NetworkSettings.objects.create(domain="a.com", concurrent_fragment_downloads=1)
+    assert can_stream_download(hls), "HLS should be streamed one fragment at a time"
+
+    mocker.patch(
+        make_obj_importpath(downloads_module) + ".get_ffmpeg_tools"
+    ).return_value.supports_fragmented_mp4 = False
+    assert not can_stream_download(video), (
+        "Should not stream if ffmpeg cannot write a fragmented mp4"
+    )
+
+
+@pytest.mark.django_db
+def test_get_network_opts() -> None:
+    """Test func for get_network_opts."""
+    expected_retries = 3
+    NetworkSettings.objects.create(domain="a.com", retries=expected_retries)
+
+    result = get_network_opts({"webpage_url": "https://www.a.com/v/1"})
+
+    assert result["retries"] == expected_retries, "Should use the host's settings"
+    assert get_network_opts({}) == NetworkSettings.DEFAULTS, (
+        "Videos without a webpage url should use the defaults"
+    )
+
+
+def test_get_conversion() -> None:
+    """Test func for get_conversion."""
+    video = {"ext": "mp4", "vcodec": "avc1.64001F", "acodec": "none"}
+    audio = {"ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2"}
+    assert get_conversion({"requested_formats": [video, audio]}) == Conversion.NONE, (
+        "Merged mp4 compatible formats should not be converted"
+    )
+    assert get_conversion({"ext": "mp4"}) == Conversion.NONE, (
+        "Unknown codecs in mp4 should be trusted"
+    )
+    mkv = {"ext": "mkv", "vcodec": "avc1", "acodec": "opus"}
+    assert get_conversion(mkv) == Conversion.REMUX, (
+        "Compatible codecs in another container should be remuxed"
+    )
+    vp8 = {"ext": "webm", "vcodec": "vp8", "acodec": "vorbis"}
+    assert get_conversion(vp8) == Conversion.TRANSCODE, (
+        "Incompatible codecs should be transcoded"
+    )
+    assert get_conversion({"ext": "flv"}) == Conversion.TRANSCODE, (
+        "Unknown codecs in an unknown container should be transcoded"
+    )
+
+
+def test_get_postprocessors() -> None:
+    """Test func for get_postprocessors."""
+    assert get_postprocessors(Conversion.NONE) == [], "No-op needs no postprocessor"
+    assert get_postprocessors(Conversion.REMUX)[0]["key"] == "FFmpegVideoRemuxer", (
+        "Remux should use the remuxer"
+    )
+    assert (
+        get_postprocessors(Conversion.TRANSCODE)[0]["key"] == "FFmpegVideoConvertor"
+    ), "Transcode should use the convertor"
+
+
+def test_get_stream_ffmpeg_args(mocker: MockerFixture) -> None:
+    """Test func for get_stream_ffmpeg_args."""
+    mock_ydl = mocker.Mock()
+    mock_ydl.cookiejar.get_cookie_header.return_value = "session=1"
+    video = {
+        "url": "https://a/v.mp4",
+        "http_headers": {"User-Agent": "test"},
+        "acodec": "none",
+    }
+    audio = {"url": "https://a/a.m4a", "vcodec": "none"}
+
+    args = get_stream_ffmpeg_args({"requested_formats": [video, audio]}, mock_ydl)
+
+    assert args[0] == str(get_ffmpeg_path()), "Should run ffmpeg"
+    assert args[-1] == "pipe:1", "Should write to stdout"
+    assert args.count("-i") == len([video, audio]), "Should read every format"
+    assert "User-Agent: test\r\nCookie: session=1\r\n" in args, (
+        "Should pass headers and cookies"
+    )
+    assert "0:v:0?" in args, "Should map video of the first input"
+    assert "1:a:0?" in args, "Should map audio of the second input"
+    assert "0:a:0?" not in args, "Should not map audio of video only input"
+    assert "frag_keyframe+empty_moov+default_base_moof" in args, (
+        "Should write a fragmented mp4"
+    )
+
+
+@pytest.mark.django_db
+def test_stream_download(mocker: MockerFixture) -> None:
+    """Test func for stream_download."""
+    chunk = b"fake streamed video content"
+    repeat = 10000
+    content = chunk * repeat
+    mock_ydl_instance = mocker.Mock()
+    mock_ydl_instance.prepare_filename.return_value = "videos/Test Video.mp4"
+    mock_ydl_class = mocker.patch(
+        make_obj_importpath(downloads_module) + ".yt_dlp.YoutubeDL"
+    )
+    mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
+    mock_get_args = mocker.patch(
+        make_obj_importpath(downloads_module) + ".get_stream_ffmpeg_args"
+    )
+    mock_get_args.return_value = [
+        sys.executable,
+        "-c",
+        f"import sys; sys.stdout.buffer.write({chunk!r} * {repeat})",
+    ]
+
+    on_progress = mocker.Mock()
+    limiter = mocker.Mock()
+    result = stream_download(
+        {"title": "Test Video", "id": "abc"},
+        [],
+        on_progress=on_progress,
+        limiter=limiter,
+    )
+
+    # the storage replaces spaces and makes existing names unique
+    assert result.display_name.startswith("Test_Video"), "Should use the prepared name"
+    assert result.video_id == "abc", "Should store the source of the video"
+    decrypted_content = EncryptedPyQFile.decrypt_data_static(
+        result.file.read(), get_or_create_app_aes_gcm()
+    )
+    assert decrypted_content == content, "Should encrypt the stream"
+    last_progress = on_progress.call_args[0][0]
+    assert last_progress.stage == Stage.DOWNLOAD, "Should report the download"
+    assert last_progress.downloaded_bytes == len(content), (
+        "Should report the bytes read from ffmpeg"
+    )
+    consumed = sum(call.args[0] for call in limiter.consume.call_args_list)
+    assert consumed == len(content), "Should limit the bytes read from ffmpeg"
+
+    # a failing process removes the partial file, a long log does not block it
+    mock_get_args.return_value = [
+        sys.executable,
+        "-c",
+        "import sys; sys.stderr.write('x' * 1000000 + 'broken'); sys.exit(1)",
+    ]
+    with pytest.raises(DownloadError, match="broken"):
+        stream_download({"title": "Test Video"}, [])
+    assert File.objects.count() == 1, "Failed download should not be saved"
+
+    # cancelling kills ffmpeg and removes the partial file
+    mock_get_args.return_value = [
+        sys.executable,
+        "-c",
+        "import sys\nwhile True: sys.stdout.buffer.write(b'x' * 65536)",
+    ]
+    stored_names = default_storage.listdir(File.UPLOAD_TO)[1]
+    cancel_token = CancelToken()
+    with pytest.raises(DownloadCancelledError):
+        stream_download(
+            {"title": "Endless Video"},
+            [],
+            on_progress=lambda _: cancel_token.cancel(),
+            cancel_token=cancel_token,
+        )
+    assert cancel_token.processes == set(), "ffmpeg should not be tracked anymore"
+    assert File.objects.count() == 1, "Cancelled download should not be saved"
+    assert default_storage.listdir(File.UPLOAD_TO)[1] == stored_names, (
+        "Partial file should be removed"
+    )
+
+
+def test_read_tail() -> None:
+    """Test func for read_tail."""
+    with tempfile.TemporaryFile() as file:
+        file.write(b"first line\nlast line\n")
+
+        assert read_tail(file) == "first line\nlast line", "Should read everything"
+        assert read_tail(file, size=10) == "last line", "Should read only the end"
+
+
+def test_track_yt_dlp_processes() -> None:
+    """Test func for track_yt_dlp_processes."""
+    track_yt_dlp_processes()
+    popen_cls = importlib.import_module("yt_dlp.postprocessor.ffmpeg").Popen
+    assert popen_cls is not yt_dlp.utils.Popen, "Should replace the Popen of yt-dlp"
+    assert issubclass(popen_cls, yt_dlp.utils.Popen), "Should extend yt-dlp's Popen"
+
+    token = CancelToken()
+    with token.activate(), popen_cls([sys.executable, "-c", "pass"]) as process:
+        assert token.processes == {process}, "Process should be tracked"
+        process.wait()
+    assert token.processes == set(), "Process should not be tracked anymore"
+
+    # processes outside of a download are not tracked
+    with popen_cls([sys.executable, "-c", "pass"]) as process:
+        process.wait()
+    assert token.processes == set(), "Process should not be tracked"
+
+
+@pytest.mark.django_db
 def test_do_download(mocker: MockerFixture, tmp_path: Path) -> None:
     """Test func for do_download."""
-    test_url = "https://www.youtube.com/watch?v=805SIqgDZIE"
     cookies: list[Cookie] = []
+    NetworkSettings.objects.create(
+        domain="example.com", concurrent_fragment_downloads=8
+    )
 
     # Create a fake video file for testing
     fake_video_file = tmp_path / "test_video.mp4"
     fake_video_file.write_bytes(b"fake video content for testing")
 
     # Mock the YoutubeDL instance methods
+    info = {
+        "title": "Test Video",
+        "ext": "mp4",
+        "webpage_url": "https://www.example.com/watch",
+    }
     mock_ydl_instance = mocker.Mock()
-    mock_ydl_instance.extract_info.return_value = {"title": "Test Video"}
+    mock_ydl_instance.process_ie_result.return_value = info
     mock_ydl_instance.prepare_filename.return_value = str(fake_video_file)
 
     # Mock the YoutubeDL constructor to return our mock instance
@@ -70,12 +541,75 @@ def test_do_download(mocker: MockerFixture, tmp_path: Path) -> None:
     mock_ydl_class.return_value.__enter__.return_value = mock_ydl_instance
 
     with tempfile.TemporaryDirectory() as tempdir:
-        result = do_download(tempdir, test_url, cookies)
+        on_state = mocker.Mock()
+        on_progress = mocker.Mock()
+        limiter = mocker.Mock()
+        result = do_download(
+            tempdir,
+            info,
+            cookies,
+            on_state=on_state,
+            on_progress=on_progress,
+            limiter=limiter,
+        )
 
         assert result.exists(), "Downloaded file should exist"
         assert result.stat().st_size > 0, "Downloaded file should not be empty"
-        mock_ydl_instance.extract_info.assert_called_once_with(test_url, download=True)
+        mock_ydl_instance.process_ie_result.assert_called_once_with(info, download=True)
         mock_ydl_instance.prepare_filename.assert_called_once()
+        ydl_opts = mock_ydl_class.call_args[0][0]
+        assert ydl_opts["paths"] == {"home": tempdir}, "Should download to tempdir"
+        assert ydl_opts["postprocessors"] == [], "Mp4 should not be converted"
+        expected_fragments = 8
+        assert ydl_opts["concurrent_fragment_downloads"] == expected_fragments, (
+            "Should use the network settings of the host"
+        )
+        assert ydl_opts["retries"] == NetworkSettings.DEFAULTS["retries"], (
+            "Unset network settings should fall back to the defaults"
+        )
+        ydl_opts["postprocessor_hooks"][1]({"status": "started"})
+        on_state.assert_called_once_with(DownloadJob.State.POSTPROCESSING)
+        assert ydl_opts["progress_hooks"][1] == limiter.progress_hook, (
+            "Limiter should slow down yt-dlp in its progress hook"
+        )
+        ydl_opts["postprocessor_hooks"][2]({"postprocessor": "Merger"})
+        ydl_opts["progress_hooks"][2]({"downloaded_bytes": 10})
+        assert [
+            (call.args[0].stage, call.args[0].downloaded_bytes)
+            for call in on_progress.call_args_list
+        ] == [(Stage.MERGE, 0), (Stage.DOWNLOAD, 10)], (
+            "Should report the stage and size of both hooks"
+        )
+
+        # the final path is taken from yt-dlp if a postprocessor changed it
+        converted_file = tmp_path / "converted.mp4"
+        mock_ydl_instance.process_ie_result.return_value = {
+            "requested_downloads": [{"filepath": str(converted_file)}]
+        }
+        result = do_download(tempdir, {"ext": "webm", "vcodec": "vp8"}, cookies)
+        assert result == converted_file, "Should return the converted file"
+        ydl_opts = mock_ydl_class.call_args[0][0]
+        assert ydl_opts["postprocessors"] == get_postprocessors(Conversion.TRANSCODE), (
+            "Should transcode incompatible codecs"
+        )
+
+        # cancelling stops yt-dlp in its hooks and kills the ffmpeg it started,
+        # the error yt-dlp then raises is not a failed download
+        cancel_token = CancelToken()
+        msg = "Postprocessing: Conversion failed!"
+
+        def cancelled_download(*_args: object, **_kwargs: object) -> None:
+            assert CancelToken.get_active() is cancel_token, "Token should be active"
+            cancel_token.cancel()
+            raise DownloadError(msg)
+
+        mock_ydl_instance.process_ie_result.side_effect = cancelled_download
+        with pytest.raises(DownloadCancelledError):
+            do_download(tempdir, info, cookies, cancel_token=cancel_token)
+        ydl_opts = mock_ydl_class.call_args[0][0]
+        assert ydl_opts["progress_hooks"][0] == cancel_token.check_hook, (
+            "Token should stop yt-dlp in its hooks"
+        )
 
 
 @pytest.mark.django_db
@@ -86,27 +620,39 @@ def test_save_download(tmp_path: Path) -> None:
     test_content = b"fake video content for testing"
     test_file.write_bytes(test_content)
 
-    result = save_download(test_file)
+    result = save_download(test_file, video_id="abc")
 
     assert result.file.name != "", "File should have a name"
     assert result.display_name != "", "File should have a display name"
+    assert result.video_id == "abc", "Extra fields should be saved"
+
+
+class TestConversion:
+    """Test class for Conversion."""
 
 
 class TestDownloadWorker:
     """Test class for DownloadWorker."""
 
-    def test___init__(self) -> None:
+    def test___init__(self, mocker: MockerFixture) -> None:
         """Test method for __init__."""
         test_url = "https://www.youtube.com/watch?v=805SIqgDZIE"
         cookies: list[Cookie] = []
+        job = mocker.Mock(url=test_url)
 
-        worker = DownloadWorker(test_url, cookies)
+        worker = DownloadWorker(job, cookies)
 
+        assert worker.job is job, "Job should be set"
         assert worker.url == test_url, "URL should be set correctly"
+        assert worker.host == "www.youtube.com", "Host should be parsed from the URL"
         assert worker.cookies == cookies, "Cookies should be set correctly"
-        assert worker in DownloadWorker.ALL_WORKERS, (
-            "Worker should be added to ALL_WORKERS"
+        assert worker.notify is True, "Should notify by default"
+        assert worker.throttle.on_progress == worker.emit_progress, (
+            "Progress should be throttled before it is emitted"
         )
+        assert worker.cancel_token.is_cancelled is False, "Should not be cancelled"
+        assert worker.successful is False, "Should not be successful before it ran"
+        assert worker.name == test_url, "Name should be the URL before it ran"
 
     def test_run(self, mocker: MockerFixture) -> None:
         """Test method for run."""
@@ -120,22 +666,99 @@ class TestDownloadWorker:
         mock_file = mocker.Mock()
         mock_file.display_name = "Test Video"
         mock_add_download.return_value = mock_file
+        mock_governor = mocker.patch(
+            make_obj_importpath(downloads_module) + ".BandwidthGovernor.get_instance"
+        ).return_value
 
-        worker = DownloadWorker(test_url, cookies)
+        job = mocker.Mock(url=test_url)
+        worker = DownloadWorker(job, cookies)
         worker.run()
 
         assert worker.file == mock_file, "File should be set"
         assert worker.name == "Test Video", "Name should be set from file display_name"
         assert worker.successful is True, "Should be marked as successful"
         assert worker.error is None, "Error should be None on success"
+        job.mark_running.assert_called_once()
+        job.mark_done.assert_called_once_with(mock_file)
+        mock_add_download.assert_called_once_with(
+            test_url,
+            cookies,
+            on_state=job.set_state,
+            on_conversion=job.set_conversion,
+            staging_dir=get_staging_dir(job.pk),
+            on_progress=worker.throttle,
+            cancel_token=worker.cancel_token,
+            limiter=mock_governor.limit.return_value.__enter__.return_value,
+        )
+        mock_governor.limit.assert_called_once_with(
+            job.pk, job.rate_limit, worker.cancel_token
+        )
+
+        # failures are persisted in the job
+        mock_add_download.side_effect = DownloadError("broken")
+        job.can_retry.return_value = False
+        failing_worker = DownloadWorker(job, cookies)
+        failing_worker.run()
+
+        assert failing_worker.successful is False, "Should be marked as failed"
+        assert failing_worker.retrying is False, "Should not be retried"
+        job.mark_failed.assert_called_once_with("broken")
+
+        # jobs with attempts left are queued again
+        job.can_retry.return_value = True
+        retrying_worker = DownloadWorker(job, cookies)
+        retrying_worker.run()
+
+        assert retrying_worker.retrying is True, "Should be retried"
+        job.mark_retrying.assert_called_once_with("broken")
+
+        # unexpected errors fail the job instead of leaving it running
+        job.mark_failed.reset_mock()
+        mock_add_download.side_effect = OSError("disk full")
+        crashing_worker = DownloadWorker(job, cookies)
+        crashing_worker.run()
+
+        assert crashing_worker.successful is False, "Should be marked as failed"
+        assert isinstance(crashing_worker.error, OSError), "Error should be kept"
+        job.mark_failed.assert_called_once_with("OSError: disk full")
+
+        # a worker cancelled before it ran does not download anything
+        mock_add_download.reset_mock()
+        cancelled_worker = DownloadWorker(job, cookies)
+        cancelled_worker.cancel()
+        cancelled_worker.run()
+
+        mock_add_download.assert_not_called()
+        assert cancelled_worker.cancelled is True, "Should be marked as cancelled"
+        assert cancelled_worker.successful is False, "Should not be successful"
+        job.mark_cancelled.assert_called_once()
+
+    def test_cancel(self, mocker: MockerFixture) -> None:
+        """Test method for cancel."""
+        worker = DownloadWorker(mocker.Mock(url="https://a.com/1"), [])
+
+        worker.cancel()
+
+        assert worker.cancel_token.is_cancelled is True, "Token should be cancelled"
+
+    def test_emit_progress(self, mocker: MockerFixture) -> None:
+        """Test method for emit_progress."""
+        job = mocker.Mock(url="https://a.com/1", pk=1)
+        worker = DownloadWorker(job, [])
+        on_progress = mocker.Mock()
+        worker.progress.connect(on_progress)
+        progress = DownloadProgress(Stage.DOWNLOAD)
+
+        worker.emit_progress(progress)
+
+        on_progress.assert_called_once_with(1, progress)
 
     def test_on_finished(self, mocker: MockerFixture) -> None:
         """Test method for on_finished."""
         test_url = "https://www.youtube.com/watch?v=805SIqgDZIE"
         cookies: list[Cookie] = []
 
-        worker = DownloadWorker(test_url, cookies)
-        initial_worker_count = len(DownloadWorker.ALL_WORKERS)
+        worker = DownloadWorker(mocker.Mock(url=test_url), cookies)
 
         # Mock the methods after worker creation
         mock_show_notification = mocker.patch.object(worker, "show_notification")
@@ -147,10 +770,24 @@ class TestDownloadWorker:
 
         mock_show_notification.assert_called_once()
         mock_update_downloads_page.assert_called_once()
-        assert len(DownloadWorker.ALL_WORKERS) == initial_worker_count - 1, (
-            "Worker should be removed from ALL_WORKERS"
+
+        # workers of a batch only update the downloads page
+        worker.notify = False
+        worker.on_finished()
+
+        mock_show_notification.assert_called_once()
+        expected_updates = 2
+        assert mock_update_downloads_page.call_count == expected_updates, (
+            "Downloads page should be updated without notification"
         )
 
+        # cancelled downloads are not reported
+        worker.notify = True
+        worker.cancelled = True
+        worker.on_finished()
+
+        mock_show_notification.assert_called_once()
+
     def test_show_notification(self, mocker: MockerFixture) -> None:
         """Test method for show_notification."""
         test_url = "https://www.youtube.com/watch?v=805SIqgDZIE"
@@ -158,12 +795,12 @@ class TestDownloadWorker:
 
         # Mock only the notification
         mock_notification = mocker.patch(
-            make_obj_importpath(downloads_module) + ".Notification"
+            make_obj_importpath(downloads_module) + ".notification_widget.Notification"
         )
         mock_notification_instance = mocker.Mock()
         mock_notification.return_value = mock_notification_instance
 
-        worker = DownloadWorker(test_url, cookies)
+        worker = DownloadWorker(mocker.Mock(url=test_url), cookies)
         worker.successful = True
         worker.name = "Test Video"
         worker.error = None
@@ -185,11 +822,16 @@ class TestDownloadWorker:
         mock_page_instance = mocker.Mock()
         mock_downloads_page.get_page_static.return_value = mock_page_instance
 
-        worker = DownloadWorker(test_url, cookies)
+        worker = DownloadWorker(mocker.Mock(url=test_url), cookies)
         worker.successful = True
         worker.file = mocker.Mock()
 
         worker.update_downloads_page()
 
         mock_downloads_page.get_page_static.assert_called_once_with(mock_downloads_page)
-        mock_page_instance.add_download_button.assert_called_once_with(worker.file)
+        mock_page_instance.add_download.assert_called_once_with(worker.file)
+
+        # failed downloads have no file to list
+        worker.successful = False
+        worker.update_downloads_page()
+        mock_page_instance.add_download.assert_called_once()
@@ -0,0 +1,236 @@
+"""module."""
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from winipyside.src.core.py_qiodevice import EncryptedPyQFile
+
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
+from video_vault.src.core.encryption import (
+    CHUNKS_PER_BATCH,
+    PLAINTEXT_CHUNK_SIZE,
+    ChunkEncryptedFile,
+    EncryptedFile,
+    StreamEncryptedFile,
+    encrypt_chunk_batch,
+    encrypt_chunks,
+    get_encrypted_size,
+    hash_chunks,
+    iter_chunks,
+)
+
+
+class ShortReadStream(io.BytesIO):
+    """Stream that returns at most 1000 bytes per read like a pipe."""
+
+    def read(self, size: int | None = -1) -> bytes:
+        """Read at most 1000 bytes."""
+        max_read = 1000
+        if size is None or size < 0 or size > max_read:
+            size = max_read
+        return super().read(size)
+
+
+def test_iter_chunks() -> None:
+    """Test func for iter_chunks."""
+    data = b"a" * (PLAINTEXT_CHUNK_SIZE * 2 + 10)
+
+    chunks = list(iter_chunks(io.BytesIO(data)))
+
+    expected_num_chunks = 3
+    assert len(chunks) == expected_num_chunks, "Should split into three chunks"
+    assert chunks[0] == data[:PLAINTEXT_CHUNK_SIZE], "First chunk should be full"
+    assert chunks[-1] == b"a" * 10, "Last chunk should contain the rest"
+
+    # short reads are filled up to full chunks
+    chunks = list(iter_chunks(ShortReadStream(data)))
+    assert len(chunks) == expected_num_chunks, "Short reads should be filled up"
+    assert b"".join(chunks) == data, "Chunks should contain all data"
+
+    assert list(iter_chunks(io.BytesIO(b""))) == [], "Empty stream has no chunks"
+
+
+def test_encrypt_chunks() -> None:
+    """Test func for encrypt_chunks."""
+    aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+    data = b"video" * PLAINTEXT_CHUNK_SIZE
+
+    encrypted = b"".join(encrypt_chunks(iter_chunks(io.BytesIO(data)), aes_gcm))
+
+    assert encrypted != data, "Data should be encrypted"
+    assert EncryptedPyQFile.decrypt_data_static(encrypted, aes_gcm) == data, (
+        "Data should be decryptable by EncryptedPyQFile"
+    )
+
+    # many batches on few workers must still come out in order
+    chunks = [
+        bytes([i % 256]) * PLAINTEXT_CHUNK_SIZE for i in range(CHUNKS_PER_BATCH * 9)
+    ]
+    encrypted_chunks = list(encrypt_chunks(chunks, aes_gcm, max_workers=2))
+    assert len(encrypted_chunks) == len(chunks), "Should encrypt every chunk"
+    decrypted_chunks = [
+        EncryptedPyQFile.decrypt_data_static(chunk, aes_gcm)
+        for chunk in encrypted_chunks
+    ]
+    assert decrypted_chunks == chunks, "Chunks should be yielded in order"
+
+
+def test_encrypt_chunk_batch() -> None:
+    """Test func for encrypt_chunk_batch."""
+    aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+    batch = (b"first", b"second")
+
+    result = encrypt_chunk_batch(batch, aes_gcm)
+
+    assert len(result) == len(batch), "Should encrypt each chunk"
+    assert [
+        EncryptedPyQFile.decrypt_data_static(chunk, aes_gcm) for chunk in result
+    ] == list(batch), "Chunks should be encrypted in order"
+
+
+def test_hash_chunks() -> None:
+    """Test func for hash_chunks."""
+    chunks = [b"first", b"second"]
+    sha256 = hashlib.sha256()
+
+    result = list(hash_chunks(chunks, sha256))
+
+    assert result == chunks, "Chunks should be passed through"
+    assert sha256.hexdigest() == hashlib.sha256(b"firstsecond").hexdigest(), (
+        "Hash should be updated with all chunks"
+    )
+
+
+def test_get_encrypted_size() -> None:
+    """Test func for get_encrypted_size."""
+    aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+    for size in [0, 1, PLAINTEXT_CHUNK_SIZE, PLAINTEXT_CHUNK_SIZE * 3 + 7]:
+        data = b"x" * size
+        expected_size = len(EncryptedPyQFile.encrypt_data_static(data, aes_gcm))
+        assert get_encrypted_size(size) == expected_size, (
+            f"Encrypted size should be {expected_size} for size {size}"
+        )
+
+
+class TestEncryptedFile:
+    """Test class for EncryptedFile."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = EncryptedFile("video.mp4", aes_gcm)
+
+        assert file.name == "video.mp4", "Name should be set"
+        assert file.aes_gcm is aes_gcm, "AESGCM should be set"
+        assert file.cancel_token.is_cancelled is False, "Should not be cancelled"
+        assert file.sha256.hexdigest() == hashlib.sha256().hexdigest(), (
+            "Nothing should be hashed yet"
+        )
+        assert file.encrypted_size == 0, "Nothing should be encrypted yet"
+
+    def test_encrypt(self) -> None:
+        """Test method for encrypt."""
+        data = b"video" * PLAINTEXT_CHUNK_SIZE
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+        file = EncryptedFile("video.mp4", aes_gcm)
+
+        encrypted = b"".join(file.encrypt(io.BytesIO(data)))
+
+        assert EncryptedPyQFile.decrypt_data_static(encrypted, aes_gcm) == data, (
+            "Data should be decryptable by EncryptedPyQFile"
+        )
+        assert file.sha256.hexdigest() == hashlib.sha256(data).hexdigest(), (
+            "Should hash the plaintext"
+        )
+        assert file.encrypted_size == len(encrypted), "Should count the output"
+
+        # cancelling stops between two chunks
+        cancel_token = CancelToken()
+        cancelled_file = EncryptedFile("video.mp4", aes_gcm, cancel_token)
+        cancel_token.cancel()
+        with pytest.raises(DownloadCancelledError):
+            next(cancelled_file.encrypt(io.BytesIO(data)))
+
+    def test_multiple_chunks(self) -> None:
+        """Test method for multiple_chunks."""
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = EncryptedFile("video.mp4", aes_gcm)
+
+        assert file.multiple_chunks() is True, "Should always use multiple chunks"
+
+
+class TestStreamEncryptedFile:
+    """Test class for StreamEncryptedFile."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        stream = io.BytesIO(b"video")
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = StreamEncryptedFile(stream, "video.mp4", aes_gcm)
+
+        assert file.name == "video.mp4", "Name should be set"
+        assert file.stream is stream, "Stream should be set"
+        assert file.aes_gcm is aes_gcm, "AESGCM should be set"
+
+    def test_chunks(self) -> None:
+        """Test method for chunks."""
+        data = b"streamed video" * PLAINTEXT_CHUNK_SIZE
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = StreamEncryptedFile(ShortReadStream(data), "video.mp4", aes_gcm)
+        encrypted = b"".join(file.chunks())
+
+        assert len(encrypted) == get_encrypted_size(len(data)), (
+            "Short reads from the stream should not change the chunk layout"
+        )
+        assert EncryptedPyQFile.decrypt_data_static(encrypted, aes_gcm) == data, (
+            "Data should be decryptable by EncryptedPyQFile"
+        )
+
+
+class TestChunkEncryptedFile:
+    """Test class for ChunkEncryptedFile."""
+
+    def test___init__(self, tmp_path: Path) -> None:
+        """Test method for __init__."""
+        path = tmp_path / "video.mp4"
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = ChunkEncryptedFile(path, aes_gcm)
+
+        assert file.name == "video.mp4", "Name should be the file name"
+        assert file.path == path, "Path should be set"
+        assert file.aes_gcm is aes_gcm, "AESGCM should be set"
+
+    def test_size(self, tmp_path: Path) -> None:
+        """Test method for size."""
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"x" * (PLAINTEXT_CHUNK_SIZE + 1))
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = ChunkEncryptedFile(path, aes_gcm)
+
+        assert file.size == get_encrypted_size(PLAINTEXT_CHUNK_SIZE + 1), (
+            "Size should be the encrypted size"
+        )
+
+    def test_chunks(self, tmp_path: Path) -> None:
+        """Test method for chunks."""
+        path = tmp_path / "video.mp4"
+        data = b"video content" * PLAINTEXT_CHUNK_SIZE
+        path.write_bytes(data)
+        aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+
+        file = ChunkEncryptedFile(path, aes_gcm)
+        encrypted = b"".join(file.chunks())
+
+        assert len(encrypted) == file.size, "Encrypted data should match the size"
+        assert EncryptedPyQFile.decrypt_data_static(encrypted, aes_gcm) == data, (
+            "Data should be decryptable by EncryptedPyQFile"
+        )
@@ -1,11 +1,207 @@
 """module."""
 
+import subprocess  # nosec: B404
 from pathlib import Path
 
-from video_vault.src.core.ffmpeg import get_ffmpeg_path
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.core import ffmpeg as ffmpeg_module
+from video_vault.src.core.ffmpeg import (
+    FFMPEG_TOOLS_LOCK,
+    FRAGMENTED_MP4_FLAGS,
+    FFmpegTools,
+    find_ffmpeg,
+    get_ffmpeg_encoders,
+    get_ffmpeg_path,
+    get_ffmpeg_tools,
+    get_ffmpeg_version,
+    get_mp4_muxer_flags,
+    is_mp4_codec,
+    probe_ffmpeg_tools,
+    run_ffmpeg,
+)
+
+
+def make_tools(mp4_flags: frozenset[str] = frozenset()) -> FFmpegTools:
+    """Make tools without probing a binary."""
+    return FFmpegTools(
+        ffmpeg=Path("ffmpeg"),
+        ffprobe=None,
+        version="7.0",
+        encoders=frozenset({"libx264", "aac"}),
+        mp4_flags=mp4_flags,
+    )
+
+
+class TestFFmpegTools:
+    """Test class for FFmpegTools."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        tools = make_tools(FRAGMENTED_MP4_FLAGS)
+
+        assert tools.ffmpeg == Path("ffmpeg"), "ffmpeg should be set"
+        assert tools.ffprobe is None, "ffprobe should be set"
+        assert tools.version == "7.0", "Version should be set"
+        assert tools.encoders == {"libx264", "aac"}, "Encoders should be set"
+        assert tools.mp4_flags == FRAGMENTED_MP4_FLAGS, "Flags should be set"
+
+    def test_supports_faststart(self) -> None:
+        """Test method for supports_faststart."""
+        assert make_tools(frozenset({"faststart"})).supports_faststart, (
+            "Should support faststart"
+        )
+        assert not make_tools().supports_faststart, "Should need the faststart flag"
+
+    def test_supports_fragmented_mp4(self) -> None:
+        """Test method for supports_fragmented_mp4."""
+        assert make_tools(FRAGMENTED_MP4_FLAGS).supports_fragmented_mp4, (
+            "Should support fragmented mp4"
+        )
+        assert not make_tools(frozenset({"frag_keyframe"})).supports_fragmented_mp4, (
+            "Should need all fragmented mp4 flags"
+        )
+
+    def test_has_encoder(self) -> None:
+        """Test method for has_encoder."""
+        tools = make_tools()
+
+        assert tools.has_encoder("libx264"), "Should have the encoder"
+        assert not tools.has_encoder("libx265"), "Should not have the encoder"
+
+
+def test_get_ffmpeg_tools(mocker: MockerFixture) -> None:
+    """Test func for get_ffmpeg_tools."""
+    tools = get_ffmpeg_tools()
+
+    assert tools.ffmpeg.exists(), "Should find the ffmpeg binary"
+    assert tools.version, "Should read the version"
+    assert tools.has_encoder("aac"), "Should list the encoders"
+    assert tools.supports_fragmented_mp4, "Should support fragmented mp4"
+
+    mock_find_ffmpeg = mocker.patch(make_obj_importpath(ffmpeg_module) + ".find_ffmpeg")
+    assert get_ffmpeg_tools() is tools, "Should resolve the tools once"
+    mock_find_ffmpeg.assert_not_called()
+
+    mock_probe_ffmpeg_tools = mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".probe_ffmpeg_tools",
+        side_effect=lambda: FFMPEG_TOOLS_LOCK.locked(),
+    )
+    assert get_ffmpeg_tools(), "Should probe under the lock"
+    mock_probe_ffmpeg_tools.assert_called_once()
+
+
+def test_probe_ffmpeg_tools(mocker: MockerFixture) -> None:
+    """Test func for probe_ffmpeg_tools."""
+    bundled = Path("bundled/ffmpeg")
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".find_ffmpeg", return_value=bundled
+    )
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".get_ffmpeg_version",
+        side_effect=subprocess.CalledProcessError(1, "ffmpeg"),
+    )
+    probe_ffmpeg_tools.cache_clear()
+    try:
+        tools = probe_ffmpeg_tools()
+    finally:
+        probe_ffmpeg_tools.cache_clear()
+
+    assert tools.ffmpeg == bundled, "Should use the ffmpeg that was found"
+    assert tools.version == "", "Version should be unknown"
+    assert not tools.supports_fragmented_mp4, "Should not stream with it"
+
+
+def test_find_ffmpeg(mocker: MockerFixture) -> None:
+    """Test func for find_ffmpeg."""
+    bundled = Path("bundled/ffmpeg")
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".imageio_ffmpeg.get_ffmpeg_exe",
+        return_value=str(bundled),
+    )
+    mock_which = mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".shutil.which", return_value=None
+    )
+    mock_get_ffmpeg_version = mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".get_ffmpeg_version"
+    )
+    assert find_ffmpeg() == bundled, "Should use the bundled ffmpeg"
+
+    mock_which.return_value = "/usr/bin/ffmpeg"
+    assert find_ffmpeg() == Path("/usr/bin/ffmpeg"), "Should prefer the system ffmpeg"
+
+    mock_get_ffmpeg_version.side_effect = OSError("broken")
+    assert find_ffmpeg() == bundled, "Should skip a system ffmpeg that does not run"
+
+
+def test_run_ffmpeg(mocker: MockerFixture) -> None:
+    """Test func for run_ffmpeg."""
+    mock_run = mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".subprocess.run",
+        return_value=subprocess.CompletedProcess([], 0, stdout="output"),
+    )
+
+    assert run_ffmpeg(Path("ffmpeg"), "-version") == "output", "Should return stdout"
+    assert mock_run.call_args[0][0] == ["ffmpeg", "-hide_banner", "-version"], (
+        "Should run ffmpeg with the args"
+    )
+
+
+def test_get_ffmpeg_version(mocker: MockerFixture) -> None:
+    """Test func for get_ffmpeg_version."""
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".run_ffmpeg",
+        return_value="ffmpeg version 7.0.2-static Copyright (c) 2000-2024\n",
+    )
+
+    assert get_ffmpeg_version(Path("ffmpeg")) == "7.0.2-static", (
+        "Should parse the version"
+    )
+
+
+def test_get_ffmpeg_encoders(mocker: MockerFixture) -> None:
+    """Test func for get_ffmpeg_encoders."""
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".run_ffmpeg",
+        return_value=(
+            "Encoders:\n V..... = Video\n ------\n"
+            " V....D libx264  H.264\n A....D aac  AAC\n"
+        ),
+    )
+
+    assert get_ffmpeg_encoders(Path("ffmpeg")) == {"libx264", "aac"}, (
+        "Should parse the encoder names"
+    )
+
+
+def test_get_mp4_muxer_flags(mocker: MockerFixture) -> None:
+    """Test func for get_mp4_muxer_flags."""
+    mocker.patch(
+        make_obj_importpath(ffmpeg_module) + ".run_ffmpeg",
+        return_value=(
+            "Muxer mp4:\n    Common extensions: mp4.\n"
+            "mp4 muxer AVOptions:\n"
+            "  -movflags  <flags>  E.......... MOV muxer flags\n"
+            "     faststart  E.......... Put the index first\n"
+        ),
+    )
+
+    assert get_mp4_muxer_flags(Path("ffmpeg")) == {"movflags", "faststart"}, (
+        "Should parse the options and flags"
+    )
 
 
 def test_get_ffmpeg_path() -> None:
     """Test func for get_ffmpeg_path."""
     path = get_ffmpeg_path()
-    assert isinstance(path, Path), "Should find ffmpeg binary"
+    assert path == get_ffmpeg_tools().ffmpeg, "Should find ffmpeg binary"
+
+
+def test_is_mp4_codec() -> None:
+    """Test func for is_mp4_codec."""
+    assert is_mp4_codec("avc1.64001F"), "H.264 should be mp4 compatible"
+    assert is_mp4_codec("mp4a.40.2"), "AAC should be mp4 compatible"
+    assert is_mp4_codec("AV01.0.08M.08"), "Codecs should be case insensitive"
+    assert not is_mp4_codec("vp8"), "VP8 should not be mp4 compatible"
+    assert not is_mp4_codec("vorbis"), "Vorbis should not be mp4 compatible"
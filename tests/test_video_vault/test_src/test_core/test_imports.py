@@ -0,0 +1,23 @@
+"""module."""
+
+import json
+
+from video_vault.src.core.imports import LazyModule, lazy_import
+
+
+class TestLazyModule:
+    """Test class for LazyModule."""
+
+    def test___getattr__(self) -> None:
+        """Test method for __getattr__."""
+        module = LazyModule("json")
+
+        assert module.dumps is json.dumps, "Should get the attribute of the module"
+
+
+def test_lazy_import() -> None:
+    """Test func for lazy_import."""
+    module = lazy_import("json")
+
+    assert isinstance(module, LazyModule), "Module should be imported on first use"
+    assert module.__name__ == "json", "Module should have the name"
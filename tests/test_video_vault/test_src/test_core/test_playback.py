@@ -0,0 +1,116 @@
+"""module."""
+
+import pytest
+from django.db import DatabaseError
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.core import playback as playback_module
+from video_vault.src.core.playback import PositionCheckpoints
+from video_vault.src.db.models import File
+
+
+class TestPositionCheckpoints:
+    """Test class for PositionCheckpoints."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test method for __init__."""
+        mock_timer = mocker.patch(
+            make_obj_importpath(playback_module) + ".QTimer"
+        ).return_value
+
+        checkpoints = PositionCheckpoints()
+
+        assert checkpoints.positions == {}, "Nothing should be recorded"
+        assert checkpoints.dirty == set(), "Nothing should be pending"
+        mock_timer.setInterval.assert_called_once_with(
+            PositionCheckpoints.FLUSH_INTERVAL_MS
+        )
+        mock_timer.timeout.connect.assert_called_once_with(checkpoints.flush)
+        mock_timer.start.assert_called_once()
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert (
+            PositionCheckpoints.get_instance() is PositionCheckpoints.get_instance()
+        ), "Should always return the same checkpoints"
+
+    def test_record(self) -> None:
+        """Test method for record."""
+        checkpoints = PositionCheckpoints()
+
+        # scrubbing records many positions, only the last one is kept
+        for position in range(0, 5000, 100):
+            checkpoints.record(1, position)
+
+        expected_position = 4900
+        assert checkpoints.positions == {1: expected_position}, (
+            "Should keep the last position"
+        )
+        assert checkpoints.dirty == {1}, "File should be pending"
+
+        checkpoints.dirty.clear()
+        checkpoints.record(1, expected_position)
+        assert checkpoints.dirty == set(), "Same position should not be written again"
+
+    def test_get_position(self) -> None:
+        """Test method for get_position."""
+        checkpoints = PositionCheckpoints()
+        checkpoints.record(1, 2500)
+
+        expected_position = 2500
+        assert checkpoints.get_position(1, 0) == expected_position, (
+            "Should return the recorded position"
+        )
+        assert checkpoints.get_position(2, 0) == 0, "Should fall back to the default"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_flush(self) -> None:
+        """Test method for flush."""
+        first = File.objects.create(file="first.mp4")
+        second = File.objects.create(file="second.mp4")
+        checkpoints = PositionCheckpoints()
+        assert checkpoints.flush() is None, "Nothing should be written"
+
+        checkpoints.record(first.pk, 1000)
+        checkpoints.record(second.pk, 2000)
+        future = checkpoints.flush()
+
+        assert future is not None, "Should write the positions"
+        expected_updated = 2
+        assert future.result() == expected_updated, "Should update both files"
+        assert checkpoints.dirty == set(), "Nothing should be pending"
+        first.refresh_from_db()
+        second.refresh_from_db()
+        expected_first = 1000
+        expected_second = 2000
+        assert first.last_position == expected_first, "Position should be written"
+        assert second.last_position == expected_second, "Position should be written"
+
+    @pytest.mark.django_db
+    def test_write(self, mocker: MockerFixture) -> None:
+        """Test method for write."""
+        file = File.objects.create(file="video.mp4")
+        checkpoints = PositionCheckpoints()
+
+        updated = checkpoints.write([File(pk=file.pk, last_position=500)])
+
+        assert updated == 1, "Should update the file"
+        file.refresh_from_db()
+        expected_position = 500
+        assert file.last_position == expected_position, "Position should be written"
+
+        mocker.patch.object(
+            File.objects, "bulk_update", side_effect=DatabaseError("locked")
+        )
+        assert checkpoints.write([file]) == 0, "Errors should be logged"
+        assert checkpoints.dirty == {file.pk}, "File should be pending again"
+
+    def test_on_about_to_quit(self, mocker: MockerFixture) -> None:
+        """Test method for on_about_to_quit."""
+        checkpoints = PositionCheckpoints()
+        mock_flush = mocker.patch.object(checkpoints, "flush")
+
+        checkpoints.on_about_to_quit()
+
+        mock_flush.return_value.result.assert_called_once()
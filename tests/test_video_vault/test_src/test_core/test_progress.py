@@ -0,0 +1,214 @@
+"""module."""
+
+import io
+
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.core import progress as progress_module
+from video_vault.src.core.progress import (
+    DownloadProgress,
+    ProgressReader,
+    ProgressThrottle,
+    ProgressTracker,
+    Stage,
+    format_speed,
+)
+
+
+def test_format_speed() -> None:
+    """Test func for format_speed."""
+    assert format_speed(0) == "0.0 B/s", "Should format bytes"
+    assert format_speed(1_500_000) == "1.5 MB/s", "Should use the largest unit"
+    assert format_speed(2_000_000_000_000) == "2000.0 GB/s", "GB/s is the last unit"
+
+
+class TestStage:
+    """Test class for Stage."""
+
+
+class TestDownloadProgress:
+    """Test class for DownloadProgress."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        progress = DownloadProgress(Stage.ENCRYPT)
+
+        assert progress.stage == Stage.ENCRYPT, "Stage should be set"
+        assert progress.downloaded_bytes == 0, "Nothing should be downloaded"
+        assert progress.total_bytes is None, "Total should be unknown"
+        assert progress.speed is None, "Speed should be unknown"
+        assert progress.eta is None, "ETA should be unknown"
+
+    def test_from_progress_hook(self) -> None:
+        """Test method for from_progress_hook."""
+        status = {
+            "status": "downloading",
+            "downloaded_bytes": 100,
+            "total_bytes_estimate": 1000,
+            "speed": 50.0,
+            "eta": 18,
+        }
+
+        progress = DownloadProgress.from_progress_hook(status)
+
+        expected_downloaded, expected_total, expected_eta = 100, 1000, 18
+        assert progress.stage == Stage.DOWNLOAD, "Should be the download stage"
+        assert progress.downloaded_bytes == expected_downloaded, "Should map the size"
+        assert progress.total_bytes == expected_total, (
+            "Should fall back to the estimated size"
+        )
+        assert progress.speed == status["speed"], "Should map the speed"
+        assert progress.eta == expected_eta, "Should map the ETA"
+
+        empty = DownloadProgress.from_progress_hook({})
+        assert empty.downloaded_bytes == 0, "Missing size should be 0"
+        assert empty.total_bytes is None, "Missing total should be empty"
+
+    def test_from_postprocessor_hook(self) -> None:
+        """Test method for from_postprocessor_hook."""
+        merge = DownloadProgress.from_postprocessor_hook({"postprocessor": "Merger"})
+        other = DownloadProgress.from_postprocessor_hook({"postprocessor": "Other"})
+
+        assert merge.stage == Stage.MERGE, "Merger should be the merge stage"
+        assert other.stage == Stage.CONVERT, "Others should be the convert stage"
+
+
+class TestProgressThrottle:
+    """Test class for ProgressThrottle."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test method for __init__."""
+        on_progress = mocker.Mock()
+
+        throttle = ProgressThrottle(on_progress, interval_s=1.0)
+
+        assert throttle.on_progress is on_progress, "Callback should be set"
+        assert throttle.interval_s == 1.0, "Interval should be set"
+        assert throttle.last_stage is None, "Nothing should be passed on yet"
+
+    def test___call__(self, mocker: MockerFixture) -> None:
+        """Test method for __call__."""
+        mock_monotonic = mocker.patch(
+            make_obj_importpath(progress_module) + ".time.monotonic",
+            return_value=10.0,
+        )
+        on_progress = mocker.Mock()
+        throttle = ProgressThrottle(on_progress, interval_s=1.0)
+        first = DownloadProgress(Stage.DOWNLOAD, 1)
+        second = DownloadProgress(Stage.DOWNLOAD, 2)
+        merge = DownloadProgress(Stage.MERGE)
+
+        throttle(first)
+        throttle(second)
+        throttle(merge)
+        mock_monotonic.return_value = 11.0
+        throttle(merge)
+
+        assert on_progress.call_args_list == [
+            mocker.call(first),
+            mocker.call(merge),
+            mocker.call(merge),
+        ], "Should drop progress of the same stage within the interval"
+
+
+class TestProgressReader:
+    """Test class for ProgressReader."""
+
+    def test___init__(self, mocker: MockerFixture) -> None:
+        """Test method for __init__."""
+        stream = io.BytesIO()
+        on_progress = mocker.Mock()
+
+        reader = ProgressReader(stream, Stage.DOWNLOAD, on_progress)
+
+        assert reader.stream is stream, "Stream should be set"
+        assert reader.stage == Stage.DOWNLOAD, "Stage should be set"
+        assert reader.read_bytes == 0, "Nothing should be read yet"
+
+    def test_read(self, mocker: MockerFixture) -> None:
+        """Test method for read."""
+        mocker.patch(
+            make_obj_importpath(progress_module) + ".time.monotonic",
+            side_effect=[0.0, 2.0, 2.0],
+        )
+        on_progress = mocker.Mock()
+        reader = ProgressReader(io.BytesIO(b"abcdef"), Stage.DOWNLOAD, on_progress)
+
+        assert reader.read(4) == b"abcd", "Should read from the stream"
+        on_progress.assert_called_once()
+        progress = on_progress.call_args.args[0]
+        expected_read, expected_speed = 4, 2.0
+        assert progress.stage == Stage.DOWNLOAD, "Should report the stage"
+        assert progress.downloaded_bytes == expected_read, "Should report the size"
+        assert progress.speed == expected_speed, "Should report the speed"
+        assert reader.read() == b"ef", "Should read the rest"
+        expected_bytes = 6
+        assert reader.read_bytes == expected_bytes, "Should count the read bytes"
+
+
+class TestProgressTracker:
+    """Test class for ProgressTracker."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        tracker = ProgressTracker()
+
+        assert tracker.jobs == {}, "Nothing should be tracked"
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert ProgressTracker.get_instance() is ProgressTracker.get_instance(), (
+            "Should always return the same tracker"
+        )
+
+    def test_update(self, mocker: MockerFixture) -> None:
+        """Test method for update."""
+        tracker = ProgressTracker()
+        on_changed = mocker.Mock()
+        tracker.changed.connect(on_changed)
+        progress = DownloadProgress(Stage.DOWNLOAD, speed=100.0)
+
+        tracker.update(1, progress)
+
+        assert tracker.jobs == {1: progress}, "Progress should be stored"
+        on_changed.assert_called_once_with(1, 100.0)
+
+    def test_remove(self, mocker: MockerFixture) -> None:
+        """Test method for remove."""
+        tracker = ProgressTracker()
+        tracker.jobs[1] = DownloadProgress(Stage.SAVE)
+        on_changed = mocker.Mock()
+        tracker.changed.connect(on_changed)
+
+        tracker.remove(1)
+        tracker.remove(1)
+
+        assert tracker.jobs == {}, "Progress should be removed"
+        on_changed.assert_called_once_with(0, 0.0)
+
+    def test_get_total_speed(self) -> None:
+        """Test method for get_total_speed."""
+        tracker = ProgressTracker()
+        tracker.jobs = {
+            1: DownloadProgress(Stage.DOWNLOAD, speed=100.0),
+            2: DownloadProgress(Stage.DOWNLOAD, speed=50.0),
+            3: DownloadProgress(Stage.DOWNLOAD),
+            4: DownloadProgress(Stage.ENCRYPT, speed=1000.0),
+        }
+
+        expected_speed = 150.0
+        assert tracker.get_total_speed() == expected_speed, (
+            "Should sum the speeds of the downloading jobs"
+        )
+
+    def test_emit_changed(self, mocker: MockerFixture) -> None:
+        """Test method for emit_changed."""
+        tracker = ProgressTracker()
+        tracker.jobs[1] = DownloadProgress(Stage.DOWNLOAD, speed=10.0)
+        on_changed = mocker.Mock()
+        tracker.changed.connect(on_changed)
+
+        tracker.emit_changed()
+
+        on_changed.assert_called_once_with(1, 10.0)
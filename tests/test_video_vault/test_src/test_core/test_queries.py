@@ -0,0 +1,63 @@
+"""module."""
+
+from concurrent.futures import Future
+
+from pytest_mock import MockerFixture
+
+from video_vault.src.core.queries import QueryRunner
+
+
+class TestQueryRunner:
+    """Test class for QueryRunner."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        runner = QueryRunner()
+
+        assert runner.executor.submit(lambda: 1).result() == 1, (
+            "Executor should run queries"
+        )
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert QueryRunner.get_instance() is QueryRunner.get_instance(), (
+            "Should always return the same runner"
+        )
+
+    def test_run(self, mocker: MockerFixture) -> None:
+        """Test method for run."""
+        runner = QueryRunner()
+        mock_on_done = mocker.patch.object(runner, "on_done")
+        on_result = mocker.Mock()
+
+        future = runner.run(lambda: 42, on_result)
+
+        expected_result = 42
+        assert future.result() == expected_result, "Should run the query"
+        runner.executor.shutdown(wait=True)
+        mock_on_done.assert_called_once_with(future, on_result)
+
+    def test_on_done(self, mocker: MockerFixture) -> None:
+        """Test method for on_done."""
+        runner = QueryRunner()
+        on_result = mocker.Mock()
+        future: Future[int] = Future()
+        future.set_result(42)
+
+        # emitted on the thread of the runner, so the slot is called directly
+        runner.on_done(future, on_result)
+        on_result.assert_called_once_with(42)
+
+        failed: Future[int] = Future()
+        failed.set_exception(ValueError("locked"))
+        runner.on_done(failed, on_result)
+        on_result.assert_called_once()
+
+    def test_on_result_ready(self, mocker: MockerFixture) -> None:
+        """Test method for on_result_ready."""
+        runner = QueryRunner()
+        on_result = mocker.Mock()
+
+        runner.on_result_ready(on_result, "result")
+
+        on_result.assert_called_once_with("result")
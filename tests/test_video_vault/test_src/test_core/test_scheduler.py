@@ -0,0 +1,399 @@
+"""module."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture, MockType
+
+from video_vault.src.core import scheduler as scheduler_module
+from video_vault.src.core.progress import ProgressTracker
+from video_vault.src.core.scheduler import DownloadScheduler, QueuedDownload
+from video_vault.src.db.models import DownloadJob
+
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie
+
+
+@pytest.fixture
+def mock_download_workers(mocker: MockerFixture) -> list[MockType]:
+    """Mock DownloadWorker so no threads are started.
+
+    Returns the created workers in order.
+    """
+    workers: list[MockType] = []
+
+    def make_worker(
+        job: DownloadJob, cookies: list[object], *, notify: bool = True
+    ) -> MockType:
+        worker: MockType = mocker.Mock()
+        worker.job = job
+        worker.url = job.url
+        worker.host = job.url.split("/")[2]
+        worker.cookies = cookies
+        worker.retrying = False
+        worker.notify = notify
+        workers.append(worker)
+        return worker
+
+    mocker.patch(
+        make_obj_importpath(scheduler_module) + ".DownloadWorker",
+        side_effect=make_worker,
+    )
+    return workers
+
+
+class TestQueuedDownload:
+    """Test class for QueuedDownload."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        job = DownloadJob(url="https://a.com/1")
+
+        download = QueuedDownload(job, [])
+
+        assert download.job == job, "Job should be set"
+        assert download.cookies == [], "Cookies should be set"
+        assert download.notify is True, "Should notify by default"
+        assert download.on_started is None, "Nothing should be called on start"
+        assert download.worker is None, "Worker should be created on start"
+
+    def test_host(self) -> None:
+        """Test method for host."""
+        download = QueuedDownload(DownloadJob(url="https://a.com:8080/1"), [])
+
+        assert download.host == "a.com", "Host should be taken from the url"
+
+
+class TestDownloadScheduler:
+    """Test class for DownloadScheduler."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        scheduler = DownloadScheduler(max_concurrent=5, max_concurrent_per_host=1)
+
+        expected_max_concurrent = 5
+        assert scheduler.max_concurrent == expected_max_concurrent, (
+            "Global limit should be set"
+        )
+        assert scheduler.max_concurrent_per_host == 1, "Host limit should be set"
+        assert scheduler.queue == [], "Queue should be empty"
+        assert scheduler.running == [], "Nothing should be running"
+
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert DownloadScheduler.get_instance() is DownloadScheduler.get_instance(), (
+            "Should always return the same scheduler"
+        )
+
+    @pytest.mark.django_db
+    def test_schedule(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for schedule."""
+        scheduler = DownloadScheduler(max_concurrent=1)
+
+        scheduler.schedule("https://a.com/1", [])
+        job = scheduler.schedule("https://b.com/2", [], notify=False, rate_limit=1000)
+
+        (first,) = mock_download_workers
+        first.start.assert_called_once()
+        first.finished.connect.assert_called_once()
+        assert scheduler.get_queued_count() == 1, "Second download should wait"
+        assert DownloadJob.objects.filter(url="https://b.com/2").exists(), (
+            "Job should be persisted"
+        )
+        expected_rate_limit = 1000
+        assert job.rate_limit == expected_rate_limit, (
+            "Rate limit should be saved with the job"
+        )
+        assert scheduler.queue[0][-1].notify is False, "Notify should be kept"
+
+    @pytest.mark.django_db
+    def test_schedule_many(
+        self, mocker: MockerFixture, mock_download_workers: list[MockType]
+    ) -> None:
+        """Test method for schedule_many."""
+        scheduler = DownloadScheduler(max_concurrent=1)
+        on_started = mocker.Mock()
+        cookies: list[Cookie] = []
+
+        jobs = scheduler.schedule_many(
+            [("https://a.com/1", []), ("https://a.com/2", cookies)],
+            priority=5,
+            notify=False,
+            on_started=on_started,
+        )
+
+        assert [job.url for job in jobs] == ["https://a.com/1", "https://a.com/2"], (
+            "Should return the jobs in order"
+        )
+        assert all(job.pk for job in jobs), "Jobs should be persisted"
+        (worker,) = mock_download_workers
+        assert worker.job == jobs[0], "Only the started download gets a worker"
+        assert worker.notify is False, "Notify should be passed to the worker"
+        on_started.assert_called_once_with(worker)
+        download = scheduler.queue[0][-1]
+        expected_priority = -5
+        assert scheduler.queue[0][0] == expected_priority, (
+            "Job priority should be used for the queue"
+        )
+        assert download.job == jobs[1], "Second job should wait"
+        assert download.cookies is cookies, "Cookies should wait with the job"
+        assert download.worker is None, "Waiting job should have no worker"
+
+    @pytest.mark.django_db
+    def test_push(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for push."""
+        scheduler = DownloadScheduler(max_concurrent=0)
+        job = DownloadJob.objects.create(url="https://a.com/1", priority=5)
+
+        scheduler.push(QueuedDownload(job, []))
+
+        assert mock_download_workers == [], "Queued download should have no worker"
+        assert scheduler.get_queued_count() == 1, "Download should be queued"
+
+        scheduler.queue.clear()
+        scheduler.max_concurrent = 1
+        scheduler.push(QueuedDownload(job, []))
+
+        (worker,) = mock_download_workers
+        worker.start.assert_called_once()
+        assert scheduler.running == [worker], "Worker should be started"
+
+    @pytest.mark.django_db
+    def test_get_worker(
+        self, mocker: MockerFixture, mock_download_workers: list[MockType]
+    ) -> None:
+        """Test method for get_worker."""
+        scheduler = DownloadScheduler()
+        on_started = mocker.Mock()
+        job = DownloadJob.objects.create(url="https://a.com/1")
+        download = QueuedDownload(job, [], notify=False, on_started=on_started)
+
+        worker = scheduler.get_worker(download)
+
+        (mock_worker,) = mock_download_workers
+        assert mock_worker is worker, "Should create one worker"
+        assert worker.job == job, "Worker should run the job"
+        assert worker.notify is False, "Notify should be passed to the worker"
+        assert download.worker is worker, "Worker should be kept"
+        mock_worker.progress.connect.assert_called_once_with(
+            ProgressTracker.get_instance().update
+        )
+        mock_worker.finished.connect.assert_called_once()
+        on_started.assert_called_once_with(worker)
+
+        assert scheduler.get_worker(download) is worker, "Should reuse the worker"
+        assert len(mock_download_workers) == 1, "Should not create another worker"
+
+    @pytest.mark.django_db
+    def test_resume_unfinished(
+        self, mocker: MockerFixture, mock_download_workers: list[MockType]
+    ) -> None:
+        """Test method for resume_unfinished."""
+        mock_clean_staging_dirs = mocker.patch(
+            make_obj_importpath(scheduler_module) + ".clean_staging_dirs"
+        )
+        scheduler = DownloadScheduler(max_concurrent=0)
+        running = DownloadJob.objects.create(
+            url="https://a.com/1", state=DownloadJob.State.RUNNING
+        )
+        queued = DownloadJob.objects.create(url="https://a.com/2")
+        DownloadJob.objects.create(url="https://a.com/3", state=DownloadJob.State.DONE)
+        DownloadJob.objects.create(
+            url="https://a.com/4", state=DownloadJob.State.FAILED
+        )
+        exhausted = DownloadJob.objects.create(
+            url="https://a.com/5",
+            state=DownloadJob.State.RUNNING,
+            attempts=DownloadJob.MAX_ATTEMPTS,
+        )
+
+        jobs = scheduler.resume_unfinished()
+
+        assert jobs == [running, queued], (
+            "Only unfinished jobs should be resumed in order"
+        )
+        assert [entry[-1].job for entry in sorted(scheduler.queue)] == jobs, (
+            "Jobs should be queued in order"
+        )
+        assert mock_download_workers == [], "Workers should be created on start"
+        assert jobs[0].state == DownloadJob.State.QUEUED, (
+            "Returned jobs should be queued"
+        )
+        running.refresh_from_db()
+        assert running.state == DownloadJob.State.QUEUED, (
+            "Resumed jobs should be queued again"
+        )
+        exhausted.refresh_from_db()
+        assert exhausted.state == DownloadJob.State.FAILED, (
+            "Jobs that used up their attempts should fail"
+        )
+        kept_job_ids = list(mock_clean_staging_dirs.call_args[0][0])
+        assert kept_job_ids == [running.pk, queued.pk], (
+            "Staging dirs of resumed jobs should be kept"
+        )
+
+    @pytest.mark.django_db
+    def test_dispatch(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for dispatch."""
+        scheduler = DownloadScheduler(max_concurrent=2, max_concurrent_per_host=1)
+        # fill the queue without starting anything
+        scheduler.max_concurrent = 0
+        scheduler.schedule("https://a.com/1", [])
+        scheduler.schedule("https://a.com/2", [])
+        scheduler.schedule("https://b.com/1", [], priority=-1)
+        scheduler.schedule("https://c.com/1", [], priority=1)
+
+        scheduler.max_concurrent = 2
+        scheduler.dispatch()
+
+        high_priority, same_host_1 = mock_download_workers
+        assert high_priority.url == "https://c.com/1", "Priority should go first"
+        assert same_host_1.url == "https://a.com/1", "Then the oldest job"
+        high_priority.start.assert_called_once()
+        same_host_1.start.assert_called_once()
+        expected_queued = 2
+        assert scheduler.get_queued_count() == expected_queued, (
+            "Skipped downloads should stay queued"
+        )
+
+        # a free global slot skips the host that is at its limit
+        scheduler.running.remove(high_priority)
+        scheduler.dispatch()
+        low_priority = mock_download_workers[-1]
+        assert low_priority.url == "https://b.com/1", "Other host should start"
+        low_priority.start.assert_called_once()
+        assert scheduler.get_queued_count() == 1, "Same host should wait"
+
+    @pytest.mark.django_db
+    def test_on_worker_finished(
+        self, mocker: MockerFixture, mock_download_workers: list[MockType]
+    ) -> None:
+        """Test method for on_worker_finished."""
+        mock_tracker = mocker.patch(
+            make_obj_importpath(scheduler_module) + ".ProgressTracker.get_instance"
+        ).return_value
+        scheduler = DownloadScheduler(max_concurrent=1)
+        scheduler.schedule("https://a.com/1", [])
+        scheduler.schedule("https://b.com/1", [])
+        (first,) = mock_download_workers
+
+        scheduler.on_worker_finished(first)
+
+        first.wait.assert_called_once()
+        mock_tracker.remove.assert_called_once_with(first.job.pk)
+        assert first not in scheduler.running, "Finished worker should be removed"
+        second = mock_download_workers[-1]
+        second.start.assert_called_once()
+        assert scheduler.get_queued_count() == 0, "Next worker should be started"
+
+        # failed workers with attempts left are retried after a delay
+        mock_timer = mocker.patch(make_obj_importpath(scheduler_module) + ".QTimer")
+        second.retrying = True
+        second.job.attempts = 2
+
+        scheduler.on_worker_finished(second)
+
+        assert scheduler.retrying == [second], "Worker should wait for its retry"
+        expected_delay_ms = DownloadScheduler.RETRY_DELAY_MS * 2
+        assert mock_timer.singleShot.call_args[0][0] == expected_delay_ms, (
+            "Delay should grow with the attempts"
+        )
+
+    @pytest.mark.django_db
+    def test_retry(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for retry."""
+        scheduler = DownloadScheduler()
+        scheduler.schedule("https://a.com/1", [])
+        (worker,) = mock_download_workers
+        scheduler.running.clear()
+        scheduler.max_concurrent = 0
+        scheduler.retrying.append(worker)
+
+        scheduler.retry(worker)
+
+        assert scheduler.retrying == [], "Worker should not wait anymore"
+        assert scheduler.get_queued_count() == 1, "Worker should be queued again"
+        assert scheduler.queue[0][-1].worker is worker, "Worker should be reused"
+
+        # a worker cancelled while it waited is not queued again
+        scheduler.queue.clear()
+        scheduler.retry(worker)
+        assert scheduler.get_queued_count() == 0, "Worker should not be queued"
+
+    @pytest.mark.django_db
+    def test_cancel(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for cancel."""
+        scheduler = DownloadScheduler(max_concurrent=1)
+        running_job = scheduler.schedule("https://a.com/1", [])
+        queued_job = scheduler.schedule("https://b.com/1", [])
+
+        assert scheduler.cancel(queued_job.pk) is True, "Should cancel"
+        running, queued = mock_download_workers
+        assert queued.job == queued_job, "Queued job should get a worker to finish"
+        queued.cancel.assert_called_once()
+        queued.start.assert_called_once()
+        assert scheduler.get_queued_count() == 0, "Download should leave the queue"
+
+        assert scheduler.cancel(running_job.pk) is True, "Should cancel"
+        running.cancel.assert_called_once()
+
+        scheduler.running.clear()
+        retrying_job = scheduler.schedule("https://c.com/1", [])
+        retrying = mock_download_workers[-1]
+        scheduler.running.clear()
+        scheduler.retrying.append(retrying)
+        assert scheduler.cancel(retrying_job.pk) is True, "Should cancel"
+        retrying.cancel.assert_called_once()
+        expected_starts = 2
+        assert retrying.start.call_count == expected_starts, (
+            "Cancelled worker should be started to finish"
+        )
+        assert scheduler.retrying == [], "Worker should not be retried"
+
+        unknown_job_id = retrying_job.pk + 1
+        assert scheduler.cancel(unknown_job_id) is False, "Unknown job"
+
+    @pytest.mark.django_db
+    def test_cancel_all(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for cancel_all."""
+        scheduler = DownloadScheduler(max_concurrent=1)
+        scheduler.schedule("https://a.com/1", [])
+        scheduler.schedule("https://b.com/1", [])
+
+        expected_cancelled = 2
+        assert scheduler.cancel_all() == expected_cancelled, "Should cancel both"
+        running, queued = mock_download_workers
+        running.cancel.assert_called_once()
+        queued.cancel.assert_called_once()
+        queued.start.assert_called_once()
+        assert scheduler.get_queued_count() == 0, "Queue should be empty"
+
+    @pytest.mark.django_db
+    def test_get_running_count(self, mock_download_workers: list[MockType]) -> None:
+        """Test method for get_running_count."""
+        scheduler = DownloadScheduler(max_concurrent=3, max_concurrent_per_host=3)
+        scheduler.schedule("https://a.com/1", [])
+        scheduler.schedule("https://a.com/2", [])
+        scheduler.schedule("https://b.com/1", [])
+
+        expected_running = 3
+        assert len(mock_download_workers) == expected_running, (
+            "Should create all workers"
+        )
+        assert scheduler.get_running_count() == expected_running, (
+            "Should count all running workers"
+        )
+        expected_running_for_host = 2
+        assert scheduler.get_running_count("a.com") == expected_running_for_host, (
+            "Should count the running workers of a host"
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.usefixtures("mock_download_workers")
+    def test_get_queued_count(self) -> None:
+        """Test method for get_queued_count."""
+        scheduler = DownloadScheduler(max_concurrent=0)
+        scheduler.schedule("https://a.com/1", [])
+
+        assert scheduler.get_queued_count() == 1, "Download should be queued"
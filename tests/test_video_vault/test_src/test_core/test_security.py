@@ -1,70 +1,107 @@
 """module."""
 
+from base64 import b64encode
+
 import pytest
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from pyrig.src.modules.module import make_obj_importpath
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from video_vault.src.core import security as security_module
 from video_vault.src.core.consts import APP_NAME, AUTHOR
-from video_vault.src.core.security import get_app_key_as_str, get_or_create_app_aes_gcm
+from video_vault.src.core.security import (
+    AppKeyProvider,
+    get_app_key_as_str,
+    get_or_create_app_aes_gcm,
+)
+
+KEY = b"k" * 32
+
+
+@pytest.fixture
+def mock_get_or_create_aes_gcm(mocker: MockerFixture) -> MockType:
+    """Mock the keyring lookup and use a fresh provider."""
+    mocker.patch.object(AppKeyProvider, "get_instance", return_value=AppKeyProvider())
+    mock: MockType = mocker.patch(
+        make_obj_importpath(security_module) + ".get_or_create_aes_gcm",
+        return_value=(mocker.Mock(spec=AESGCM), KEY),
+    )
+    return mock
 
 
-def test_get_or_create_app_aes_gcm(mocker: MockerFixture) -> None:
-    """Test func for get_or_create_app_aes_gcm."""
-    # Mock the winiutils function
-    mock_get_or_create_aes_gcm = mocker.patch(
-        make_obj_importpath(security_module) + ".get_or_create_aes_gcm"
-    )
-    mock_aes_gcm = mocker.Mock(spec=AESGCM)
-    # Return a tuple since the code accesses [0]
-    mock_get_or_create_aes_gcm.return_value = (mock_aes_gcm, "mock_key")
+class TestAppKeyProvider:
+    """Test class for AppKeyProvider."""
 
-    # Test the function
-    result = get_or_create_app_aes_gcm()
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        provider = AppKeyProvider()
 
-    # Verify it calls the utility function with correct parameters
-    mock_get_or_create_aes_gcm.assert_called_once_with(APP_NAME, AUTHOR)
+        assert provider.aes_gcm is None, "Key should be fetched on first use"
+        assert provider.keyring_hits == 0, "Keyring should not be read yet"
 
-    # Verify it returns the AESGCM instance
-    assert result is mock_aes_gcm, "Should return the AESGCM instance"
+    def test_get_instance(self) -> None:
+        """Test method for get_instance."""
+        assert AppKeyProvider.get_instance() is AppKeyProvider.get_instance(), (
+            "Should always return the same provider"
+        )
 
+    def test_get_aes_gcm(self, mock_get_or_create_aes_gcm: MockType) -> None:
+        """Test method for get_aes_gcm."""
+        provider = AppKeyProvider()
 
-def test_get_app_key_as_str(mocker: MockerFixture) -> None:
-    """Test func for get_app_key_as_str."""
-    # Mock dependencies
-    mock_get_or_create_aes_gcm = mocker.patch(
-        make_obj_importpath(security_module) + ".get_or_create_aes_gcm"
-    )
-    mock_get_key_as_str = mocker.patch(
-        make_obj_importpath(security_module) + ".get_key_as_str"
-    )
+        first = provider.get_aes_gcm()
+        second = provider.get_aes_gcm()
 
-    # Test successful case
-    expected_key = "test_key_string"
-    mock_get_key_as_str.return_value = expected_key
+        assert first == mock_get_or_create_aes_gcm.return_value[0], (
+            "Should return the keyring AESGCM"
+        )
+        assert second == first, "Should share the AESGCM"
+        mock_get_or_create_aes_gcm.assert_called_once_with(APP_NAME, AUTHOR)
+        assert provider.keyring_hits == 1, "Keyring should be read once"
 
-    result = get_app_key_as_str()
+    def test_get_key_as_str(self, mock_get_or_create_aes_gcm: MockType) -> None:
+        """Test method for get_key_as_str."""
+        provider = AppKeyProvider()
 
-    # Verify it calls get_or_create_aes_gcm first
-    mock_get_or_create_aes_gcm.assert_called_once_with(APP_NAME, AUTHOR)
+        assert provider.get_key_as_str() == b64encode(KEY).decode("ascii"), (
+            "Should return the key as stored in the keyring"
+        )
+        provider.get_aes_gcm()
+        mock_get_or_create_aes_gcm.assert_called_once()
 
-    # Verify it calls get_key_as_str with correct parameters
-    mock_get_key_as_str.assert_called_once_with(APP_NAME, AUTHOR, key_class=AESGCM)
+    def test_invalidate(self, mock_get_or_create_aes_gcm: MockType) -> None:
+        """Test method for invalidate."""
+        provider = AppKeyProvider()
+        provider.get_aes_gcm()
 
-    # Verify it returns the key
-    assert result == expected_key, f"Should return key={expected_key}"
+        provider.invalidate()
+        provider.get_aes_gcm()
 
-    # Test error case when key is None
-    mock_get_key_as_str.return_value = None
-    mock_get_or_create_aes_gcm.reset_mock()
+        expected_hits = 2
+        assert provider.keyring_hits == expected_hits, (
+            "Keyring should be read again after invalidating"
+        )
+        assert mock_get_or_create_aes_gcm.call_count == expected_hits, (
+            "Should fetch the key again"
+        )
 
-    with pytest.raises(ValueError, match="Key not found"):
-        get_app_key_as_str()
 
-    # Verify it still called the functions
-    mock_get_or_create_aes_gcm.assert_called_once()
-    expected_call_count = 2
-    assert mock_get_key_as_str.call_count == expected_call_count, (
-        f"Should call get_key_as_str {expected_call_count} times"
+def test_get_or_create_app_aes_gcm(mock_get_or_create_aes_gcm: MockType) -> None:
+    """Test func for get_or_create_app_aes_gcm."""
+    result = get_or_create_app_aes_gcm()
+    get_or_create_app_aes_gcm()
+
+    mock_get_or_create_aes_gcm.assert_called_once_with(APP_NAME, AUTHOR)
+    assert result == mock_get_or_create_aes_gcm.return_value[0], (
+        "Should return the AESGCM instance"
     )
+
+
+def test_get_app_key_as_str(mock_get_or_create_aes_gcm: MockType) -> None:
+    """Test func for get_app_key_as_str."""
+    get_or_create_app_aes_gcm()
+
+    result = get_app_key_as_str()
+
+    assert result == b64encode(KEY).decode("ascii"), "Should return the key"
+    mock_get_or_create_aes_gcm.assert_called_once_with(APP_NAME, AUTHOR)
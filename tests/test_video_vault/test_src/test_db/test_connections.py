@@ -0,0 +1,79 @@
+"""module."""
+
+import threading
+from collections.abc import Callable
+
+import pytest
+from django.db import connection
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.db import connections as connections_module
+from video_vault.src.db.connections import (
+    close_thread_connections,
+    closes_connections,
+    created_connections,
+    get_open_connection_count,
+    track_connection,
+)
+from video_vault.src.db.models import File
+
+
+def run_in_thread(func: Callable[[], object]) -> None:
+    """Run a function on a new thread and wait for it."""
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+def test_track_connection(mocker: MockerFixture) -> None:
+    """Test func for track_connection."""
+    wrapper = mocker.Mock()
+
+    track_connection(type(connection), wrapper)
+
+    assert wrapper in created_connections, "Connection should be tracked"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_open_connection_count() -> None:
+    """Test func for get_open_connection_count."""
+    File.objects.exists()
+    count = get_open_connection_count()
+    assert count >= 1, "Should count the connection of the main thread"
+
+    run_in_thread(File.objects.exists)
+
+    assert get_open_connection_count() == count + 1, (
+        "Should count the connection the thread left open"
+    )
+
+
+def test_close_thread_connections(mocker: MockerFixture) -> None:
+    """Test func for close_thread_connections."""
+    mock_close_all = mocker.patch(
+        make_obj_importpath(connections_module) + ".connections.close_all"
+    )
+
+    close_thread_connections()
+    mock_close_all.assert_not_called()
+
+    run_in_thread(close_thread_connections)
+    mock_close_all.assert_called_once()
+
+
+def test_closes_connections(mocker: MockerFixture) -> None:
+    """Test func for closes_connections."""
+    mock_close_thread_connections = mocker.patch(
+        make_obj_importpath(connections_module) + ".close_thread_connections"
+    )
+
+    @closes_connections
+    def fail() -> None:
+        msg = "failed"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="failed"):
+        fail()
+
+    mock_close_thread_connections.assert_called_once()
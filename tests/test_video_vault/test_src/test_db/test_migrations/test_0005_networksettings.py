@@ -0,0 +1,5 @@
+"""module."""
+
+
+class TestMigration:
+    """Test class for Migration."""
@@ -1,10 +1,26 @@
 """module."""
 
+import hashlib
+import io
+from datetime import time, timedelta
 from pathlib import Path
 
 import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from pytest_mock import MockerFixture
+from winipyside.src.core.py_qiodevice import EncryptedPyQFile
 
-from video_vault.src.db.models import File
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
+from video_vault.src.core.encryption import StreamEncryptedFile
+from video_vault.src.core.security import get_or_create_app_aes_gcm
+from video_vault.src.db.models import (
+    BandwidthSchedule,
+    DownloadJob,
+    File,
+    NetworkSettings,
+    PendingDeletion,
+)
 
 
 class TestFile:
@@ -62,6 +78,125 @@ class TestFile:
         encrypted_content = result.file.read()
         assert encrypted_content != test_content, "File content should be encrypted"
 
+        # Verify the file can be decrypted by the player format
+        decrypted_content = EncryptedPyQFile.decrypt_data_static(
+            encrypted_content, get_or_create_app_aes_gcm()
+        )
+        assert decrypted_content == test_content, "File content should be decryptable"
+        assert result.sha256 == hashlib.sha256(test_content).hexdigest(), (
+            "Should store the hash of the plaintext"
+        )
+
+    @pytest.mark.django_db
+    def test_create_encrypted_from_stream(self) -> None:
+        """Test method for create_encrypted_from_stream."""
+        test_content = b"fake streamed video content for testing"
+
+        result = File.create_encrypted_from_stream(
+            io.BytesIO(test_content), "streamed_video.mp4"
+        )
+
+        assert File.objects.filter(pk=result.pk).exists(), (
+            "File should exist in database"
+        )
+        assert "streamed_video" in result.display_name, (
+            "Display name should be based on the given name"
+        )
+
+        encrypted_content = result.file.read()
+        decrypted_content = EncryptedPyQFile.decrypt_data_static(
+            encrypted_content, get_or_create_app_aes_gcm()
+        )
+        assert decrypted_content == test_content, "File content should be decryptable"
+
+    @pytest.mark.django_db
+    def test_create_from_encrypted_file(self, mocker: MockerFixture) -> None:
+        """Test method for create_from_encrypted_file."""
+        test_content = b"fake video content for testing"
+        encrypted_file = StreamEncryptedFile(
+            io.BytesIO(test_content), "video.mp4", get_or_create_app_aes_gcm()
+        )
+
+        result = File.create_from_encrypted_file(encrypted_file, video_id="abc")
+
+        result.refresh_from_db()
+        assert result.video_id == "abc", "Extra fields should be saved"
+        assert result.sha256 == hashlib.sha256(test_content).hexdigest(), (
+            "Hash should be saved"
+        )
+        assert result.file.name.startswith(File.UPLOAD_TO), (
+            "File should be saved in the upload dir"
+        )
+
+        # the partial file of a cancelled encryption is removed
+        stored_names = default_storage.listdir(File.UPLOAD_TO)[1]
+        cancel_token = CancelToken()
+
+        def cancel_after_first_read(size: int = -1) -> bytes:
+            cancel_token.cancel()
+            return b"x" * size
+
+        stream = mocker.Mock()
+        stream.read.side_effect = cancel_after_first_read
+        encrypted_file = StreamEncryptedFile(
+            stream, "video.mp4", get_or_create_app_aes_gcm(), cancel_token
+        )
+        with pytest.raises(DownloadCancelledError):
+            File.create_from_encrypted_file(encrypted_file)
+        assert default_storage.listdir(File.UPLOAD_TO)[1] == stored_names, (
+            "Partial file should be removed"
+        )
+
+    @pytest.mark.django_db
+    def test_delete_partial_file(self) -> None:
+        """Test method for delete_partial_file."""
+        name = default_storage.save(
+            f"{File.UPLOAD_TO}/partial.mp4", ContentFile(b"partial")
+        )
+        file = File()
+
+        file.delete_partial_file(name, 1)
+        assert default_storage.exists(name), "File of another size should be kept"
+
+        file.delete_partial_file(name, len(b"partial"))
+        assert not default_storage.exists(name), "Partial file should be deleted"
+        file.delete_partial_file(name, 0)
+
+    @pytest.mark.django_db
+    def test_get_by_source(self) -> None:
+        """Test method for get_by_source."""
+        by_id = File.objects.create(
+            file="a.mp4", extractor_key="Youtube", video_id="abc"
+        )
+        by_url = File.objects.create(file="b.mp4", webpage_url="https://b.com/v")
+
+        assert File.get_by_source("Youtube", "abc", "") == by_id, (
+            "Should find the file by extractor and id"
+        )
+        assert File.get_by_source("Vimeo", "abc", "https://b.com/v") == by_url, (
+            "Should find the file by webpage url"
+        )
+        assert File.get_by_source("Vimeo", "abc", "") is None, (
+            "Same id from another extractor is another video"
+        )
+        assert File.get_by_source("", "", "") is None, (
+            "Files without a source should never match"
+        )
+
+    @pytest.mark.django_db
+    def test_get_duplicate(self) -> None:
+        """Test method for get_duplicate."""
+        first = File.objects.create(file="a.mp4", sha256="1" * 64)
+        second = File.objects.create(file="b.mp4", sha256="1" * 64)
+        other = File.objects.create(file="c.mp4", sha256="2" * 64)
+        unknown = File.objects.create(file="d.mp4")
+        File.objects.create(file="e.mp4")
+
+        assert second.get_duplicate() == first, "Should return the older file"
+        assert first.get_duplicate() == second, "Any other file is a duplicate"
+        assert other.get_duplicate() is None, "Unique content has no duplicate"
+        assert unknown.get_duplicate() is None, "Files without hash never match"
+
     @pytest.mark.django_db
     def test_display_name(self, tmp_path: Path) -> None:
         """Test method for display_name."""
@@ -83,3 +218,348 @@ class TestFile:
         assert "my_test_video" in display_name, (
             "Display name should contain the base filename"
         )
+
+    def test_get_display_name(self) -> None:
+        """Test method for get_display_name."""
+        assert File.get_display_name("downloads/my_video.mp4") == "my_video", (
+            "Should drop the directory and the extension"
+        )
+
+
+class TestDownloadJob:
+    """Test class for DownloadJob."""
+
+    @pytest.mark.django_db
+    def test_get_unfinished(self) -> None:
+        """Test method for get_unfinished."""
+        first = DownloadJob.objects.create(url="https://a.com/1")
+        DownloadJob.objects.create(url="https://a.com/2", state=DownloadJob.State.DONE)
+        encrypting = DownloadJob.objects.create(
+            url="https://a.com/3", state=DownloadJob.State.ENCRYPTING
+        )
+        DownloadJob.objects.create(
+            url="https://a.com/4", state=DownloadJob.State.FAILED
+        )
+        urgent = DownloadJob.objects.create(url="https://a.com/5", priority=1)
+
+        result = list(DownloadJob.get_unfinished())
+
+        assert result == [urgent, first, encrypting], (
+            "Should return unfinished jobs by priority and age"
+        )
+
+    @pytest.mark.django_db
+    def test_fail_exhausted(self) -> None:
+        """Test method for fail_exhausted."""
+        exhausted = DownloadJob.objects.create(
+            url="https://a.com/1",
+            state=DownloadJob.State.RUNNING,
+            attempts=DownloadJob.MAX_ATTEMPTS,
+        )
+        retried = DownloadJob.objects.create(url="https://a.com/2", attempts=1)
+        DownloadJob.objects.create(
+            url="https://a.com/3",
+            state=DownloadJob.State.DONE,
+            attempts=DownloadJob.MAX_ATTEMPTS,
+        )
+
+        assert DownloadJob.fail_exhausted() == 1, "Only one job should fail"
+
+        exhausted.refresh_from_db()
+        retried.refresh_from_db()
+        assert exhausted.state == DownloadJob.State.FAILED, "Job should be failed"
+        assert exhausted.finished_at is not None, "Job should be finished"
+        assert retried.state == DownloadJob.State.QUEUED, "Job should be kept"
+
+    @pytest.mark.django_db
+    def test_set_state(self) -> None:
+        """Test method for set_state."""
+        job = DownloadJob.objects.create(url="https://a.com/1")
+
+        job.set_state(DownloadJob.State.POSTPROCESSING)
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.POSTPROCESSING, "State should be saved"
+
+    @pytest.mark.django_db
+    def test_set_conversion(self) -> None:
+        """Test method for set_conversion."""
+        job = DownloadJob.objects.create(url="https://a.com/1")
+
+        job.set_conversion("remux")
+
+        job.refresh_from_db()
+        assert job.conversion == "remux", "Conversion should be saved"
+
+    @pytest.mark.django_db
+    def test_mark_running(self) -> None:
+        """Test method for mark_running."""
+        job = DownloadJob.objects.create(url="https://a.com/1")
+
+        job.mark_running()
+        job.mark_running()
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.RUNNING, "Job should be running"
+        expected_attempts = 2
+        assert job.attempts == expected_attempts, "Each run should count"
+        assert job.started_at is not None, "Start time should be set"
+
+    @pytest.mark.django_db
+    def test_mark_done(self, tmp_path: Path) -> None:
+        """Test method for mark_done."""
+        test_file = tmp_path / "test_video.mp4"
+        test_file.write_bytes(b"fake video content for testing")
+        file_instance = File.create_encrypted(test_file)
+        job = DownloadJob.objects.create(url="https://a.com/1", error="old")
+
+        job.mark_done(file_instance)
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.DONE, "Job should be done"
+        assert job.file == file_instance, "File should be linked"
+        assert job.error == "", "Old errors should be cleared"
+        assert job.finished_at is not None, "Finish time should be set"
+
+    @pytest.mark.django_db
+    def test_can_retry(self) -> None:
+        """Test method for can_retry."""
+        job = DownloadJob.objects.create(url="https://a.com/1", attempts=1)
+
+        assert job.can_retry() is True, "Job should have attempts left"
+        job.attempts = DownloadJob.MAX_ATTEMPTS
+        assert job.can_retry() is False, "Job should have used up its attempts"
+
+    @pytest.mark.django_db
+    def test_mark_retrying(self) -> None:
+        """Test method for mark_retrying."""
+        job = DownloadJob.objects.create(
+            url="https://a.com/1", state=DownloadJob.State.RUNNING
+        )
+
+        job.mark_retrying("broken")
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.QUEUED, "Job should be queued"
+        assert job.error == "broken", "Error should be saved"
+
+    @pytest.mark.django_db
+    def test_mark_failed(self) -> None:
+        """Test method for mark_failed."""
+        job = DownloadJob.objects.create(url="https://a.com/1")
+
+        job.mark_failed("broken")
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.FAILED, "Job should be failed"
+        assert job.error == "broken", "Error should be saved"
+        assert job.finished_at is not None, "Finish time should be set"
+
+    @pytest.mark.django_db
+    def test_mark_cancelled(self) -> None:
+        """Test method for mark_cancelled."""
+        job = DownloadJob.objects.create(url="https://a.com/1")
+
+        job.mark_cancelled()
+
+        job.refresh_from_db()
+        assert job.state == DownloadJob.State.CANCELLED, "Job should be cancelled"
+        assert job.finished_at is not None, "Finish time should be set"
+        assert not DownloadJob.get_unfinished().exists(), (
+            "Cancelled job should not be resumed"
+        )
+
+
+class TestNetworkSettings:
+    """Test class for NetworkSettings."""
+
+    @pytest.mark.django_db
+    def test_get_for_host(self) -> None:
+        """Test method for get_for_host."""
+        default = NetworkSettings.objects.create()
+        parent = NetworkSettings.objects.create(domain="example.com")
+        child = NetworkSettings.objects.create(domain="cdn.example.com")
+        NetworkSettings.objects.create(domain="other.com")
+        NetworkSettings.objects.create(domain="ample.com")
+
+        result = list(NetworkSettings.get_for_host("video.cdn.example.com"))
+
+        assert result == [default, parent, child], (
+            "Should return the matching rows from the least to the most specific"
+        )
+        assert list(NetworkSettings.get_for_host("")) == [default], (
+            "Unknown hosts should only get the default row"
+        )
+
+    @pytest.mark.django_db
+    def test_get_ydl_opts(self) -> None:
+        """Test method for get_ydl_opts."""
+        opts = NetworkSettings.get_ydl_opts("example.com")
+        assert opts == NetworkSettings.DEFAULTS, "Should use the defaults without rows"
+
+        NetworkSettings.objects.create(retries=3, buffersize=1024)
+        NetworkSettings.objects.create(domain="example.com", retries=5)
+
+        opts = NetworkSettings.get_ydl_opts("www.example.com")
+
+        expected_retries = 5
+        assert opts["retries"] == expected_retries, "Domain row should win"
+        expected_buffersize = 1024
+        assert opts["buffersize"] == expected_buffersize, (
+            "Default row should fill unset fields"
+        )
+        assert (
+            opts["concurrent_fragment_downloads"]
+            == NetworkSettings.DEFAULTS["concurrent_fragment_downloads"]
+        ), "Built-in defaults should fill the rest"
+
+    @pytest.mark.django_db
+    def test_save_overrides(self) -> None:
+        """Test method for save_overrides."""
+        expected_retries = 3
+        NetworkSettings.save_overrides("a.com", {"retries": expected_retries})
+        settings = NetworkSettings.save_overrides(
+            "a.com", {"retries": None, "buffersize": 1024}
+        )
+
+        assert NetworkSettings.objects.count() == 1, "Should update the same row"
+        assert settings.retries is None, "None should empty the setting"
+        assert settings.get_overrides() == {"buffersize": 1024}, (
+            "Should save the given settings"
+        )
+
+    def test_get_overrides(self) -> None:
+        """Test method for get_overrides."""
+        expected_chunk_size = 1024
+        row = NetworkSettings(domain="example.com", http_chunk_size=expected_chunk_size)
+
+        assert row.get_overrides() == {"http_chunk_size": expected_chunk_size}, (
+            "Should only return the set fields"
+        )
+
+
+class TestBandwidthSchedule:
+    """Test class for BandwidthSchedule."""
+
+    @pytest.mark.django_db
+    def test_get_active(self) -> None:
+        """Test method for get_active."""
+        all_day = BandwidthSchedule.objects.create(
+            start=time(0), end=time(0), rate_limit=1000
+        )
+        night = BandwidthSchedule.objects.create(start=time(22), end=time(6))
+
+        assert BandwidthSchedule.get_active(time(12)) == all_day, (
+            "Only the all-day window should match at noon"
+        )
+        assert BandwidthSchedule.get_active(time(23)) == night, (
+            "The shorter window should win"
+        )
+        assert BandwidthSchedule.get_active() in {all_day, night}, (
+            "Should use the current time by default"
+        )
+
+    @pytest.mark.django_db
+    def test_get_rate_limit(self) -> None:
+        """Test method for get_rate_limit."""
+        assert BandwidthSchedule.get_rate_limit(time(12)) is None, (
+            "Without a window downloads should be unlimited"
+        )
+
+        rate_limit = 1000
+        BandwidthSchedule.objects.create(
+            start=time(8), end=time(20), rate_limit=rate_limit
+        )
+
+        assert BandwidthSchedule.get_rate_limit(time(12)) == rate_limit, (
+            "Should use the limit of the active window"
+        )
+        assert BandwidthSchedule.get_rate_limit(time(21)) is None, (
+            "Should be unlimited outside the window"
+        )
+
+    @pytest.mark.django_db
+    def test_add_window(self) -> None:
+        """Test method for add_window."""
+        window = BandwidthSchedule.add_window(time(8), time(20), None)
+
+        assert BandwidthSchedule.objects.get() == window, "Window should be saved"
+        assert window.rate_limit is None, "Window should be unlimited"
+
+    @pytest.mark.django_db
+    def test_remove_window(self) -> None:
+        """Test method for remove_window."""
+        window = BandwidthSchedule.objects.create(start=time(8), end=time(20))
+
+        BandwidthSchedule.remove_window(window.pk)
+
+        assert not BandwidthSchedule.objects.exists(), "Window should be removed"
+
+    def test_contains(self) -> None:
+        """Test method for contains."""
+        day = BandwidthSchedule(start=time(8), end=time(20))
+        night = BandwidthSchedule(start=time(22), end=time(6))
+        all_day = BandwidthSchedule(start=time(0), end=time(0))
+
+        assert day.contains(time(8)), "Start should be in the window"
+        assert not day.contains(time(20)), "End should not be in the window"
+        assert night.contains(time(23)), "Window should wrap around midnight"
+        assert night.contains(time(5)), "Window should wrap around midnight"
+        assert not night.contains(time(12)), "Noon should not be in the night"
+        assert all_day.contains(time(12)), "Equal start and end covers the day"
+
+    def test_get_duration(self) -> None:
+        """Test method for get_duration."""
+        assert BandwidthSchedule(start=time(8), end=time(20)).get_duration() == (
+            timedelta(hours=12)
+        ), "Should be the length of the window"
+        assert BandwidthSchedule(start=time(22), end=time(6)).get_duration() == (
+            timedelta(hours=8)
+        ), "Should wrap around midnight"
+        assert BandwidthSchedule(start=time(0), end=time(0)).get_duration() == (
+            timedelta(days=1)
+        ), "Equal start and end should be a whole day"
+
+
+class TestPendingDeletion:
+    """Test class for PendingDeletion."""
+
+    @pytest.mark.django_db
+    def test_delete_files(self, tmp_path: Path) -> None:
+        """Test method for delete_files."""
+        test_file = tmp_path / "test_video.mp4"
+        test_file.write_bytes(b"fake video content for testing")
+        stored = File.create_encrypted(test_file)
+        File.objects.create(file="")
+        kept = File.objects.create(file="kept.mp4")
+        job = DownloadJob.objects.create(url="https://a.com/1", file=stored)
+
+        count = PendingDeletion.delete_files(File.objects.exclude(pk=kept.pk))
+
+        assert count == 1, "Only stored files should be queued"
+        assert list(File.objects.all()) == [kept], "Rows should be deleted"
+        assert list(PendingDeletion.objects.values_list("name", flat=True)) == [
+            stored.file.name
+        ], "Stored file should be queued"
+        assert Path(stored.file.path).exists(), "File should be removed later"
+        job.refresh_from_db()
+        assert job.file is None, "Job should keep its history"
+
+        stored.file.delete(save=False)
+
+    @pytest.mark.django_db
+    def test_remove(self, tmp_path: Path) -> None:
+        """Test method for remove."""
+        test_file = tmp_path / "test_video.mp4"
+        test_file.write_bytes(b"fake video content for testing")
+        stored = File.create_encrypted(test_file)
+        deletion = PendingDeletion.objects.create(name=stored.file.name)
+
+        deletion.remove()
+
+        assert not Path(stored.file.path).exists(), "File should be removed"
+        assert not PendingDeletion.objects.exists(), "Row should be removed"
+
+        # a missing file is dropped from the queue as well
+        PendingDeletion.objects.create(name="downloads/missing.mp4").remove()
+        assert not PendingDeletion.objects.exists(), "Row should be removed"
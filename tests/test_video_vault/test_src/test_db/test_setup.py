@@ -3,12 +3,21 @@
 import tempfile
 from pathlib import Path
 
+import pytest
+from django.db import DatabaseError, connection
 from pyrig.src.modules.module import make_obj_importpath
 from pytest_mock import MockerFixture
 
 from video_vault.src import db
 from video_vault.src.db import setup as setup_db_module
-from video_vault.src.db.setup import setup_django
+from video_vault.src.db.setup import (
+    get_applied_migration_names,
+    get_migration_names,
+    get_sqlite_options,
+    is_schema_current,
+    migrate,
+    setup_django,
+)
 
 
 def test_setup_django(mocker: MockerFixture) -> None:
@@ -23,9 +32,7 @@ def test_setup_django(mocker: MockerFixture) -> None:
     mock_django_setup = mocker.patch(
         make_obj_importpath(setup_db_module) + ".django.setup"
     )
-    mock_call_command = mocker.patch(
-        make_obj_importpath(setup_db_module) + ".call_command"
-    )
+    mock_migrate = mocker.patch(make_obj_importpath(setup_db_module) + ".migrate")
 
     # Mock settings to avoid "already configured" error
     mock_settings = mocker.patch(make_obj_importpath(setup_db_module) + ".settings")
@@ -64,6 +71,9 @@ def test_setup_django(mocker: MockerFixture) -> None:
         assert str(temp_path / "db" / "db.sqlite3") in db_config["NAME"], (
             "Database path should be correct"
         )
+        assert db_config["OPTIONS"] == get_sqlite_options(), (
+            "Should set the sqlite options"
+        )
 
         # Check installed apps
         assert "INSTALLED_APPS" in call_args, "INSTALLED_APPS should be configured"
@@ -88,5 +98,73 @@ def test_setup_django(mocker: MockerFixture) -> None:
         # Verify Django setup was called
         mock_django_setup.assert_called_once()
 
-        # Verify migration was called (since db doesn't exist)
-        mock_call_command.assert_called_once()
+        # Verify migrations were checked
+        mock_migrate.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_get_sqlite_options() -> None:
+    """Test func for get_sqlite_options."""
+    options = get_sqlite_options()
+
+    assert "PRAGMA journal_mode=WAL" in options["init_command"], "Should use WAL"
+    assert options["transaction_mode"] == "IMMEDIATE", (
+        "Transactions should take the write lock when they begin"
+    )
+    assert options["timeout"] > 0, "Writes should wait for the lock"
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone() == (1,), "Connections should run the pragmas"
+
+
+def test_migrate(mocker: MockerFixture) -> None:
+    """Test func for migrate."""
+    mock_call_command = mocker.patch(
+        make_obj_importpath(setup_db_module) + ".call_command"
+    )
+    mock_is_schema_current = mocker.patch(
+        make_obj_importpath(setup_db_module) + ".is_schema_current",
+        return_value=True,
+    )
+
+    migrate()
+    mock_call_command.assert_not_called()
+
+    mock_is_schema_current.return_value = False
+    migrate()
+    mock_call_command.assert_called_once_with("migrate")
+
+
+@pytest.mark.django_db
+def test_is_schema_current(mocker: MockerFixture) -> None:
+    """Test func for is_schema_current."""
+    assert is_schema_current() is True, "Test database should be migrated"
+
+    mocker.patch(
+        make_obj_importpath(setup_db_module) + ".get_migration_names",
+        return_value={"0001_initial", "9999_new"},
+    )
+    assert is_schema_current() is False, "New migration should not be applied"
+
+    mocker.patch(
+        make_obj_importpath(setup_db_module) + ".get_applied_migration_names",
+        side_effect=DatabaseError("no such table: django_migrations"),
+    )
+    assert is_schema_current() is False, "New database should be migrated"
+
+
+def test_get_migration_names() -> None:
+    """Test func for get_migration_names."""
+    names = get_migration_names()
+
+    assert "0001_initial" in names, "Should find the migrations"
+    assert "__init__" not in names, "Should only return migrations"
+
+
+@pytest.mark.django_db
+def test_get_applied_migration_names() -> None:
+    """Test func for get_applied_migration_names."""
+    assert get_applied_migration_names() == get_migration_names(), (
+        "Test database should have all migrations applied"
+    )
@@ -0,0 +1,66 @@
+"""module."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import transaction
+
+from video_vault.src.db.writer import (
+    WRITER_THREAD_NAME,
+    get_writer,
+    is_writer_thread,
+    run_write,
+)
+
+
+def get_thread_name() -> str:
+    """Get the name of the current thread."""
+    return threading.current_thread().name
+
+
+def test_get_writer() -> None:
+    """Test func for get_writer."""
+    writer = get_writer()
+
+    assert writer is get_writer(), "Should always return the same writer"
+    assert writer.submit(get_thread_name).result().startswith(WRITER_THREAD_NAME), (
+        "Writes should run on the writer thread"
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_write() -> None:
+    """Test func for run_write."""
+    assert run_write(get_thread_name) == threading.main_thread().name, (
+        "Main thread should write directly"
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        name = executor.submit(run_write, get_thread_name).result()
+    assert name.startswith(WRITER_THREAD_NAME), (
+        "Worker threads should write on the writer thread"
+    )
+
+    def write_in_transaction() -> str:
+        with transaction.atomic():
+            return run_write(get_thread_name)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        name = executor.submit(write_in_transaction).result()
+    assert not name.startswith(WRITER_THREAD_NAME), (
+        "Writes in a transaction should stay on its thread"
+    )
+
+    nested = get_writer().submit(run_write, get_thread_name).result()
+    assert nested.startswith(WRITER_THREAD_NAME), (
+        "Writer thread should not queue its own writes"
+    )
+
+
+def test_is_writer_thread() -> None:
+    """Test func for is_writer_thread."""
+    assert is_writer_thread() is False, "Main thread is not the writer"
+    assert get_writer().submit(is_writer_thread).result() is True, (
+        "Should detect the writer thread"
+    )
@@ -0,0 +1,196 @@
+"""module."""
+
+import pytest
+from django.utils import timezone
+from PySide6.QtCore import QModelIndex, Qt
+from pytest_mock import MockerFixture
+
+from video_vault.src.db.models import File
+from video_vault.src.ui.models.downloads import DownloadRow, DownloadsListModel
+
+
+def create_rows(count: int) -> list[DownloadRow]:
+    """Create files and return their rows, newest first."""
+    files = [File.objects.create(file=f"video_{i}.mp4") for i in range(count)]
+    return [DownloadRow.from_file(file) for file in reversed(files)]
+
+
+def make_row(pk: int) -> DownloadRow:
+    """Make a row without a file in the database."""
+    return DownloadRow(pk, f"video_{pk}", timezone.now())
+
+
+def get_pks(rows: list[DownloadRow]) -> list[int]:
+    """Get the ids of rows to compare them."""
+    return [row.pk for row in rows]
+
+
+class TestDownloadRow:
+    """Test class for DownloadRow."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        created_at = timezone.now()
+
+        row = DownloadRow(1, "video", created_at)
+
+        assert row.pk == 1, "Id should be set"
+        assert row.display_name == "video", "Display name should be set"
+        assert row.created_at == created_at, "Creation time should be set"
+
+    @pytest.mark.django_db
+    def test_from_file(self) -> None:
+        """Test method for from_file."""
+        file = File.objects.create(file="downloads/my_video.mp4")
+
+        row = DownloadRow.from_file(file)
+
+        assert row.pk == file.pk, "Row should hold the id"
+        assert row.display_name == "my_video", "Row should hold the display name"
+        assert row.created_at == file.created_at, "Row should hold the creation time"
+
+    @pytest.mark.django_db
+    def test_get_file(self) -> None:
+        """Test method for get_file."""
+        (row,) = create_rows(1)
+
+        file = row.get_file()
+
+        assert file is not None, "Should fetch the file"
+        assert file.pk == row.pk, "Should fetch the file of the row"
+        assert make_row(file.pk + 1).get_file() is None, "Deleted file should be None"
+
+
+class TestDownloadsListModel:
+    """Test class for DownloadsListModel."""
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        model = DownloadsListModel(page_size=10)
+
+        expected_page_size = 10
+        assert model.page_size == expected_page_size, "Page size should be set"
+        assert model.rows == [], "Nothing should be loaded yet"
+        assert model.has_more is True, "Model should try to fetch rows"
+
+    @pytest.mark.django_db
+    def test_rowCount(self) -> None:  # noqa: N802
+        """Test method for rowCount."""
+        create_rows(3)
+        model = DownloadsListModel(page_size=2)
+        assert model.rowCount() == 0, "Rows should be loaded lazily"
+
+        model.fetchMore(QModelIndex())
+
+        expected_rows = 2
+        assert model.rowCount() == expected_rows, "Should count the loaded rows"
+        assert model.rowCount(model.index(0)) == 0, "Rows should have no children"
+
+    def test_data(self) -> None:
+        """Test method for data."""
+        row = make_row(1)
+        model = DownloadsListModel()
+        model.rows = [row]
+        index = model.index(0)
+
+        assert model.data(index) == "video_1", "Should display the name"
+        assert model.data(index, DownloadsListModel.ROW_ROLE) == row, (
+            "Should return the row"
+        )
+        assert model.data(index, Qt.ItemDataRole.ToolTipRole) is None, (
+            "Other roles should be empty"
+        )
+        assert model.data(QModelIndex()) is None, "Invalid index should be empty"
+
+    @pytest.mark.django_db
+    def test_canFetchMore(self) -> None:  # noqa: N802
+        """Test method for canFetchMore."""
+        create_rows(2)
+        model = DownloadsListModel(page_size=2)
+        assert model.canFetchMore(QModelIndex()) is True, "Should fetch first page"
+
+        model.fetchMore(QModelIndex())
+        assert model.canFetchMore(QModelIndex()) is True, "Page was full"
+
+        model.fetchMore(QModelIndex())
+        assert model.canFetchMore(QModelIndex()) is False, "All rows were loaded"
+
+    @pytest.mark.django_db
+    def test_fetchMore(self) -> None:  # noqa: N802
+        """Test method for fetchMore."""
+        rows = create_rows(5)
+        model = DownloadsListModel(page_size=2)
+
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+
+        assert get_pks(model.rows) == get_pks(rows), "Should load all rows newest first"
+
+    @pytest.mark.django_db
+    def test_get_next_page(self) -> None:
+        """Test method for get_next_page."""
+        rows = create_rows(3)
+        model = DownloadsListModel(page_size=2)
+
+        assert get_pks(model.get_next_page()) == get_pks(rows[:2]), (
+            "Should get the newest rows"
+        )
+        model.rows = rows[:2]
+        assert get_pks(model.get_next_page()) == get_pks(rows[2:]), (
+            "Should get the rows after the last loaded one"
+        )
+
+    def test_get_download_row(self) -> None:
+        """Test method for get_download_row."""
+        row = make_row(1)
+        model = DownloadsListModel()
+        model.rows = [row]
+
+        assert model.get_download_row(model.index(0)) == row, "Should get the row"
+        assert model.get_download_row(QModelIndex()) is None, "Invalid index has no row"
+
+    def test_get_row_number(self) -> None:
+        """Test method for get_row_number."""
+        model = DownloadsListModel()
+        model.rows = [make_row(2), make_row(1)]
+
+        assert model.get_row_number(1) == 1, "Should find the row by pk"
+        assert model.get_row_number(3) is None, "Unknown file has no row"
+
+    def test_add_file(self, mocker: MockerFixture) -> None:
+        """Test method for add_file."""
+        old = make_row(1)
+        new_file = mocker.Mock(pk=2, display_name="new", created_at=timezone.now())
+        model = DownloadsListModel()
+        model.rows = [old]
+
+        model.add_file(new_file)
+        model.add_file(new_file)
+
+        assert get_pks(model.rows) == [new_file.pk, old.pk], (
+            "New file should be added once at the top"
+        )
+        assert model.rows[0].display_name == "new", "Row should show the new file"
+
+    def test_remove_row(self) -> None:
+        """Test method for remove_row."""
+        first = make_row(2)
+        second = make_row(1)
+        model = DownloadsListModel()
+        model.rows = [first, second]
+
+        model.remove_row(first.pk)
+        model.remove_row(first.pk)
+
+        assert model.rows == [second], "Row should be removed"
+
+    def test_reload(self) -> None:
+        """Test method for reload."""
+        model = DownloadsListModel()
+        model.rows = [make_row(1)]
+        model.has_more = False
+
+        model.reload()
+
+        assert model.rows == [], "Loaded rows should be dropped"
+        assert model.has_more is True, "Rows should be fetched again"
@@ -1,10 +1,14 @@
 """module."""
 
+import sys
+from pathlib import Path
+
 from pyrig.src.modules.module import make_obj_importpath
 from pytest_mock import MockerFixture
 
 from video_vault.src.ui.pages import add_downloads as add_downloads_module
 from video_vault.src.ui.pages.add_downloads import AddDownloads
+from video_vault.src.ui.pages.base import Base as BasePage
 
 
 class TestAddDownloads:
@@ -16,6 +20,13 @@ class TestAddDownloads:
         mock_add_download_button = mocker.patch.object(
             AddDownloads, "add_download_button"
         )
+        mock_add_batch_button = mocker.patch.object(AddDownloads, "add_batch_button")
+        mock_add_rate_limit_box = mocker.patch.object(
+            AddDownloads, "add_rate_limit_box"
+        )
+        mock_add_batch_progress_bar = mocker.patch.object(
+            AddDownloads, "add_batch_progress_bar"
+        )
 
         # Create a mock instance and call pre_setup
         page = AddDownloads.__new__(AddDownloads)  # Create without calling __init__
@@ -23,6 +34,23 @@ class TestAddDownloads:
 
         # Verify add_download_button was called
         mock_add_download_button.assert_called_once()
+        mock_add_batch_button.assert_called_once()
+        mock_add_rate_limit_box.assert_called_once()
+        mock_add_batch_progress_bar.assert_called_once()
+        assert page.batch_import_workers == [], "No batch should be importing"
+        assert page.batch is None, "No batch should be running"
+
+    def test_setup(self, mocker: MockerFixture) -> None:
+        """Test method for setup."""
+        mock_add_browser = mocker.patch.object(AddDownloads, "add_browser")
+        mock_add_idle_timer = mocker.patch.object(AddDownloads, "add_idle_timer")
+
+        # Create a mock instance and call setup
+        page = AddDownloads.__new__(AddDownloads)
+        page.setup()
+
+        mock_add_browser.assert_called_once()
+        mock_add_idle_timer.assert_called_once()
 
     def test_post_setup(self) -> None:
         """Test method for post_setup."""
@@ -32,6 +60,123 @@ class TestAddDownloads:
 
         # Since post_setup is empty, just verify it completed without error
 
+    def test_add_browser(self, mocker: MockerFixture) -> None:
+        """Test method for add_browser."""
+        # Mock the browser widget module to avoid loading QtWebEngine
+        mock_browser_module = mocker.Mock()
+        mocker.patch.dict(
+            sys.modules, {"winipyside.src.ui.widgets.browser": mock_browser_module}
+        )
+        mock_browser_cls = mock_browser_module.Browser
+        mock_v_layout = mocker.Mock()
+
+        # Create a mock instance
+        page = AddDownloads.__new__(AddDownloads)
+        page.v_layout = mock_v_layout
+
+        # Call add_browser
+        page.add_browser()
+
+        # Verify the browser was added to the layout
+        mock_browser_cls.assert_called_once_with(mock_v_layout)
+        assert page.browser == mock_browser_cls.return_value, "Should be stored"
+
+    def test_add_idle_timer(self, mocker: MockerFixture) -> None:
+        """Test method for add_idle_timer."""
+        mock_timer = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QTimer",
+            return_value=mock_timer,
+        )
+
+        # Create a mock instance
+        page = AddDownloads.__new__(AddDownloads)
+
+        # Call add_idle_timer
+        page.add_idle_timer()
+
+        # Verify the timer fires once after the idle timeout
+        assert page.idle_timer == mock_timer, "Timer should be stored"
+        mock_timer.setSingleShot.assert_called_once_with(True)  # noqa: FBT003
+        mock_timer.setInterval.assert_called_once_with(AddDownloads.IDLE_TIMEOUT_MS)
+        mock_timer.timeout.connect.assert_called_once_with(page.on_idle)
+
+    def test_showEvent(self, mocker: MockerFixture) -> None:  # noqa: N802
+        """Test method for showEvent."""
+        mock_timer = mocker.Mock()
+        mock_show_event = mocker.patch.object(BasePage, "showEvent")
+        mock_event = mocker.Mock()
+
+        # Create a mock instance
+        page = AddDownloads.__new__(AddDownloads)
+        page.idle_timer = mock_timer
+
+        # Call showEvent
+        page.showEvent(mock_event)
+
+        mock_timer.stop.assert_called_once()
+        mock_show_event.assert_called_once_with(mock_event)
+
+    def test_hideEvent(self, mocker: MockerFixture) -> None:  # noqa: N802
+        """Test method for hideEvent."""
+        mock_timer = mocker.Mock()
+        mock_hide_event = mocker.patch.object(BasePage, "hideEvent")
+        mock_event = mocker.Mock()
+
+        # Create a mock instance
+        page = AddDownloads.__new__(AddDownloads)
+        page.idle_timer = mock_timer
+
+        # Call hideEvent
+        page.hideEvent(mock_event)
+
+        mock_timer.start.assert_called_once()
+        mock_hide_event.assert_called_once_with(mock_event)
+
+    def test_on_idle(self, mocker: MockerFixture) -> None:
+        """Test method for on_idle."""
+        mock_is_visible = mocker.patch.object(
+            AddDownloads, "isVisible", return_value=True
+        )
+        mock_is_batch_running = mocker.patch.object(
+            AddDownloads, "is_batch_running", return_value=False
+        )
+        mock_remove_from_window = mocker.patch.object(
+            AddDownloads, "remove_from_window"
+        )
+
+        # Create a mock instance
+        page = AddDownloads.__new__(AddDownloads)
+
+        # Verify a shown page is kept
+        page.on_idle()
+        mock_remove_from_window.assert_not_called()
+
+        # Verify a page with a running batch is kept
+        mock_is_visible.return_value = False
+        mock_is_batch_running.return_value = True
+        page.on_idle()
+        mock_remove_from_window.assert_not_called()
+
+        # Verify an idle page is removed
+        mock_is_batch_running.return_value = False
+        page.on_idle()
+        mock_remove_from_window.assert_called_once()
+
+    def test_is_batch_running(self, mocker: MockerFixture) -> None:
+        """Test method for is_batch_running."""
+        page = AddDownloads.__new__(AddDownloads)
+        page.batch_import_workers = []
+        page.batch = None
+        assert page.is_batch_running() is False, "Nothing should be running"
+
+        page.batch = mocker.Mock(is_done=False)
+        assert page.is_batch_running() is True, "Batch should be downloading"
+
+        page.batch = mocker.Mock(is_done=True)
+        page.batch_import_workers = [mocker.Mock()]
+        assert page.is_batch_running() is True, "Batch should be importing"
+
     def test_add_download_button(self, mocker: MockerFixture) -> None:
         """Test method for add_download_button."""
         # Mock the UI methods to avoid Qt widget creation
@@ -63,12 +208,11 @@ class TestAddDownloads:
 
     def test_on_add_download(self, mocker: MockerFixture) -> None:
         """Test method for on_add_download."""
-        # Mock the DownloadWorker to avoid actual downloads
-        mock_download_worker = mocker.patch(
-            make_obj_importpath(add_downloads_module) + ".DownloadWorker"
+        # Mock the DownloadScheduler to avoid actual downloads
+        mock_scheduler_cls = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".DownloadScheduler"
         )
-        mock_worker_instance = mocker.Mock()
-        mock_download_worker.return_value = mock_worker_instance
+        mock_scheduler = mock_scheduler_cls.get_instance.return_value
 
         # Create a mock instance
         page = AddDownloads.__new__(AddDownloads)
@@ -83,14 +227,224 @@ class TestAddDownloads:
         mock_url.toString.return_value = "https://www.youtube.com/watch?v=805SIqgDZIE"
         mock_browser.url.return_value = mock_url
         mock_browser.get_domain_http_cookies.return_value = []
+        expected_rate_limit = 500_000
+        mocker.patch.object(page, "get_rate_limit", return_value=expected_rate_limit)
 
         # Call on_add_download
         page.on_add_download()
 
-        # Verify DownloadWorker was created with correct parameters
-        mock_download_worker.assert_called_once_with(
-            url="https://www.youtube.com/watch?v=805SIqgDZIE", cookies=[]
+        # Verify the download was scheduled with correct parameters
+        mock_scheduler.schedule.assert_called_once_with(
+            url="https://www.youtube.com/watch?v=805SIqgDZIE",
+            cookies=[],
+            rate_limit=expected_rate_limit,
         )
 
-        # Verify worker was started
-        mock_worker_instance.start.assert_called_once()
+    def test_add_batch_button(self, mocker: MockerFixture) -> None:
+        """Test method for add_batch_button."""
+        mocker.patch.object(AddDownloads, "get_svg_icon")
+        mock_button = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QPushButton",
+            return_value=mock_button,
+        )
+        mock_menu = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QMenu",
+            return_value=mock_menu,
+        )
+        mock_h_layout = mocker.Mock()
+        page = AddDownloads.__new__(AddDownloads)
+        page.h_layout = mock_h_layout
+
+        page.add_batch_button()
+
+        expected_actions = 3
+        assert mock_menu.addAction.call_count == expected_actions, (
+            "Should add an action per import source"
+        )
+        mock_button.setMenu.assert_called_once_with(mock_menu)
+        mock_h_layout.addWidget.assert_called_once_with(mock_button)
+
+    def test_add_rate_limit_box(self, mocker: MockerFixture) -> None:
+        """Test method for add_rate_limit_box."""
+        mock_spin_box = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QSpinBox"
+        ).return_value
+        mock_h_layout = mocker.Mock()
+        page = AddDownloads.__new__(AddDownloads)
+        page.h_layout = mock_h_layout
+
+        page.add_rate_limit_box()
+
+        assert page.rate_limit_box == mock_spin_box, "Should be stored"
+        mock_spin_box.setRange.assert_called_once_with(0, AddDownloads.MAX_RATE_KBPS)
+        mock_spin_box.setSpecialValueText.assert_called_once_with("No limit")
+        mock_h_layout.addWidget.assert_called_once_with(mock_spin_box)
+
+    def test_get_rate_limit(self, mocker: MockerFixture) -> None:
+        """Test method for get_rate_limit."""
+        page = AddDownloads.__new__(AddDownloads)
+        mock_rate_limit_box = mocker.Mock(**{"value.return_value": 500})
+        page.rate_limit_box = mock_rate_limit_box
+
+        expected_rate_limit = 500_000
+        assert page.get_rate_limit() == expected_rate_limit, (
+            "Should convert KB/s to bytes per second"
+        )
+
+        mock_rate_limit_box.value.return_value = 0
+        assert page.get_rate_limit() is None, "0 should be no limit"
+
+    def test_add_batch_progress_bar(self, mocker: MockerFixture) -> None:
+        """Test method for add_batch_progress_bar."""
+        mock_progress_bar = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QProgressBar",
+            return_value=mock_progress_bar,
+        )
+        mock_h_layout = mocker.Mock()
+        page = AddDownloads.__new__(AddDownloads)
+        page.h_layout = mock_h_layout
+
+        page.add_batch_progress_bar()
+
+        assert page.batch_progress_bar == mock_progress_bar, "Should be stored"
+        mock_progress_bar.hide.assert_called_once()
+        mock_h_layout.addWidget.assert_called_once_with(mock_progress_bar)
+
+    def test_on_batch_import_page(self, mocker: MockerFixture) -> None:
+        """Test method for on_batch_import_page."""
+        mock_start_batch_import = mocker.patch.object(
+            AddDownloads, "start_batch_import"
+        )
+        mock_browser = mocker.Mock()
+        mock_browser.url.return_value.toString.return_value = "https://a.com/list"
+        page = AddDownloads.__new__(AddDownloads)
+        page.browser = mock_browser
+
+        page.on_batch_import_page()
+
+        mock_start_batch_import.assert_called_once_with(["https://a.com/list"])
+
+    def test_on_batch_import_paste(self, mocker: MockerFixture) -> None:
+        """Test method for on_batch_import_paste."""
+        mock_start_batch_import = mocker.patch.object(
+            AddDownloads, "start_batch_import"
+        )
+        mock_dialog = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QInputDialog"
+        )
+        mock_dialog.getMultiLineText.return_value = ("https://a.com/1\nfoo", True)
+        page = AddDownloads.__new__(AddDownloads)
+
+        page.on_batch_import_paste()
+        mock_start_batch_import.assert_called_once_with(["https://a.com/1"])
+
+        # cancelling the dialog imports nothing
+        mock_dialog.getMultiLineText.return_value = ("https://a.com/1", False)
+        page.on_batch_import_paste()
+        mock_start_batch_import.assert_called_once()
+
+    def test_on_batch_import_file(self, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Test method for on_batch_import_file."""
+        mock_start_batch_import = mocker.patch.object(
+            AddDownloads, "start_batch_import"
+        )
+        urls_file = tmp_path / "urls.txt"
+        urls_file.write_text("https://a.com/1\nhttps://b.com/2\n")
+        mock_dialog = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".QFileDialog"
+        )
+        mock_dialog.getOpenFileName.return_value = (str(urls_file), "")
+        page = AddDownloads.__new__(AddDownloads)
+
+        page.on_batch_import_file()
+        mock_start_batch_import.assert_called_once_with(
+            ["https://a.com/1", "https://b.com/2"]
+        )
+
+        # cancelling the dialog imports nothing
+        mock_dialog.getOpenFileName.return_value = ("", "")
+        page.on_batch_import_file()
+        mock_start_batch_import.assert_called_once()
+
+    def test_get_url_cookies(self, mocker: MockerFixture) -> None:
+        """Test method for get_url_cookies."""
+        mock_browser = mocker.Mock()
+        mock_browser.get_domain_http_cookies.return_value = []
+        page = AddDownloads.__new__(AddDownloads)
+        page.browser = mock_browser
+
+        result = page.get_url_cookies("https://www.a.com/watch?v=1")
+
+        assert result == [], "Should return the browser cookies"
+        mock_browser.get_domain_http_cookies.assert_called_once_with("www.a.com")
+
+    def test_start_batch_import(self, mocker: MockerFixture) -> None:
+        """Test method for start_batch_import."""
+        mock_worker_cls = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".BatchImportWorker"
+        )
+        mocker.patch.object(AddDownloads, "get_url_cookies", return_value=[])
+        page = AddDownloads.__new__(AddDownloads)
+        page.batch_import_workers = []
+
+        page.start_batch_import([])
+        mock_worker_cls.assert_not_called()
+
+        page.start_batch_import(["https://a.com/list"])
+
+        mock_worker_cls.assert_called_once_with(["https://a.com/list"], [])
+        worker = mock_worker_cls.return_value
+        assert page.batch_import_workers == [worker], "Worker should be kept alive"
+        worker.finished.connect.assert_called_once()
+        worker.start.assert_called_once()
+
+    def test_on_batch_expanded(self, mocker: MockerFixture) -> None:
+        """Test method for on_batch_expanded."""
+        mock_scheduler_cls = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".DownloadScheduler"
+        )
+        mock_scheduler = mock_scheduler_cls.get_instance.return_value
+        mock_batch_cls = mocker.patch(
+            make_obj_importpath(add_downloads_module) + ".DownloadBatch"
+        )
+        mocker.patch.object(AddDownloads, "get_url_cookies", return_value=[])
+        mocker.patch.object(AddDownloads, "get_rate_limit", return_value=None)
+        page = AddDownloads.__new__(AddDownloads)
+        page.batch = None
+        worker = mocker.Mock(entry_urls=["https://a.com/1", "https://a.com/2"])
+        page.batch_import_workers = [worker]
+
+        page.on_batch_expanded(worker)
+
+        worker.wait.assert_called_once()
+        assert page.batch_import_workers == [], "Worker should be released"
+        batch = mock_batch_cls.return_value
+        assert page.batch == batch, "A new batch should be started"
+        batch.add_downloads.assert_called_once_with(len(worker.entry_urls))
+        mock_scheduler.schedule_many.assert_called_once_with(
+            [("https://a.com/1", []), ("https://a.com/2", [])],
+            notify=False,
+            rate_limit=None,
+            on_started=batch.add_worker,
+        )
+
+        # a running batch is extended instead of starting a new one
+        batch.is_done = False
+        page.batch_import_workers = [worker]
+        page.on_batch_expanded(worker)
+        mock_batch_cls.assert_called_once()
+
+    def test_on_batch_progress(self, mocker: MockerFixture) -> None:
+        """Test method for on_batch_progress."""
+        mock_progress_bar = mocker.Mock()
+        page = AddDownloads.__new__(AddDownloads)
+        page.batch_progress_bar = mock_progress_bar
+
+        page.on_batch_progress(2, 1, 5)
+
+        mock_progress_bar.setMaximum.assert_called_once_with(5)
+        mock_progress_bar.setValue.assert_called_once_with(3)
+        mock_progress_bar.show.assert_called_once()
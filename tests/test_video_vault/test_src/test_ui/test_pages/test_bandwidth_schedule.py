@@ -0,0 +1,183 @@
+"""module."""
+
+from datetime import time
+
+import pytest
+from pyrig.src.modules.module import make_obj_importpath
+from PySide6.QtCore import QTime
+from pytest_mock import MockerFixture
+
+from video_vault.src.db.models import BandwidthSchedule as BandwidthScheduleModel
+from video_vault.src.ui.pages import bandwidth_schedule as bandwidth_schedule_module
+from video_vault.src.ui.pages.bandwidth_schedule import BandwidthSchedule
+
+
+class TestBandwidthSchedule:
+    """Test class for BandwidthSchedule."""
+
+    def test_pre_setup(self) -> None:
+        """Test method for pre_setup."""
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        page.pre_setup()
+
+    def test_setup(self, mocker: MockerFixture) -> None:
+        """Test method for setup."""
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_add_windows_list = mocker.patch.object(page, "add_windows_list")
+        mock_add_window_form = mocker.patch.object(page, "add_window_form")
+
+        page.setup()
+
+        mock_add_windows_list.assert_called_once()
+        mock_add_window_form.assert_called_once()
+
+    def test_post_setup(self, mocker: MockerFixture) -> None:
+        """Test method for post_setup."""
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_load_windows = mocker.patch.object(page, "load_windows")
+
+        page.post_setup()
+
+        mock_load_windows.assert_called_once()
+
+    def test_add_windows_list(self, mocker: MockerFixture) -> None:
+        """Test method for add_windows_list."""
+        mock_list = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QListWidget"
+        ).return_value
+        mock_button = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QPushButton"
+        ).return_value
+        mock_v_layout = mocker.Mock()
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        page.v_layout = mock_v_layout
+
+        page.add_windows_list()
+
+        assert page.windows_list == mock_list, "List should be stored"
+        mock_button.clicked.connect.assert_called_once_with(page.on_remove)
+        assert mock_v_layout.addWidget.call_args_list == [
+            mocker.call(mock_list),
+            mocker.call(mock_button),
+        ], "Should add the list and the remove button"
+
+    def test_add_window_form(self, mocker: MockerFixture) -> None:
+        """Test method for add_window_form."""
+        mock_form_layout = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QFormLayout"
+        ).return_value
+        mocker.patch(make_obj_importpath(bandwidth_schedule_module) + ".QTimeEdit")
+        mock_spin_box = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QSpinBox"
+        ).return_value
+        mock_button = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QPushButton"
+        ).return_value
+        mock_v_layout = mocker.Mock()
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        page.v_layout = mock_v_layout
+
+        page.add_window_form()
+
+        expected_rows = 3
+        assert mock_form_layout.addRow.call_count == expected_rows, (
+            "Should add the start, end and rate limit"
+        )
+        mock_spin_box.setSpecialValueText.assert_called_once_with("Unlimited")
+        mock_button.clicked.connect.assert_called_once_with(page.on_add)
+        mock_v_layout.addLayout.assert_called_once_with(mock_form_layout)
+
+    @pytest.mark.django_db
+    def test_load_windows(self, mocker: MockerFixture) -> None:
+        """Test method for load_windows."""
+        mock_runner = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QueryRunner.get_instance"
+        ).return_value
+        late = BandwidthScheduleModel.objects.create(start=time(20), end=time(8))
+        early = BandwidthScheduleModel.objects.create(start=time(8), end=time(20))
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+
+        page.load_windows()
+
+        query, on_result = mock_runner.run.call_args[0]
+        assert query() == [early, late], "Should load the windows by start"
+        assert on_result == page.on_windows_loaded, "Should show the windows"
+
+    def test_on_windows_loaded(self, mocker: MockerFixture) -> None:
+        """Test method for on_windows_loaded."""
+        mock_item_cls = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".QListWidgetItem"
+        )
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_windows_list = mocker.Mock()
+        page.windows_list = mock_windows_list
+        window = BandwidthScheduleModel(pk=1, start=time(8), end=time(20))
+
+        page.on_windows_loaded([window])
+
+        mock_windows_list.clear.assert_called_once()
+        mock_item_cls.assert_called_once_with("08:00 - 20:00: Unlimited")
+        mock_item_cls.return_value.setData.assert_called_once()
+        mock_windows_list.addItem.assert_called_once_with(mock_item_cls.return_value)
+
+    def test_format_window(self) -> None:
+        """Test method for format_window."""
+        window = BandwidthScheduleModel(
+            start=time(22, 30), end=time(6), rate_limit=2_000_000
+        )
+
+        assert BandwidthSchedule.format_window(window) == "22:30 - 06:00: 2.0 MB/s", (
+            "Should show the times and the rate"
+        )
+
+    def test_on_add(self, mocker: MockerFixture) -> None:
+        """Test method for on_add."""
+        mock_model = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".BandwidthScheduleModel"
+        )
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_on_windows_changed = mocker.patch.object(page, "on_windows_changed")
+        page.start_edit = mocker.Mock(**{"time.return_value": QTime(8, 0)})
+        page.end_edit = mocker.Mock(**{"time.return_value": QTime(20, 30)})
+        page.rate_limit_box = mocker.Mock(**{"value.return_value": 2000})
+
+        page.on_add()
+
+        mock_model.add_window.assert_called_once_with(time(8), time(20, 30), 2_000_000)
+        mock_on_windows_changed.assert_called_once()
+
+    def test_on_remove(self, mocker: MockerFixture) -> None:
+        """Test method for on_remove."""
+        mock_model = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module) + ".BandwidthScheduleModel"
+        )
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_on_windows_changed = mocker.patch.object(page, "on_windows_changed")
+        mock_windows_list = mocker.Mock(**{"selectedItems.return_value": []})
+        page.windows_list = mock_windows_list
+
+        page.on_remove()
+
+        mock_model.remove_window.assert_not_called()
+
+        mock_windows_list.selectedItems.return_value = [
+            mocker.Mock(**{"data.return_value": 1})
+        ]
+        page.on_remove()
+
+        mock_model.remove_window.assert_called_once_with(1)
+        mock_on_windows_changed.assert_called_once()
+
+    def test_on_windows_changed(self, mocker: MockerFixture) -> None:
+        """Test method for on_windows_changed."""
+        mock_governor = mocker.patch(
+            make_obj_importpath(bandwidth_schedule_module)
+            + ".BandwidthGovernor.get_instance"
+        ).return_value
+        page = BandwidthSchedule.__new__(BandwidthSchedule)
+        mock_load_windows = mocker.patch.object(page, "load_windows")
+
+        page.on_windows_changed()
+
+        mock_governor.refresh_schedule.assert_called_once_with(force=True)
+        mock_load_windows.assert_called_once()
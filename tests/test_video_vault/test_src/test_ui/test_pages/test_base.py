@@ -0,0 +1,44 @@
+"""module."""
+
+from pytest_mock import MockerFixture
+
+from video_vault.src.ui.pages.downloads import Downloads
+from video_vault.src.ui.pages.player import Player
+
+
+class TestBase:
+    """Test class for Base."""
+
+    def test_get_page(self, mocker: MockerFixture) -> None:
+        """Test method for get_page."""
+        mock_window = mocker.Mock()
+        page = Downloads.__new__(Downloads)
+        page.base_window = mock_window
+
+        result = page.get_page(Player)
+
+        # Verify the page is got through the window
+        mock_window.get_page.assert_called_once_with(Player)
+        assert result == mock_window.get_page.return_value, "Should return the page"
+
+    def test_find_page(self, mocker: MockerFixture) -> None:
+        """Test method for find_page."""
+        mock_window = mocker.Mock()
+        mock_window.find_page.return_value = None
+        page = Downloads.__new__(Downloads)
+        page.base_window = mock_window
+
+        assert page.find_page(Player) is None, "Page should not be made"
+        mock_window.find_page.assert_called_once_with(Player)
+
+    def test_remove_from_window(self, mocker: MockerFixture) -> None:
+        """Test method for remove_from_window."""
+        mock_stack = mocker.Mock()
+        page = Downloads.__new__(Downloads)
+        mocker.patch.object(page, "get_stack", return_value=mock_stack)
+        mock_delete_later = mocker.patch.object(page, "deleteLater")
+
+        page.remove_from_window()
+
+        mock_stack.removeWidget.assert_called_once_with(page)
+        mock_delete_later.assert_called_once()
@@ -1,12 +1,11 @@
 """module."""
 
-from pathlib import Path
-
 from pyrig.src.modules.module import make_obj_importpath
 from pytest_mock import MockerFixture
 
 from video_vault.src.ui.pages import downloads as downloads_module
 from video_vault.src.ui.pages.downloads import Downloads
+from video_vault.src.ui.pages.player import Player as PlayerPage
 
 
 class TestDownloads:
@@ -26,12 +25,21 @@ class TestDownloads:
         mock_add_add_downloads_button = mocker.patch.object(
             Downloads, "add_add_downloads_button"
         )
-        mock_add_download_buttons_scroll_area = mocker.patch.object(
-            Downloads, "add_download_buttons_scroll_area"
+        mock_add_downloads_list_view = mocker.patch.object(
+            Downloads, "add_downloads_list_view"
         )
         mock_add_delete_all_downloads_button = mocker.patch.object(
             Downloads, "add_delete_all_downloads_button"
         )
+        mock_add_deletion_progress_bar = mocker.patch.object(
+            Downloads, "add_deletion_progress_bar"
+        )
+        mock_add_download_progress_label = mocker.patch.object(
+            Downloads, "add_download_progress_label"
+        )
+        mock_add_cancel_downloads_button = mocker.patch.object(
+            Downloads, "add_cancel_downloads_button"
+        )
 
         # Create a mock instance and call setup
         page = Downloads.__new__(Downloads)
@@ -39,8 +47,11 @@ class TestDownloads:
 
         # Verify both methods were called
         mock_add_add_downloads_button.assert_called_once()
-        mock_add_download_buttons_scroll_area.assert_called_once()
+        mock_add_downloads_list_view.assert_called_once()
         mock_add_delete_all_downloads_button.assert_called_once()
+        mock_add_deletion_progress_bar.assert_called_once()
+        mock_add_download_progress_label.assert_called_once()
+        mock_add_cancel_downloads_button.assert_called_once()
 
     def test_post_setup(self) -> None:
         """Test method for post_setup."""
@@ -78,35 +89,149 @@ class TestDownloads:
 
     def test_on_delete_all_downloads(self, mocker: MockerFixture) -> None:
         """Test method for on_delete_all_downloads."""
-        # Mock File.objects to get all downloads
-        mock_file1 = mocker.Mock()
-        mock_file2 = mocker.Mock()
-        mock_files = [mock_file1, mock_file2]
-
+        # Mock File.objects and the deletion queue
         mock_file_objects = mocker.patch(
             make_obj_importpath(downloads_module) + ".File.objects"
         )
-        mock_file_objects.all.return_value = mock_files
-
-        # Mock remove_download_and_button method
-        mock_remove = mocker.patch.object(Downloads, "remove_download_and_button")
+        mock_deletion_queue_cls = mocker.patch(
+            make_obj_importpath(downloads_module) + ".DeletionQueue"
+        )
+        mock_deletion_queue = mock_deletion_queue_cls.get_instance.return_value
+        mock_stop_playback = mocker.patch.object(Downloads, "stop_playback")
+        mock_model = mocker.Mock()
 
-        # Create a mock instance with button_to_download mapping
+        # Create a mock instance
         page = Downloads.__new__(Downloads)
-        mock_button1 = mocker.Mock()
-        mock_button2 = mocker.Mock()
-        page.button_to_download = {mock_button1: mock_file1, mock_button2: mock_file2}
+        page.downloads_model = mock_model
 
         # Call on_delete_all_downloads
         page.on_delete_all_downloads()
 
-        # Verify remove_download_and_button was called for each download
-        expected_call_count = 2
-        assert mock_remove.call_count == expected_call_count, (
-            "Should call remove_download_and_button for each download"
+        # Verify playback was stopped and all files were deleted at once
+        mock_stop_playback.assert_called_once_with()
+        mock_deletion_queue.delete.assert_called_once_with(
+            mock_file_objects.all.return_value
+        )
+        mock_model.reload.assert_called_once()
+
+    def test_add_deletion_progress_bar(self, mocker: MockerFixture) -> None:
+        """Test method for add_deletion_progress_bar."""
+        mock_progress_bar = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(downloads_module) + ".QProgressBar",
+            return_value=mock_progress_bar,
+        )
+        mock_deletion_queue_cls = mocker.patch(
+            make_obj_importpath(downloads_module) + ".DeletionQueue"
+        )
+        mock_deletion_queue = mock_deletion_queue_cls.get_instance.return_value
+        mock_h_layout = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.h_layout = mock_h_layout
+
+        # Call add_deletion_progress_bar
+        page.add_deletion_progress_bar()
+
+        # Verify the hidden bar was added and follows the queue
+        assert page.deletion_progress_bar == mock_progress_bar, "Should be stored"
+        mock_progress_bar.hide.assert_called_once()
+        mock_h_layout.addWidget.assert_called_once_with(mock_progress_bar)
+        mock_deletion_queue.progress.connect.assert_called_once_with(
+            page.on_deletion_progress
+        )
+
+    def test_on_deletion_progress(self, mocker: MockerFixture) -> None:
+        """Test method for on_deletion_progress."""
+        mock_progress_bar = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.deletion_progress_bar = mock_progress_bar
+
+        # Call on_deletion_progress while files are removed
+        page.on_deletion_progress(2, 5)
+
+        expected_total = 5
+        mock_progress_bar.setMaximum.assert_called_once_with(expected_total)
+        mock_progress_bar.setValue.assert_called_once_with(2)
+        mock_progress_bar.show.assert_called_once()
+
+        # Verify the bar is hidden when done
+        page.on_deletion_progress(5, 5)
+        mock_progress_bar.hide.assert_called_once()
+
+    def test_add_download_progress_label(self, mocker: MockerFixture) -> None:
+        """Test method for add_download_progress_label."""
+        mock_label = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(downloads_module) + ".QLabel", return_value=mock_label
+        )
+        mock_tracker = mocker.patch(
+            make_obj_importpath(downloads_module) + ".ProgressTracker.get_instance"
+        ).return_value
+        mock_h_layout = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.h_layout = mock_h_layout
+
+        page.add_download_progress_label()
+
+        mock_label.hide.assert_called_once()
+        mock_h_layout.addWidget.assert_called_once_with(mock_label)
+        mock_tracker.changed.connect.assert_called_once_with(page.on_download_progress)
+
+    def test_on_download_progress(self, mocker: MockerFixture) -> None:
+        """Test method for on_download_progress."""
+        mock_label = mocker.Mock()
+        mock_button = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.download_progress_label = mock_label
+        page.cancel_downloads_button = mock_button
+
+        page.on_download_progress(2, 1_500_000)
+        mock_label.setText.assert_called_once_with("Downloading 2: 1.5 MB/s")
+        mock_label.show.assert_called_once()
+        mock_button.show.assert_called_once()
+
+        page.on_download_progress(0, 0)
+        mock_label.hide.assert_called_once()
+        mock_button.hide.assert_called_once()
+
+    def test_add_cancel_downloads_button(self, mocker: MockerFixture) -> None:
+        """Test method for add_cancel_downloads_button."""
+        mock_button = mocker.Mock()
+        mocker.patch(
+            make_obj_importpath(downloads_module) + ".QPushButton",
+            return_value=mock_button,
         )
-        mock_remove.assert_any_call(mock_button1)
-        mock_remove.assert_any_call(mock_button2)
+        mock_h_layout = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.h_layout = mock_h_layout
+
+        page.add_cancel_downloads_button()
+
+        mock_button.clicked.connect.assert_called_once_with(page.on_cancel_downloads)
+        mock_button.hide.assert_called_once()
+        mock_h_layout.addWidget.assert_called_once_with(mock_button)
+
+    def test_on_cancel_downloads(self, mocker: MockerFixture) -> None:
+        """Test method for on_cancel_downloads."""
+        mock_scheduler = mocker.patch(
+            make_obj_importpath(downloads_module) + ".DownloadScheduler.get_instance"
+        ).return_value
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.on_cancel_downloads()
+
+        mock_scheduler.cancel_all.assert_called_once()
 
     def test_add_add_downloads_button(self, mocker: MockerFixture) -> None:
         """Test method for add_add_downloads_button."""
@@ -130,65 +255,202 @@ class TestDownloads:
         mock_button.setSizePolicy.assert_called_once()
         mock_h_layout.setAlignment.assert_called_once()
 
-    def test_add_download_buttons_scroll_area(self, mocker: MockerFixture) -> None:
-        """Test method for add_download_buttons_scroll_area."""
-        # Mock File.objects to avoid database calls
-        mock_file1 = mocker.Mock()
-        mock_file1.display_name = "Video 1"
-        mock_file2 = mocker.Mock()
-        mock_file2.display_name = "Video 2"
-        mock_files = [mock_file1, mock_file2]
-
-        mock_file_objects = mocker.patch(
-            make_obj_importpath(downloads_module) + ".File.objects"
-        )
-        mock_file_objects.all.return_value.order_by.return_value = mock_files
-
-        # Mock Qt widgets
-        mock_widget = mocker.Mock()
-        mock_layout = mocker.Mock()
-        mock_scroll_area = mocker.Mock()
+    def test_add_downloads_list_view(self, mocker: MockerFixture) -> None:
+        """Test method for add_downloads_list_view."""
+        # Mock Qt widgets and the model to avoid database calls
+        mock_model = mocker.Mock()
+        mock_view = mocker.Mock()
         mock_v_layout = mocker.Mock()
-
         mocker.patch(
-            make_obj_importpath(downloads_module) + ".QWidget", return_value=mock_widget
+            make_obj_importpath(downloads_module) + ".DownloadsListModel",
+            return_value=mock_model,
         )
         mocker.patch(
-            make_obj_importpath(downloads_module) + ".QVBoxLayout",
-            return_value=mock_layout,
+            make_obj_importpath(downloads_module) + ".QListView",
+            return_value=mock_view,
         )
+        mock_add_download_menu = mocker.patch.object(Downloads, "add_download_menu")
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.v_layout = mock_v_layout
+
+        # Call add_downloads_list_view
+        page.add_downloads_list_view()
+
+        # Verify the view shows the model
+        assert page.downloads_model == mock_model, "Model should be stored"
+        mock_view.setModel.assert_called_once_with(mock_model)
+        mock_view.setUniformItemSizes.assert_called_once_with(True)  # noqa: FBT003
+        mock_view.clicked.connect.assert_called_once_with(page.on_download_clicked)
+        mock_add_download_menu.assert_called_once()
+        mock_v_layout.addWidget.assert_called_once_with(mock_view)
+
+    def test_add_download_menu(self, mocker: MockerFixture) -> None:
+        """Test method for add_download_menu."""
+        # Mock Qt widgets and methods
+        mock_menu = mocker.Mock()
+        mock_play_action = mocker.Mock()
+        mock_delete_action = mocker.Mock()
+        mock_menu.addAction.side_effect = [mock_play_action, mock_delete_action]
         mocker.patch(
-            make_obj_importpath(downloads_module) + ".QScrollArea",
-            return_value=mock_scroll_area,
+            make_obj_importpath(downloads_module) + ".QMenu", return_value=mock_menu
+        )
+        mock_get_svg_icon = mocker.patch.object(Downloads, "get_svg_icon")
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+
+        # Call add_download_menu
+        page.add_download_menu()
+
+        # Verify one menu with play and delete was created
+        assert page.download_menu == mock_menu, "Menu should be stored"
+        assert page.menu_row is None, "Menu should have no row yet"
+        assert page.menu_file is None, "Menu should have no file yet"
+        mock_menu.addAction.assert_any_call("Play")
+        mock_menu.addAction.assert_any_call("Delete")
+        expected_icon_count = 2
+        assert mock_get_svg_icon.call_count == expected_icon_count, (
+            "Icons should be loaded once"
+        )
+        mock_play_action.triggered.connect.assert_called_once_with(page.on_play_action)
+        mock_delete_action.triggered.connect.assert_called_once_with(
+            page.on_delete_action
         )
 
-        # Mock the add_download_button method
-        mock_add_download_button = mocker.patch.object(Downloads, "add_download_button")
+    def test_on_download_clicked(self, mocker: MockerFixture) -> None:
+        """Test method for on_download_clicked."""
+        mock_row = mocker.Mock()
+        mock_model = mocker.Mock()
+        mock_model.get_download_row.return_value = mock_row
+        mock_view = mocker.Mock()
+        mock_menu = mocker.Mock()
+        mock_index = mocker.Mock()
+        mock_runner = mocker.patch(
+            make_obj_importpath(downloads_module) + ".QueryRunner.get_instance"
+        ).return_value
 
         # Create a mock instance
         page = Downloads.__new__(Downloads)
-        page.v_layout = mock_v_layout
+        page.downloads_model = mock_model
+        page.downloads_view = mock_view
+        page.download_menu = mock_menu
+        page.menu_file = mocker.Mock()
+
+        # Call on_download_clicked
+        page.on_download_clicked(mock_index)
+
+        # Verify the menu was shown for the clicked row
+        mock_model.get_download_row.assert_called_once_with(mock_index)
+        assert page.menu_row == mock_row, "Clicked row should be stored"
+        assert page.menu_file is None, "File of the last row should be dropped"
+        mock_runner.run.assert_called_once()
+        assert mock_runner.run.call_args[0][0] == mock_row.get_file, (
+            "File should be fetched off the UI thread"
+        )
+        mock_view.visualRect.assert_called_once_with(mock_index)
+        mock_menu.popup.assert_called_once()
+
+        # no menu for an empty row
+        mock_model.get_download_row.return_value = None
+        page.on_download_clicked(mock_index)
+        mock_menu.popup.assert_called_once()
 
-        # Call add_download_buttons_scroll_area
-        page.add_download_buttons_scroll_area()
+    def test_on_menu_file_loaded(self, mocker: MockerFixture) -> None:
+        """Test method for on_menu_file_loaded."""
+        mock_file = mocker.Mock()
+        mock_row = mocker.Mock(pk=1)
+        mock_model = mocker.Mock()
 
-        # Verify downloads were fetched and buttons were created
-        mock_file_objects.all.assert_called_once()
-        mock_file_objects.all.return_value.order_by.assert_called_once_with(
-            "-created_at"
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.downloads_model = mock_model
+        page.menu_row = mock_row
+        page.menu_file = None
+
+        page.on_menu_file_loaded(mocker.Mock(pk=2), mock_file)
+        assert page.menu_file is None, "File of another row should be ignored"
+
+        page.on_menu_file_loaded(mock_row, mock_file)
+        assert page.menu_file == mock_file, "File should be kept for the menu"
+        mock_model.remove_row.assert_not_called()
+
+        # a row whose file is gone is removed
+        page.on_menu_file_loaded(mock_row, None)
+        mock_model.remove_row.assert_called_once_with(1)
+
+    def test_get_menu_file(self, mocker: MockerFixture) -> None:
+        """Test method for get_menu_file."""
+        mock_file = mocker.Mock()
+        mock_row = mocker.Mock(pk=1)
+        mock_row.get_file.return_value = mock_file
+        mock_model = mocker.Mock()
+
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.downloads_model = mock_model
+        page.menu_row = None
+        page.menu_file = None
+        assert page.get_menu_file() is None, "No row should have no file"
+
+        # the prefetched file is used without a query
+        page.menu_row = mock_row
+        page.menu_file = mocker.Mock(pk=1)
+        assert page.get_menu_file() == page.menu_file, "Should use the fetched file"
+        mock_row.get_file.assert_not_called()
+        page.menu_file = None
+
+        # Verify the file is fetched for the row
+        page.menu_row = mock_row
+        assert page.get_menu_file() == mock_file, "Should fetch the file of the row"
+        mock_model.remove_row.assert_not_called()
+
+        # a row whose file is gone is removed
+        mock_row.get_file.return_value = None
+        assert page.get_menu_file() is None, "Deleted file should be None"
+        mock_model.remove_row.assert_called_once_with(1)
+
+    def test_on_play_action(self, mocker: MockerFixture) -> None:
+        """Test method for on_play_action."""
+        mock_play_download = mocker.patch.object(Downloads, "play_download")
+        mock_file = mocker.Mock()
+        mock_get_menu_file = mocker.patch.object(
+            Downloads, "get_menu_file", return_value=mock_file
         )
 
-        # Verify add_download_button was called for each file
-        expected_call_count = 2
-        assert mock_add_download_button.call_count == expected_call_count, (
-            "Should call add_download_button for each file"
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+
+        # Call on_play_action
+        page.on_play_action()
+        mock_get_menu_file.return_value = None
+        page.on_play_action()
+
+        # Verify only the existing file was played
+        mock_play_download.assert_called_once_with(mock_file)
+
+    def test_on_delete_action(self, mocker: MockerFixture) -> None:
+        """Test method for on_delete_action."""
+        mock_remove_download = mocker.patch.object(Downloads, "remove_download")
+        mock_file = mocker.Mock()
+        mock_get_menu_file = mocker.patch.object(
+            Downloads, "get_menu_file", return_value=mock_file
         )
-        mock_add_download_button.assert_any_call(mock_file1)
-        mock_add_download_button.assert_any_call(mock_file2)
 
-        # Verify scroll area was set up
-        mock_scroll_area.setWidget.assert_called_once_with(mock_widget)
-        mock_v_layout.addWidget.assert_called_once_with(mock_scroll_area)
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.menu_row = mocker.Mock()
+
+        # Call on_delete_action
+        page.on_delete_action()
+        mock_get_menu_file.return_value = None
+        page.on_delete_action()
+
+        # Verify the download was deleted once
+        mock_remove_download.assert_called_once_with(mock_file)
+        assert page.menu_row is None, "Deleted row should be cleared"
+        assert page.menu_file is None, "Deleted file should be cleared"
 
     def test_play_download(self, mocker: MockerFixture) -> None:
         """Test method for play_download."""
@@ -197,11 +459,12 @@ class TestDownloads:
         mock_player_page.current_file = None
         mock_get_page = mocker.patch.object(Downloads, "get_page")
         mock_get_page.return_value = mock_player_page
+        mock_checkpoints = mocker.patch(
+            make_obj_importpath(downloads_module) + ".PositionCheckpoints.get_instance"
+        ).return_value
 
         # Create a mock download file
         mock_download = mocker.Mock()
-        mock_download.file.path = "/fake/path/video.mp4"
-        mock_download.last_position = 1500
 
         # Create a mock instance
         page = Downloads.__new__(Downloads)
@@ -209,97 +472,86 @@ class TestDownloads:
         # Call play_download
         page.play_download(mock_download)
 
-        # Verify download was refreshed from database
-        mock_download.refresh_from_db.assert_called_once()
+        # Verify the download is not queried on the UI thread
+        mock_download.refresh_from_db.assert_not_called()
 
-        # Verify player page was retrieved and configured
+        # Verify the position of the playing video was checkpointed
+        mock_player_page.record_position.assert_called_once()
+        mock_checkpoints.flush.assert_called_once()
+
+        # Verify player page was retrieved and plays the download
         mock_get_page.assert_called_once()
-        assert mock_player_page.current_file == mock_download, (
-            "Player page should have current file set"
-        )
+        mock_player_page.play_cached_download.assert_called_once_with(mock_download)
 
-        # Verify playback was started with correct parameters
-        mock_player_page.start_playback.assert_called_once_with(
-            Path("/fake/path/video.mp4"), 1500
-        )
+    def test_add_download(self, mocker: MockerFixture) -> None:
+        """Test method for add_download."""
+        mock_model = mocker.Mock()
+        mock_download = mocker.Mock()
 
-    def test_add_download_button(self, mocker: MockerFixture) -> None:
-        """Test method for add_download_button."""
-        # Mock Qt widgets and methods
-        mock_button = mocker.Mock()
-        mock_menu = mocker.Mock()
-        mock_play_action = mocker.Mock()
-        mock_delete_action = mocker.Mock()
-        mock_downloads_layout = mocker.Mock()
+        # Create a mock instance
+        page = Downloads.__new__(Downloads)
+        page.downloads_model = mock_model
 
-        mock_qpushbutton = mocker.patch(
-            make_obj_importpath(downloads_module) + ".QPushButton",
-            return_value=mock_button,
+        # Call add_download
+        page.add_download(mock_download)
+
+        # Verify the download was added to the model
+        mock_model.add_file.assert_called_once_with(mock_download)
+
+    def test_remove_download(self, mocker: MockerFixture) -> None:
+        """Test method for remove_download."""
+        mock_file = mocker.Mock(pk=1)
+        mock_stop_playback = mocker.patch.object(Downloads, "stop_playback")
+        mock_model = mocker.Mock()
+        mock_file_objects = mocker.patch(
+            make_obj_importpath(downloads_module) + ".File.objects"
         )
-        mocker.patch(
-            make_obj_importpath(downloads_module) + ".QMenu", return_value=mock_menu
+        mock_deletion_queue_cls = mocker.patch(
+            make_obj_importpath(downloads_module) + ".DeletionQueue"
         )
-        mock_menu.addAction.side_effect = [mock_play_action, mock_delete_action]
-        mocker.patch.object(Downloads, "get_svg_icon")
-
-        # Create a mock download file
-        mock_download = mocker.Mock()
-        mock_download.display_name = "Test Video"
+        mock_deletion_queue = mock_deletion_queue_cls.get_instance.return_value
 
         # Create a mock instance
         page = Downloads.__new__(Downloads)
-        page.downloads_layout = mock_downloads_layout
-        page.button_to_download = {}
-
-        # Call add_download_button
-        page.add_download_button(mock_download)
+        page.downloads_model = mock_model
 
-        # Verify button was created with correct text
-        mock_qpushbutton.assert_called_once_with("Test Video")
+        # Call remove_download
+        page.remove_download(mock_file)
 
-        # Verify button was added to layout and mapping
-        mock_downloads_layout.addWidget.assert_called_once_with(mock_button)
-        assert page.button_to_download[mock_button] == mock_download, (
-            "Button should be mapped to download"
+        # Verify playback was stopped and the file was queued for deletion
+        mock_stop_playback.assert_called_once_with(mock_file)
+        mock_file_objects.filter.assert_called_once_with(pk=1)
+        mock_deletion_queue.delete.assert_called_once_with(
+            mock_file_objects.filter.return_value
         )
 
-        # Verify menu was created and configured
-        mock_menu.addAction.assert_any_call("Play")
-        mock_menu.addAction.assert_any_call("Delete")
-        mock_play_action.setIcon.assert_called_once()
-        mock_delete_action.setIcon.assert_called_once()
-        mock_button.setMenu.assert_called_once_with(mock_menu)
+        # Verify the row was removed from the model
+        mock_model.remove_row.assert_called_once_with(1)
 
-    def test_remove_download_and_button(self, mocker: MockerFixture) -> None:
-        """Test method for remove_download_and_button."""
-        # Mock the Player page and its methods
-        mock_player_page = mocker.Mock()
-        mock_player_page.current_file = None
-        mock_get_page = mocker.patch.object(Downloads, "get_page")
-        mock_get_page.return_value = mock_player_page
-
-        # Mock the download file and its delete method
+    def test_stop_playback(self, mocker: MockerFixture) -> None:
+        """Test method for stop_playback."""
         mock_file = mocker.Mock()
-        mock_downloads_layout = mocker.Mock()
-        mock_button = mocker.Mock()
+        mock_player_page = mocker.Mock()
+        mock_player_page.current_file = mock_file
+        mock_find_page = mocker.patch.object(Downloads, "find_page")
+        mock_find_page.return_value = None
 
         # Create a mock instance
         page = Downloads.__new__(Downloads)
-        page.downloads_layout = mock_downloads_layout
-        page.button_to_download = {mock_button: mock_file}
-
-        # Call remove_download_and_button
-        page.remove_download_and_button(mock_button)
-
-        # Verify get_page was called to get player page
-        mock_get_page.assert_called_once()
-
-        # Verify file was deleted
-        mock_file.delete_file.assert_called_once()
 
-        # Verify button was removed from layout and mapping
-        mock_downloads_layout.removeWidget.assert_called_once_with(mock_button)
-        mock_button.deleteLater.assert_called_once()
-        assert mock_button not in page.button_to_download, (
-            "Button should be removed from mapping"
+        # Verify the player is not made just to stop it
+        page.stop_playback()
+        mock_find_page.assert_called_once_with(PlayerPage)
+
+        # Verify another download keeps playing
+        mock_find_page.return_value = mock_player_page
+        page.stop_playback(mocker.Mock())
+        mock_player_page.stop_playback.assert_not_called()
+
+        # Verify the download or anything is stopped
+        page.stop_playback(mock_file)
+        page.stop_playback()
+        expected_stops = 2
+        assert mock_player_page.stop_playback.call_count == expected_stops, (
+            "Should stop the player"
         )
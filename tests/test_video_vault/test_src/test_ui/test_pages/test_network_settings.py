@@ -0,0 +1,138 @@
+"""module."""
+
+import pytest
+from pyrig.src.modules.module import make_obj_importpath
+from pytest_mock import MockerFixture
+
+from video_vault.src.db.models import NetworkSettings as NetworkSettingsModel
+from video_vault.src.ui.pages import network_settings as network_settings_module
+from video_vault.src.ui.pages.network_settings import NetworkSettings
+
+
+class TestNetworkSettings:
+    """Test class for NetworkSettings."""
+
+    def test_pre_setup(self) -> None:
+        """Test method for pre_setup."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        page.pre_setup()
+
+    def test_setup(self, mocker: MockerFixture) -> None:
+        """Test method for setup."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        mock_add_settings_form = mocker.patch.object(page, "add_settings_form")
+        mock_add_save_button = mocker.patch.object(page, "add_save_button")
+
+        page.setup()
+
+        mock_add_settings_form.assert_called_once()
+        mock_add_save_button.assert_called_once()
+
+    def test_post_setup(self, mocker: MockerFixture) -> None:
+        """Test method for post_setup."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        mock_load_settings = mocker.patch.object(page, "load_settings")
+
+        page.post_setup()
+
+        mock_load_settings.assert_called_once()
+
+    def test_add_settings_form(self, mocker: MockerFixture) -> None:
+        """Test method for add_settings_form."""
+        mock_form_layout = mocker.patch(
+            make_obj_importpath(network_settings_module) + ".QFormLayout"
+        ).return_value
+        mock_domain_edit = mocker.patch(
+            make_obj_importpath(network_settings_module) + ".QLineEdit"
+        ).return_value
+        mocker.patch(make_obj_importpath(network_settings_module) + ".QSpinBox")
+        mock_v_layout = mocker.Mock()
+        page = NetworkSettings.__new__(NetworkSettings)
+        page.v_layout = mock_v_layout
+
+        page.add_settings_form()
+
+        assert list(page.spin_boxes) == list(NetworkSettingsModel.DEFAULTS), (
+            "Should add a spin box per setting"
+        )
+        assert mock_form_layout.addRow.call_count == len(page.spin_boxes) + 1, (
+            "Should add a row for the domain and every setting"
+        )
+        mock_domain_edit.editingFinished.connect.assert_called_once_with(
+            page.load_settings
+        )
+        mock_v_layout.addLayout.assert_called_once_with(mock_form_layout)
+
+    def test_add_save_button(self, mocker: MockerFixture) -> None:
+        """Test method for add_save_button."""
+        mock_button = mocker.patch(
+            make_obj_importpath(network_settings_module) + ".QPushButton"
+        ).return_value
+        mock_v_layout = mocker.Mock()
+        page = NetworkSettings.__new__(NetworkSettings)
+        page.v_layout = mock_v_layout
+
+        page.add_save_button()
+
+        mock_button.clicked.connect.assert_called_once_with(page.on_save)
+        mock_v_layout.addWidget.assert_called_once_with(mock_button)
+
+    def test_get_domain(self, mocker: MockerFixture) -> None:
+        """Test method for get_domain."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        page.domain_edit = mocker.Mock(**{"text.return_value": " YouTube.com "})
+
+        assert page.get_domain() == "youtube.com", "Should be stripped and lowercase"
+
+    def test_load_settings(self, mocker: MockerFixture) -> None:
+        """Test method for load_settings."""
+        mock_runner = mocker.patch(
+            make_obj_importpath(network_settings_module) + ".QueryRunner.get_instance"
+        ).return_value
+        page = NetworkSettings.__new__(NetworkSettings)
+        mocker.patch.object(page, "get_domain", return_value="a.com")
+        mock_on_settings_loaded = mocker.patch.object(page, "on_settings_loaded")
+
+        page.load_settings()
+
+        mock_runner.run.assert_called_once()
+        on_result = mock_runner.run.call_args[0][1]
+        on_result(None)
+        mock_on_settings_loaded.assert_called_once_with("a.com", None)
+
+    def test_on_settings_loaded(self, mocker: MockerFixture) -> None:
+        """Test method for on_settings_loaded."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        mocker.patch.object(page, "get_domain", return_value="a.com")
+        retries = mocker.Mock()
+        buffersize = mocker.Mock()
+        page.spin_boxes = {"retries": retries, "buffersize": buffersize}
+        expected_retries = 3
+        settings = NetworkSettingsModel(domain="a.com", retries=expected_retries)
+
+        page.on_settings_loaded("a.com", settings)
+
+        retries.setValue.assert_called_once_with(expected_retries)
+        buffersize.setValue.assert_called_once_with(0)
+
+        # settings of a domain that is not entered anymore are dropped
+        retries.reset_mock()
+        page.on_settings_loaded("b.com", None)
+        retries.setValue.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_on_save(self, mocker: MockerFixture) -> None:
+        """Test method for on_save."""
+        page = NetworkSettings.__new__(NetworkSettings)
+        mocker.patch.object(page, "get_domain", return_value="a.com")
+        expected_retries = 3
+        page.spin_boxes = {
+            "retries": mocker.Mock(**{"value.return_value": expected_retries}),
+            "buffersize": mocker.Mock(**{"value.return_value": 0}),
+        }
+
+        page.on_save()
+
+        settings = NetworkSettingsModel.objects.get(domain="a.com")
+        assert settings.retries == expected_retries, "Retries should be saved"
+        assert settings.buffersize is None, "Default should be saved as empty"
@@ -2,13 +2,37 @@
 
 from pathlib import Path
 
+import pytest
 from pyrig.src.modules.module import make_obj_importpath
-from pytest_mock import MockerFixture
+from pytest_mock import MockerFixture, MockType
 
 from video_vault.src.ui.pages import player as player_module
 from video_vault.src.ui.pages.player import Player
 
 
+@pytest.fixture
+def mock_checkpoints(mocker: MockerFixture) -> MockType:
+    """Mock the position checkpoints, recorded positions are not newer."""
+    checkpoints: MockType = mocker.Mock()
+    checkpoints.get_position.side_effect = lambda _file_id, default: default
+    mocker.patch(
+        make_obj_importpath(player_module) + ".PositionCheckpoints.get_instance",
+        return_value=checkpoints,
+    )
+    return checkpoints
+
+
+@pytest.fixture
+def mock_query_runner(mocker: MockerFixture) -> MockType:
+    """Mock the query runner, so no queries are run."""
+    runner: MockType = mocker.Mock()
+    mocker.patch(
+        make_obj_importpath(player_module) + ".QueryRunner.get_instance",
+        return_value=runner,
+    )
+    return runner
+
+
 class TestPlayer:
     """Test class for Player."""
 
@@ -20,47 +44,70 @@ class TestPlayer:
 
         # Since pre_setup is empty, just verify it completed without error
 
-    def test_post_setup(self) -> None:
+    def test_post_setup(self, mocker: MockerFixture) -> None:
         """Test method for post_setup."""
         # Create a mock instance and call post_setup
         player = Player.__new__(Player)  # Create without calling __init__
+        mock_add_position_timer = mocker.patch.object(player, "add_position_timer")
         player.post_setup()
 
         # Verify current_file was set to None
         assert player.current_file is None, "current_file should be set to None"
+        mock_add_position_timer.assert_called_once()
 
-    def test_play_download(self, mocker: MockerFixture) -> None:
-        """Test method for play_download."""
-        # Create a mock instance
+    def test_add_position_timer(self, mocker: MockerFixture) -> None:
+        """Test method for add_position_timer."""
+        mock_timer_class = mocker.patch(make_obj_importpath(player_module) + ".QTimer")
+        mock_timer = mock_timer_class.return_value
         player = Player.__new__(Player)
-        player.current_file = None
 
-        # Mock the media player and start_playback method
+        player.add_position_timer()
+
+        mock_timer.setInterval.assert_called_once_with(Player.POSITION_INTERVAL_MS)
+        mock_timer.timeout.connect.assert_called_once_with(player.record_position)
+        mock_timer.start.assert_called_once()
+
+    def test_record_position(
+        self, mocker: MockerFixture, mock_checkpoints: MockType
+    ) -> None:
+        """Test method for record_position."""
+        player = Player.__new__(Player)
+        player.current_file = None
         mock_media_player = mocker.Mock()
         mock_media_player.position.return_value = 2500
         player.media_player = mock_media_player
-        mock_start_playback = mocker.patch.object(player, "start_playback")
 
-        # Create a mock download file
-        mock_download = mocker.Mock()
-        mock_download.file.path = "/fake/path/video.mp4"
-        mock_download.last_position = 1500
+        player.record_position()
+        mock_checkpoints.record.assert_not_called()
 
-        # Call play_download
-        player.play_download(mock_download)
+        mock_file = mocker.Mock(pk=1)
+        player.current_file = mock_file
+        player.record_position()
 
-        # Verify download was refreshed from database
-        mock_download.refresh_from_db.assert_called_once()
-
-        # Verify current_file was set
-        assert player.current_file == mock_download, (
-            "current_file should be set to download"
+        expected_position = 2500
+        assert mock_file.last_position == expected_position, (
+            "Position should be set on the file"
         )
+        mock_checkpoints.record.assert_called_once_with(1, expected_position)
 
-        # Verify start_playback was called with correct parameters
-        mock_start_playback.assert_called_once_with(Path("/fake/path/video.mp4"), 1500)
+    def test_play_download(self, mocker: MockerFixture) -> None:
+        """Test method for play_download."""
+        player = Player.__new__(Player)
+        mock_stop_playback = mocker.patch.object(player, "stop_playback")
+        mock_play_cached_download = mocker.patch.object(player, "play_cached_download")
+        mock_download = mocker.Mock()
 
-    def test_play_download_with_existing_file(self, mocker: MockerFixture) -> None:
+        player.play_download(mock_download)
+
+        mock_stop_playback.assert_called_once()
+        mock_play_cached_download.assert_called_once_with(mock_download)
+
+    def test_play_download_with_existing_file(
+        self,
+        mocker: MockerFixture,
+        mock_checkpoints: MockType,
+        mock_query_runner: MockType,
+    ) -> None:
         """Test method for play_download when there's already a current file."""
         # Create a mock instance with existing current file
         player = Player.__new__(Player)
@@ -77,19 +124,22 @@ class TestPlayer:
         mock_start_playback = mocker.patch.object(player, "start_playback")
 
         # Create a mock new download file
-        mock_download = mocker.Mock()
+        mock_download = mocker.Mock(pk=1)
         mock_download.file.path = "/fake/path/new_video.mp4"
         mock_download.last_position = 1000
 
         # Call play_download
         player.play_download(mock_download)
 
-        # Verify existing file position was saved
+        # Verify existing file position was checkpointed and flushed
         expected_position = 2500
         assert mock_existing_file.last_position == expected_position, (
             "Existing file position should be saved"
         )
-        mock_existing_file.save.assert_called_once()
+        mock_checkpoints.record.assert_called_once_with(
+            mock_existing_file.pk, expected_position
+        )
+        mock_checkpoints.flush.assert_called_once()
 
         # Verify new file was set as current
         assert player.current_file == mock_download, (
@@ -100,6 +150,70 @@ class TestPlayer:
         mock_start_playback.assert_called_once_with(
             Path("/fake/path/new_video.mp4"), 1000
         )
+        mock_query_runner.run.assert_called_once()
+
+    def test_play_cached_download(
+        self,
+        mocker: MockerFixture,
+        mock_checkpoints: MockType,
+        mock_query_runner: MockType,
+    ) -> None:
+        """Test method for play_cached_download."""
+        player = Player.__new__(Player)
+        mock_start_playback = mocker.patch.object(player, "start_playback")
+        mock_on_download_refreshed = mocker.patch.object(
+            player, "on_download_refreshed"
+        )
+        mock_download = mocker.Mock(pk=1)
+        mock_download.file.path = "/fake/path/video.mp4"
+        mock_download.last_position = 1500
+
+        player.play_cached_download(mock_download)
+
+        # Verify playback starts from the cached row without a query
+        mock_download.refresh_from_db.assert_not_called()
+        mock_checkpoints.get_position.assert_called_once_with(mock_download.pk, 1500)
+        assert player.current_file == mock_download, (
+            "current_file should be set to download"
+        )
+        mock_start_playback.assert_called_once_with(Path("/fake/path/video.mp4"), 1500)
+
+        # Verify the row is refreshed off the UI thread
+        mock_query_runner.run.assert_called_once()
+        on_result = mock_query_runner.run.call_args[0][1]
+        fresh = mocker.Mock()
+        on_result(fresh)
+        mock_on_download_refreshed.assert_called_once_with(mock_download, fresh)
+
+    def test_on_download_refreshed(
+        self, mocker: MockerFixture, mock_checkpoints: MockType
+    ) -> None:
+        """Test method for on_download_refreshed."""
+        player = Player.__new__(Player)
+        mock_media_player = mocker.Mock()
+        player.media_player = mock_media_player
+        mock_download = mocker.Mock(last_position=1500)
+        player.current_file = mocker.Mock()
+
+        # another video is playing by now
+        player.on_download_refreshed(mock_download, mocker.Mock(last_position=3000))
+        mock_media_player.setPosition.assert_not_called()
+
+        # an unchanged row keeps playing
+        player.current_file = mock_download
+        player.on_download_refreshed(mock_download, mocker.Mock(last_position=1500))
+        mock_media_player.setPosition.assert_not_called()
+
+        # a newer position in the database is applied
+        player.on_download_refreshed(mock_download, mocker.Mock(last_position=3000))
+        expected_position = 3000
+        mock_media_player.setPosition.assert_called_once_with(expected_position)
+        mock_checkpoints.get_position.assert_called()
+
+        # a deleted file stops playback
+        player.on_download_refreshed(mock_download, None)
+        assert player.current_file is None, "Deleted file should not be current"
+        mock_media_player.stop_and_close_io_device.assert_called_once()
 
     def test_start_playback(self, mocker: MockerFixture) -> None:
         """Test method for start_playback."""
@@ -151,7 +265,9 @@ class TestPlayer:
         # Verify play_encrypted_file was called with default position 0
         mock_play_encrypted_file.assert_called_once_with(test_path, mock_aes_gcm, 0)
 
-    def test_stop_playback(self, mocker: MockerFixture) -> None:
+    def test_stop_playback(
+        self, mocker: MockerFixture, mock_checkpoints: MockType
+    ) -> None:
         """Test method for stop_playback."""
         # Create a mock instance
         player = Player.__new__(Player)
@@ -174,7 +290,10 @@ class TestPlayer:
         assert mock_current_file.last_position == expected_position, (
             "Current file position should be saved"
         )
-        mock_current_file.save.assert_called_once()
+        mock_checkpoints.record.assert_called_once_with(
+            mock_current_file.pk, expected_position
+        )
+        mock_checkpoints.flush.assert_called_once()
 
         # Verify current_file was set to None
         assert player.current_file is None, "current_file should be set to None"
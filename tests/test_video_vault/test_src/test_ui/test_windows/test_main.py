@@ -4,6 +4,7 @@ from pyrig.src.modules.module import make_obj_importpath
 from pytest_mock import MockerFixture
 
 from video_vault.src.ui.pages.downloads import Downloads as DownloadsPage
+from video_vault.src.ui.pages.player import Player as PlayerPage
 from video_vault.src.ui.windows import main as windows_main_module
 from video_vault.src.ui.windows.main import VideoVault
 
@@ -73,10 +74,78 @@ class TestVideoVault:
 
         # Since setup is empty, just verify it completed without error
 
-    def test_post_setup(self) -> None:
+    def test_post_setup(self, mocker: MockerFixture) -> None:
         """Test method for post_setup."""
+        # Mock the scheduler to avoid starting downloads
+        mock_scheduler_cls = mocker.patch(
+            make_obj_importpath(windows_main_module) + ".DownloadScheduler"
+        )
+        mock_scheduler = mock_scheduler_cls.get_instance.return_value
+        mock_deletion_queue_cls = mocker.patch(
+            make_obj_importpath(windows_main_module) + ".DeletionQueue"
+        )
+        mock_deletion_queue = mock_deletion_queue_cls.get_instance.return_value
+        mock_qtimer = mocker.patch(make_obj_importpath(windows_main_module) + ".QTimer")
+
         # Create a mock instance and call post_setup
         window = VideoVault.__new__(VideoVault)  # Create without calling __init__
         window.post_setup()
 
-        # Since post_setup is empty, just verify it completed without error
+        # Verify unfinished downloads and removals are resumed
+        mock_scheduler.resume_unfinished.assert_called_once()
+        mock_deletion_queue.resume.assert_called_once()
+        # Verify pages are warmed up after the window is shown
+        mock_qtimer.singleShot.assert_called_once_with(
+            VideoVault.WARM_UP_DELAY_MS, window.warm_up_pages
+        )
+
+    def test_make_pages(self, mocker: MockerFixture) -> None:
+        """Test method for make_pages."""
+        window = VideoVault.__new__(VideoVault)
+        mock_get_page = mocker.patch.object(window, "get_page")
+
+        window.make_pages()
+
+        # Verify only the start page is made
+        mock_get_page.assert_called_once_with(DownloadsPage)
+
+    def test_get_page(self, mocker: MockerFixture) -> None:
+        """Test method for get_page."""
+        window = VideoVault.__new__(VideoVault)
+        mock_page = mocker.Mock()
+        mock_find_page = mocker.patch.object(
+            window, "find_page", return_value=mock_page
+        )
+        mock_page_cls = mocker.Mock(__name__="Page")
+
+        # Verify a made page is returned
+        assert window.get_page(mock_page_cls) == mock_page, "Should return the page"
+        mock_page_cls.assert_not_called()
+
+        # Verify a page is made on first use
+        mock_find_page.return_value = None
+        assert window.get_page(mock_page_cls) == mock_page_cls.return_value, (
+            "Should make the page"
+        )
+        mock_page_cls.assert_called_once_with(base_window=window)
+
+    def test_find_page(self, mocker: MockerFixture) -> None:
+        """Test method for find_page."""
+        window = VideoVault.__new__(VideoVault)
+        page = DownloadsPage.__new__(DownloadsPage)
+        mocker.patch.object(window, "get_stack_pages", return_value=[page])
+
+        assert window.find_page(DownloadsPage) is page, "Should find the made page"
+        assert window.find_page(PlayerPage) is None, "Page should not be made"
+
+    def test_warm_up_pages(self, mocker: MockerFixture) -> None:
+        """Test method for warm_up_pages."""
+        window = VideoVault.__new__(VideoVault)
+        mock_get_page = mocker.patch.object(window, "get_page")
+
+        window.warm_up_pages()
+
+        assert mock_get_page.call_count == len(VideoVault.WARM_UP_PAGE_CLASSES), (
+            "Should make every warm up page"
+        )
+        mock_get_page.assert_any_call(PlayerPage)
@@ -3,6 +3,7 @@
 import logging
 import os
 import sys
+import time
 
 from PySide6.QtWidgets import QApplication
 
@@ -23,6 +24,7 @@ def run() -> None:
     # to avoid segfaults in headless environments
     if "PYTEST_CURRENT_TEST" in os.environ:
         return
+    start = time.perf_counter()
 
     # Create QApplication - this manages the entire app
     app = QApplication(sys.argv)
@@ -34,6 +36,7 @@ def run() -> None:
     window = VideoVaultWindow()
 
     window.showMaximized()
+    logger.info("Main window shown in %.1f ms", (time.perf_counter() - start) * 1000)
     # Start the event loop (keeps the app running)
     # This will block until the user closes the window
     logger.info("Starting event loop")
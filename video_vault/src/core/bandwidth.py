@@ -0,0 +1,240 @@
+"""Bandwidth module.
+
+This module contains the bandwidth limiting of downloads.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from functools import cache
+from typing import Any, BinaryIO
+
+from video_vault.src.core.cancellation import CancelToken
+from video_vault.src.db.models import BandwidthSchedule
+
+logger = logging.getLogger(__name__)
+
+# a bucket holds at most this many seconds of its rate, so short bursts pass
+BURST_S = 1.0
+# waits are split into slices, so a cancelled download stops waiting quickly
+MAX_SLEEP_S = 0.1
+# the schedule is checked again after this interval while downloads run
+SCHEDULE_REFRESH_S = 60.0
+
+
+def get_fair_rates(
+    total: float | None, caps: Mapping[int, float | None]
+) -> dict[int, float | None]:
+    """Split a total rate between jobs, None means unlimited.
+
+    Every job gets an equal share, but never more than its cap.
+    What capped jobs leave over is split between the others.
+    """
+    if total is None:
+        return dict(caps)
+    rates: dict[int, float | None] = {}
+    remaining = total
+    # capped jobs first, lowest cap first, so their leftover goes to the rest
+    pending = sorted(caps.items(), key=lambda item: (item[1] is None, item[1] or 0))
+    for i, (job_id, cap) in enumerate(pending):
+        share = remaining / (len(pending) - i)
+        rate = share if cap is None else min(cap, share)
+        rates[job_id] = rate
+        remaining -= rate
+    return rates
+
+
+class TokenBucket:
+    """Token bucket that limits a rate in bytes per second.
+
+    Tokens refill at the rate up to BURST_S seconds worth. Taking more tokens
+    than there are puts the bucket into debt, the caller waits until it is paid
+    off at the current rate, so rate changes apply to waits in progress.
+    A rate of None is unlimited, a rate of 0 pauses.
+    """
+
+    def __init__(self, rate: float | None = None) -> None:
+        """Initialize the bucket."""
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        """Get the maximum number of tokens."""
+        return (self.rate or 0.0) * BURST_S
+
+    def set_rate(self, rate: float | None) -> None:
+        """Change the rate, the tokens so far are kept."""
+        with self.lock:
+            self.refill()
+            self.rate = rate
+            self.tokens = min(self.tokens, self.capacity)
+
+    def reserve(self, size: int) -> None:
+        """Take tokens, the bucket goes into debt if there are not enough."""
+        with self.lock:
+            if self.rate is None:
+                return
+            self.refill()
+            self.tokens -= size
+
+    def get_wait(self) -> float:
+        """Get the seconds until the debt is paid off at the current rate."""
+        with self.lock:
+            if self.rate is None:
+                return 0.0
+            self.refill()
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate if self.rate else float("inf")
+
+    def refill(self) -> None:
+        """Add the tokens for the time since the last update, under the lock."""
+        now = time.monotonic()
+        if self.rate is not None:
+            elapsed = now - self.updated_at
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+
+class BandwidthLimiter:
+    """Limiter of the download speed of one job.
+
+    Its bucket gets the job's share of the total rate from the governor.
+    Bytes are counted in the yt-dlp progress hooks or while reading a stream,
+    and the download thread sleeps while the bucket is in debt.
+    """
+
+    def __init__(
+        self,
+        governor: "BandwidthGovernor",
+        rate_limit: int | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> None:
+        """Initialize the limiter."""
+        self.governor = governor
+        self.rate_limit = rate_limit
+        self.cancel_token = cancel_token or CancelToken()
+        self.bucket = TokenBucket()
+        self.lock = threading.Lock()
+        # yt-dlp reports the bytes of each file so far, formats are separate files
+        self.downloaded_bytes: dict[str, int] = {}
+
+    def consume(self, size: int) -> None:
+        """Wait until the bytes fit into the job's rate."""
+        self.bucket.reserve(size)
+        while True:
+            self.governor.refresh_schedule()
+            wait = self.bucket.get_wait()
+            if wait <= 0:
+                return
+            self.cancel_token.raise_if_cancelled()
+            time.sleep(min(wait, MAX_SLEEP_S))
+
+    def progress_hook(self, status: dict[str, Any]) -> None:
+        """Limit the speed of yt-dlp, used as a yt-dlp progress hook.
+
+        Only downloading statuses count, the finished one reports the whole file
+        again. The first bytes reported for a file are the baseline, a resumed
+        file starts at the size of its .part file, which was not transferred now.
+        """
+        if status.get("status") != "downloading":
+            return
+        filename = status.get("tmpfilename") or status.get("filename") or ""
+        downloaded_bytes = status.get("downloaded_bytes") or 0
+        with self.lock:
+            size = downloaded_bytes - self.downloaded_bytes.setdefault(
+                filename, downloaded_bytes
+            )
+            self.downloaded_bytes[filename] = downloaded_bytes
+        if size > 0:
+            self.consume(size)
+
+
+class LimitedReader:
+    """Reader that limits how fast a stream is read.
+
+    Reading a pipe slower makes the writing process wait, e.g. ffmpeg.
+    """
+
+    def __init__(self, stream: BinaryIO, limiter: BandwidthLimiter) -> None:
+        """Initialize the reader."""
+        self.stream = stream
+        self.limiter = limiter
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the stream and wait for the limiter."""
+        data = self.stream.read(size)
+        self.limiter.consume(len(data))
+        return data
+
+
+class BandwidthGovernor:
+    """Governor that shares the total download rate between running downloads.
+
+    The total rate comes from the active BandwidthSchedule window.
+    Whenever a download starts or finishes, or the window changes,
+    the rate is split again between the running downloads,
+    each job at most at its own rate limit.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the governor."""
+        self.lock = threading.RLock()
+        self.limiters: dict[int, BandwidthLimiter] = {}
+        self.rate_limit: int | None = None
+        self.refreshed_at: float | None = None
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "BandwidthGovernor":
+        """Get the governor shared by the whole app."""
+        return cls()
+
+    @contextmanager
+    def limit(
+        self,
+        job_id: int,
+        rate_limit: int | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> Iterator[BandwidthLimiter]:
+        """Yield the limiter of a job while it downloads."""
+        limiter = BandwidthLimiter(self, rate_limit, cancel_token)
+        with self.lock:
+            self.limiters[job_id] = limiter
+            self.refresh_schedule(force=True)
+        try:
+            yield limiter
+        finally:
+            with self.lock:
+                self.limiters.pop(job_id, None)
+                self.rebalance()
+
+    def refresh_schedule(self, *, force: bool = False) -> None:
+        """Read the total rate from the schedule every SCHEDULE_REFRESH_S."""
+        now = time.monotonic()
+        with self.lock:
+            if (
+                not force
+                and self.refreshed_at is not None
+                and now - self.refreshed_at < SCHEDULE_REFRESH_S
+            ):
+                return
+            self.refreshed_at = now
+            rate_limit = BandwidthSchedule.get_rate_limit()
+            if rate_limit != self.rate_limit:
+                logger.info("Total download rate limit: %s B/s", rate_limit)
+            self.rate_limit = rate_limit
+            self.rebalance()
+
+    def rebalance(self) -> None:
+        """Split the total rate between the running downloads."""
+        with self.lock:
+            caps = {job_id: lim.rate_limit for job_id, lim in self.limiters.items()}
+            rates = get_fair_rates(self.rate_limit, caps)
+            for job_id, rate in rates.items():
+                self.limiters[job_id].bucket.set_rate(rate)
@@ -0,0 +1,157 @@
+"""Batch module.
+
+This module contains functions to import many downloads at once,
+e.g. a playlist, a channel or a list of urls.
+"""
+
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import Cookie
+from typing import TYPE_CHECKING, Any
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from video_vault.src.core.downloads import DownloadWorker, get_ydl_opts
+from video_vault.src.core.imports import lazy_import
+
+if TYPE_CHECKING:
+    import yt_dlp
+else:
+    yt_dlp = lazy_import("yt_dlp")
+
+logger = logging.getLogger(__name__)
+
+URL_SCHEMES = ("http://", "https://")
+
+# metadata extraction waits on the network, so more threads than cores are fine
+MAX_EXTRACT_WORKERS = 8
+
+
+def parse_urls(text: str) -> list[str]:
+    """Get the urls from pasted text or the content of a file, one per line."""
+    urls = []
+    for line in text.splitlines():
+        url = line.strip()
+        if url.startswith(URL_SCHEMES) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def extract_entry_urls(url: str, cookies: list[Cookie]) -> list[str]:
+    """Get the urls of the videos of a playlist or channel.
+
+    Entries are not resolved (extract_flat), so a playlist of any size
+    costs only the requests for its pages.
+    A url of a single video is returned as is.
+    """
+    logger.info("Extracting entries: %s", url)
+    ydl_opts = get_ydl_opts(cookies)
+    ydl_opts["extract_flat"] = "in_playlist"
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore[arg-type]
+            info = ydl.extract_info(url, download=False)
+    except Exception:
+        # keep the url, so the download job fails with the error
+        logger.exception("Failed to extract entries: %s", url)
+        return [url]
+    return get_entry_urls(dict(info)) or [url]
+
+
+def get_entry_urls(info: dict[str, Any]) -> list[str]:
+    """Get the urls of the videos in a flat extracted info, nested playlists too."""
+    if info.get("_type") not in ("playlist", "multi_video"):
+        entry_url = info.get("webpage_url") or info.get("url")
+        return [entry_url] if entry_url else []
+    urls = []
+    for entry in info.get("entries") or []:
+        if entry:
+            urls.extend(get_entry_urls(entry))
+    return urls
+
+
+def expand_urls(
+    urls: Iterable[str], cookies: list[Cookie], max_workers: int | None = None
+) -> list[str]:
+    """Expand playlists and channels into the urls of their videos.
+
+    The urls are extracted concurrently, the order is kept and duplicates are
+    removed.
+    """
+    max_workers = max_workers or min(MAX_EXTRACT_WORKERS, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda url: extract_entry_urls(url, cookies), urls)
+        expanded = [entry_url for entry_urls in results for entry_url in entry_urls]
+    return list(dict.fromkeys(expanded))
+
+
+class BatchImportWorker(QThread):
+    """Worker to expand the urls of a batch off the UI thread.
+
+    The expanded urls are scheduled by the receiver of the finished signal,
+    so the download workers are created in the UI thread when they start.
+    """
+
+    def __init__(self, urls: list[str], cookies: list[Cookie]) -> None:
+        """Initialize the worker."""
+        super().__init__()
+        self.urls = urls
+        self.cookies = cookies
+        self.entry_urls: list[str] = []
+
+    def run(self) -> None:
+        """Run the worker."""
+        self.entry_urls = expand_urls(self.urls, self.cookies)
+        logger.info(
+            "Expanded %d urls to %d downloads", len(self.urls), len(self.entry_urls)
+        )
+
+
+class DownloadBatch(QObject):
+    """Progress of the downloads of a batch.
+
+    The downloads are counted when they are scheduled, their workers are only
+    created when the scheduler starts them and are added then.
+    Emits progress with the number of succeeded, failed and total downloads,
+    so one view can show the whole batch instead of a popup per download.
+    """
+
+    progress = Signal(int, int, int)
+
+    def __init__(self) -> None:
+        """Initialize the batch."""
+        super().__init__()
+        self.workers: list[DownloadWorker] = []
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    @property
+    def is_done(self) -> bool:
+        """Check if all downloads of the batch finished."""
+        return self.succeeded + self.failed == self.total
+
+    def add_downloads(self, count: int) -> None:
+        """Count scheduled downloads, their workers are added once they start."""
+        self.total += count
+        self.emit_progress()
+
+    def add_worker(self, worker: DownloadWorker) -> None:
+        """Add the worker of a started download to the batch."""
+        self.workers.append(worker)
+        worker.finished.connect(lambda: self.on_worker_finished(worker))
+
+    def on_worker_finished(self, worker: DownloadWorker) -> None:
+        """Count the result of a finished download, retried ones finish later."""
+        if worker.retrying:
+            return
+        if worker.successful:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.emit_progress()
+
+    def emit_progress(self) -> None:
+        """Emit the current progress."""
+        self.progress.emit(self.succeeded, self.failed, self.total)
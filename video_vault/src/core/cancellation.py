@@ -0,0 +1,109 @@
+"""Cancellation module.
+
+This module contains the cooperative cancellation of downloads.
+"""
+
+import logging
+import subprocess  # nosec: B404
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadCancelledError(Exception):
+    """Raised inside a download that was cancelled."""
+
+
+class CancelToken:
+    """Flag to cancel a download from another thread.
+
+    The download checks the token in the yt-dlp hooks, which run for every
+    received block, and between encrypted chunks, and stops by raising
+    DownloadCancelledError. Processes started for the download are killed
+    right away, so reading their output does not block.
+    A token is active in the thread of its download while libraries run,
+    so processes they start themselves can be added to it, e.g. yt-dlp's ffmpeg.
+    """
+
+    # the token of the download that runs in a thread, see activate
+    active = threading.local()
+
+    def __init__(self) -> None:
+        """Initialize the token."""
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.processes: set[subprocess.Popen[bytes]] = set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check if the download was cancelled."""
+        return self.event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the download and kill its processes."""
+        with self.lock:
+            self.event.set()
+            processes = list(self.processes)
+        for process in processes:
+            logger.info("Killing process %d of cancelled download", process.pid)
+            process.kill()
+
+    @classmethod
+    def get_active(cls) -> "CancelToken | None":
+        """Get the token that is active in the current thread."""
+        token: CancelToken | None = getattr(cls.active, "token", None)
+        return token
+
+    @contextmanager
+    def activate(self) -> Iterator["CancelToken"]:
+        """Make this the active token of the current thread."""
+        previous = self.get_active()
+        self.active.token = self
+        try:
+            yield self
+        finally:
+            self.active.token = previous
+
+    def raise_if_cancelled(self) -> None:
+        """Raise DownloadCancelledError if the download was cancelled."""
+        if self.is_cancelled:
+            msg = "Download cancelled"
+            raise DownloadCancelledError(msg)
+
+    def check_hook(self, _status: dict[str, Any]) -> None:
+        """Stop yt-dlp if the download was cancelled, used as a yt-dlp hook."""
+        self.raise_if_cancelled()
+
+    def iter_checked[T](self, items: Iterable[T]) -> Iterator[T]:
+        """Yield the items until the download is cancelled."""
+        for item in items:
+            self.raise_if_cancelled()
+            yield item
+
+    @contextmanager
+    def track_process(
+        self, process: subprocess.Popen[bytes]
+    ) -> Iterator[subprocess.Popen[bytes]]:
+        """Kill the process if the download is cancelled while it runs."""
+        self.add_process(process)
+        try:
+            yield process
+        finally:
+            self.discard_process(process)
+
+    def add_process(self, process: subprocess.Popen[bytes]) -> None:
+        """Kill the process when the download is cancelled, now if it already is."""
+        with self.lock:
+            cancelled = self.is_cancelled
+            if not cancelled:
+                self.processes.add(process)
+        if cancelled:
+            process.kill()
+
+    def discard_process(self, process: subprocess.Popen[bytes]) -> None:
+        """Stop tracking a process that ended."""
+        with self.lock:
+            self.processes.discard(process)
@@ -0,0 +1,82 @@
+"""Deletion module.
+
+This module contains the queue that removes the stored files of deleted downloads.
+"""
+
+import logging
+from functools import cache
+
+from django.db.models import QuerySet
+from PySide6.QtCore import QThread, Signal
+
+from video_vault.src.db.connections import closes_connections
+from video_vault.src.db.models import File, PendingDeletion
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionQueue(QThread):
+    """Thread that removes the stored files of deleted downloads.
+
+    Deleting a download only deletes its row and queues the stored file
+    as a PendingDeletion, the file is removed here off the UI thread.
+    Queued files are persisted, so removals continue after a restart.
+    Emits progress with the number of removed and queued files.
+    """
+
+    progress = Signal(int, int)
+
+    BATCH_SIZE = 100
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        super().__init__()
+        self.removed = 0
+        self.total = 0
+        self.finished.connect(self.on_finished)
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "DeletionQueue":
+        """Get the queue shared by the whole app."""
+        return cls()
+
+    def delete(self, queryset: QuerySet[File]) -> int:
+        """Delete files from the database and remove their stored files.
+
+        Returns the number of queued files.
+        """
+        count = PendingDeletion.delete_files(queryset)
+        logger.info("Queued %d files for removal", count)
+        self.total += count
+        self.start()
+        return count
+
+    def resume(self) -> None:
+        """Remove the files that were queued before the app was closed."""
+        count = PendingDeletion.objects.count()
+        if not count:
+            return
+        logger.info("Resuming removal of %d files", count)
+        self.total += count
+        self.start()
+
+    @closes_connections
+    def run(self) -> None:
+        """Remove the queued files, oldest first."""
+        while pending := list(
+            PendingDeletion.objects.order_by("pk")[: self.BATCH_SIZE]
+        ):
+            for deletion in pending:
+                deletion.remove()
+                self.removed += 1
+                self.progress.emit(self.removed, self.total)
+
+    def on_finished(self) -> None:
+        """Start again for files queued while the thread was stopping."""
+        # start does nothing while the thread runs, so these would wait otherwise
+        if PendingDeletion.objects.exists():
+            self.start()
+            return
+        self.removed = 0
+        self.total = 0
@@ -3,57 +3,184 @@
 This module contains functions to add downloads.
 """
 
+import importlib
 import logging
+import os
+import shutil
+import subprocess  # nosec: B404
 import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from functools import cache
 from http.cookiejar import Cookie
 from pathlib import Path
-from typing import ClassVar
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, cast
+from urllib.parse import urlparse
 
-import yt_dlp
-from PySide6.QtCore import QThread
-from winipyside.src.ui.widgets.notification import Notification
-from yt_dlp.utils import DownloadError
+from django.conf import settings
+from PySide6.QtCore import QThread, Signal
 
-from video_vault.src.core.ffmpeg import get_ffmpeg_path
-from video_vault.src.db.models import File
+from video_vault.src.core.bandwidth import (
+    BandwidthGovernor,
+    BandwidthLimiter,
+    LimitedReader,
+)
+from video_vault.src.core.cancellation import CancelToken, DownloadCancelledError
+from video_vault.src.core.ffmpeg import get_ffmpeg_path, get_ffmpeg_tools, is_mp4_codec
+from video_vault.src.core.imports import lazy_import
+from video_vault.src.core.progress import (
+    DownloadProgress,
+    ProgressReader,
+    ProgressThrottle,
+    Stage,
+)
+from video_vault.src.db.connections import closes_connections
+from video_vault.src.db.models import DownloadJob, File, NetworkSettings
+
+# yt-dlp and the notification widget are only needed once a download starts
+if TYPE_CHECKING:
+    import yt_dlp
+    from winipyside.src.ui.widgets import notification as notification_widget
+else:
+    yt_dlp = lazy_import("yt_dlp")
+    notification_widget = lazy_import("winipyside.src.ui.widgets.notification")
 
 logger = logging.getLogger(__name__)
 
+# modules of yt-dlp that start processes with its Popen class, e.g. ffmpeg to merge
+YT_DLP_PROCESS_MODULES = (
+    "yt_dlp.postprocessor.ffmpeg",
+    "yt_dlp.downloader.external",
+    "yt_dlp.downloader.rtmp",
+)
+
+# protocols ffmpeg can read directly, everything else goes through yt-dlp
+STREAMABLE_PROTOCOLS = frozenset({"http", "https", "m3u8", "m3u8_native"})
+# ffmpeg fetches HLS fragments one at a time, yt-dlp can fetch them concurrently
+HLS_PROTOCOLS = frozenset({"m3u8", "m3u8_native"})
+STREAMABLE_EXTS = frozenset({"mp4", "m4a"})
+
+STAGING_DIR_NAME = "staging"
+
+# only the end of the ffmpeg log is kept for the error message
+ERROR_TAIL_BYTES = 4096
+
+
+class Conversion(StrEnum):
+    """How a download is converted to mp4 after downloading."""
+
+    NONE = "none"
+    REMUX = "remux"
+    TRANSCODE = "transcode"
+
 
 class DownloadWorker(QThread):
-    """Worker to download a video."""
+    """Worker to download a video.
 
-    ALL_WORKERS: ClassVar[list["DownloadWorker"]] = []
+    Workers are started by the DownloadScheduler, which also keeps them alive.
+    The state of the download is persisted in its DownloadJob.
+    Workers of a batch do not notify, the batch shows their progress instead.
+    Emits progress with the job id and the DownloadProgress, throttled to
+    PROGRESS_INTERVAL_S per stage.
+    A worker can be cancelled from any thread, in every stage of the download.
+    If a download fails and its job has attempts left, the worker is retrying
+    and the scheduler starts it again, it resumes from the same staging dir.
+    Its download speed is limited by the BandwidthGovernor.
+    """
 
-    def __init__(self, url: str, cookies: list[Cookie]) -> None:
+    progress = Signal(int, object)
+
+    def __init__(
+        self, job: DownloadJob, cookies: list[Cookie], *, notify: bool = True
+    ) -> None:
         """Initialize the worker."""
         super().__init__()
-        self.ALL_WORKERS.append(self)  # must be inplace
-        self.url = url
+        self.job = job
+        self.url = job.url
+        self.host = urlparse(self.url).hostname or ""
         self.cookies = cookies
+        self.notify = notify
+        self.throttle = ProgressThrottle(self.emit_progress)
+        self.cancel_token = CancelToken()
+        # the result until the download finished
+        self.name = self.url
+        self.successful = False
+        self.retrying = False
+        self.cancelled = False
+        self.error: Exception | None = None
         self.finished.connect(self.on_finished)
 
+    @closes_connections
     def run(self) -> None:
         """Run the worker."""
+        self.retrying = False
         try:
-            self.file = add_download(self.url, self.cookies)
+            # queued workers are started right away when they are cancelled
+            self.cancel_token.raise_if_cancelled()
+            self.job.mark_running()
+            with BandwidthGovernor.get_instance().limit(
+                self.job.pk, self.job.rate_limit, self.cancel_token
+            ) as limiter:
+                self.file = add_download(
+                    self.url,
+                    self.cookies,
+                    on_state=self.job.set_state,
+                    on_conversion=self.job.set_conversion,
+                    staging_dir=get_staging_dir(self.job.pk),
+                    on_progress=self.throttle,
+                    cancel_token=self.cancel_token,
+                    limiter=limiter,
+                )
             self.name = self.file.display_name
             self.successful = True
             self.error = None
-        except DownloadError as e:
+            self.job.mark_done(self.file)
+        except DownloadCancelledError as e:
+            logger.info("Cancelled download: %s", self.url)
             self.name = self.url
             self.successful = False
+            self.cancelled = True
             self.error = e
+            self.job.mark_cancelled()
+            shutil.rmtree(get_staging_dir(self.job.pk), ignore_errors=True)
+        except yt_dlp.utils.DownloadError as e:
+            self.name = self.url
+            self.successful = False
+            self.error = e
+            # e.g. a flaky connection, the staging dir is kept for the retry
+            self.retrying = self.job.can_retry()
+            if self.retrying:
+                logger.warning("Retrying download %s after: %s", self.url, e)
+                self.job.mark_retrying(str(e))
+            else:
+                self.job.mark_failed(str(e))
+        except Exception as e:
+            # any other error must not leave the job running
+            logger.exception("Download failed: %s", self.url)
+            self.name = self.url
+            self.successful = False
+            self.error = e
+            self.job.mark_failed(f"{type(e).__name__}: {e}")
+
+    def cancel(self) -> None:
+        """Cancel the download, the worker finishes as soon as it noticed."""
+        self.cancel_token.cancel()
+
+    def emit_progress(self, progress: DownloadProgress) -> None:
+        """Emit the progress of the download, called on the worker thread."""
+        self.progress.emit(self.job.pk, progress)
 
     def on_finished(self) -> None:
         """Handle the result of the download."""
-        self.show_notification()
-        self.ALL_WORKERS.remove(self)
+        # the user cancelled the download or it is retried, nothing to report yet
+        if self.notify and not self.cancelled and not self.retrying:
+            self.show_notification()
         self.update_downloads_page()
 
     def show_notification(self) -> None:
         """Show a popup with the result of the download."""
-        notification = Notification(
+        notification = notification_widget.Notification(
             title=(
                 f"Download {'succeeded' if self.successful else 'failed'}: {self.name}"
             ),
@@ -71,45 +198,423 @@ class DownloadWorker(QThread):
             return
 
         downloads_page = DownloadsPage.get_page_static(DownloadsPage)
-        downloads_page.add_download_button(self.file)
+        # duplicates return a file that is already listed, the model skips them
+        downloads_page.add_download(self.file)
 
 
-def add_download(url: str, cookies: list[Cookie]) -> File:
-    """Add a download."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        path = do_download(tempdir, url, cookies)
-        return save_download(path)
+def add_download(  # noqa: PLR0913
+    url: str,
+    cookies: list[Cookie],
+    on_state: Callable[[DownloadJob.State], None] | None = None,
+    on_conversion: Callable[[Conversion], None] | None = None,
+    staging_dir: Path | None = None,
+    on_progress: Callable[[DownloadProgress], None] | None = None,
+    cancel_token: CancelToken | None = None,
+    limiter: BandwidthLimiter | None = None,
+) -> File:
+    """Add a download.
 
+    If the video was downloaded before, the existing file is returned
+    before any bytes are fetched.
+    If ffmpeg can read the formats directly, the video is encrypted while it is
+    downloaded and never written to disk unencrypted.
+    Otherwise yt-dlp downloads it into the staging dir first,
+    or into a temporary directory if no staging dir is given.
+    on_state is called when the download enters a new DownloadJob state.
+    on_conversion is called with the conversion the download gets.
+    on_progress is called with the progress of every stage, as often as
+    yt-dlp reports it, so it should be throttled.
+    Cancelling the cancel token raises DownloadCancelledError in any stage
+    and removes the partial files.
+    The limiter limits the download speed, without one it is unlimited.
+    """
+    cancel_token = cancel_token or CancelToken()
+    info = extract_download_info(url, cookies)
+    cancel_token.raise_if_cancelled()
+    source_fields = get_source_fields(info)
+    existing = File.get_by_source(**source_fields)
+    if existing is not None:
+        logger.info("Skipping download of existing video: %s", url)
+        return existing
+    if on_conversion is not None:
+        on_conversion(get_conversion(info))
+    if can_stream_download(info):
+        file = stream_download(
+            info,
+            cookies,
+            on_progress=on_progress,
+            cancel_token=cancel_token,
+            limiter=limiter,
+        )
+    else:
+        with open_staging_dir(staging_dir) as tempdir:
+            path = do_download(
+                tempdir,
+                info,
+                cookies,
+                on_state=on_state,
+                on_progress=on_progress,
+                cancel_token=cancel_token,
+                limiter=limiter,
+            )
+            if on_state is not None:
+                on_state(DownloadJob.State.ENCRYPTING)
+            if on_progress is not None:
+                on_progress(DownloadProgress(Stage.ENCRYPT))
+            file = save_download(path, cancel_token=cancel_token, **source_fields)
+    if on_progress is not None:
+        on_progress(DownloadProgress(Stage.SAVE))
+    return deduplicate_download(file)
 
-def do_download(tempdir: str, url: str, cookies: list[Cookie]) -> Path:
-    """Add a download."""
-    logger.info("Adding download: %s", url)
 
-    # make ydl options so we don not write to file
-    ffmpeg_path = get_ffmpeg_path()
-    ydl_opts = {
-        "paths": {"home": tempdir},
+def get_source_fields(info: dict[str, Any]) -> dict[str, str]:
+    """Get the File fields that identify where a video came from."""
+    return {
+        "extractor_key": info.get("extractor_key") or "",
+        "video_id": str(info.get("id") or ""),
+        "webpage_url": info.get("webpage_url") or "",
+    }
+
+
+def deduplicate_download(file: File) -> File:
+    """Keep only the older file if the same content was downloaded before.
+
+    Catches the same video arriving from a different url.
+    """
+    duplicate = file.get_duplicate()
+    if duplicate is None:
+        return file
+    logger.info("Removing duplicate of %s", duplicate.display_name)
+    file.delete_file()
+    return duplicate
+
+
+def get_staging_root() -> Path:
+    """Get the directory that contains the staging dirs of all jobs."""
+    return Path(settings.MEDIA_ROOT).parent / STAGING_DIR_NAME
+
+
+def get_staging_dir(job_id: int) -> Path:
+    """Get the stable staging dir of a job.
+
+    yt-dlp keeps its .part files there, so a retry of the job resumes them.
+    """
+    return get_staging_root() / str(job_id)
+
+
+@contextmanager
+def open_staging_dir(staging_dir: Path | None) -> Iterator[str]:
+    """Yield the directory to download into.
+
+    A given staging dir is kept if the download fails, so a retry can resume
+    the partial files, and it is removed once the download is saved
+    or cancelled. Without a staging dir a temporary directory is used.
+    """
+    if staging_dir is None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            yield tempdir
+        return
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        yield str(staging_dir)
+    except DownloadCancelledError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def clean_staging_dirs(keep_job_ids: Iterable[int]) -> None:
+    """Remove stale staging dirs of jobs that will not be resumed."""
+    staging_root = get_staging_root()
+    if not staging_root.exists():
+        return
+    keep_names = {str(job_id) for job_id in keep_job_ids}
+    for staging_dir in staging_root.iterdir():
+        if staging_dir.name not in keep_names:
+            logger.info("Removing stale staging dir %s", staging_dir)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def get_ydl_opts(cookies: list[Cookie]) -> dict[str, Any]:
+    """Get the yt-dlp options shared by all download modes."""
+    return {
         "cookies": cookies,
-        "ffmpeg_location": str(ffmpeg_path) if ffmpeg_path is not None else None,
+        # resume .part files of an earlier attempt in the same staging dir
+        "continuedl": True,
+        "nopart": False,
+        "ffmpeg_location": str(get_ffmpeg_path()),
         "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]",
         "merge_output_format": "mp4",
-        "postprocessors": [
-            {
-                "key": "FFmpegVideoConvertor",
-                "preferedformat": "mp4",
-            }
-        ],
     }
+
+
+def extract_download_info(url: str, cookies: list[Cookie]) -> dict[str, Any]:
+    """Extract the info of a video with the selected formats without downloading."""
+    logger.info("Extracting info: %s", url)
+    try:
+        with yt_dlp.YoutubeDL(get_ydl_opts(cookies)) as ydl:  # type: ignore[arg-type]
+            info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        msg = f"Download failed: {e}"
+        raise yt_dlp.utils.DownloadError(msg) from e
+    return dict(info)
+
+
+def can_stream_download(info: dict[str, Any]) -> bool:
+    """Check if ffmpeg can read and mux the selected formats directly.
+
+    HLS is only streamed if the NetworkSettings of the host fetch one fragment
+    at a time, otherwise yt-dlp downloads the fragments concurrently.
+    """
+    formats = info.get("requested_formats") or [info]
+    if not get_ffmpeg_tools().supports_fragmented_mp4:
+        return False
+    streamable = get_conversion(info) != Conversion.TRANSCODE and all(
+        fmt.get("url")
+        and fmt.get("protocol") in STREAMABLE_PROTOCOLS
+        and fmt.get("ext") in STREAMABLE_EXTS
+        for fmt in formats
+    )
+    if not streamable:
+        return False
+    if any(fmt.get("protocol") in HLS_PROTOCOLS for fmt in formats):
+        return get_network_opts(info)["concurrent_fragment_downloads"] <= 1
+    return True
+
+
+def get_network_opts(info: dict[str, Any]) -> dict[str, int]:
+    """Get the yt-dlp network options from the NetworkSettings of a video's host."""
+    webpage_url = info.get("webpage_url") or ""
+    return NetworkSettings.get_ydl_opts(urlparse(webpage_url).hostname or "")
+
+
+def get_conversion(info: dict[str, Any]) -> Conversion:
+    """Get the cheapest conversion that makes the selected formats a playable mp4.
+
+    Merged formats are already muxed into mp4 by yt-dlp,
+    so only the codecs decide if a transcode is needed.
+    If yt-dlp does not know a codec, the container extension is trusted.
+    """
+    formats = info.get("requested_formats") or [info]
+    for fmt in formats:
+        codecs = [fmt.get("vcodec"), fmt.get("acodec")]
+        for codec in codecs:
+            if codec == "none":
+                continue
+            if codec is None:
+                if fmt.get("ext") not in STREAMABLE_EXTS:
+                    return Conversion.TRANSCODE
+            elif not is_mp4_codec(codec):
+                return Conversion.TRANSCODE
+    if len(formats) == 1 and formats[0].get("ext") != "mp4":
+        return Conversion.REMUX
+    return Conversion.NONE
+
+
+def get_postprocessors(conversion: Conversion) -> list[dict[str, Any]]:
+    """Get the yt-dlp postprocessors for a conversion."""
+    if conversion == Conversion.REMUX:
+        return [{"key": "FFmpegVideoRemuxer", "preferedformat": "mp4"}]
+    if conversion == Conversion.TRANSCODE:
+        return [{"key": "FFmpegVideoConvertor", "preferedformat": "mp4"}]
+    return []
+
+
+def get_stream_ffmpeg_args(info: dict[str, Any], ydl: "yt_dlp.YoutubeDL") -> list[str]:
+    """Get the ffmpeg args to mux the selected formats to stdout.
+
+    The output is a fragmented MP4, because a normal MP4 needs
+    a seekable output to write the index at the end.
+    """
+    formats = info.get("requested_formats") or [info]
+    args = [str(get_ffmpeg_path()), "-hide_banner", "-nostats", "-loglevel", "error"]
+    for fmt in formats:
+        headers = dict(fmt.get("http_headers") or {})
+        cookie_header = ydl.cookiejar.get_cookie_header(fmt["url"])
+        if cookie_header:
+            headers["Cookie"] = cookie_header
+        if headers:
+            header_lines = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            args += ["-headers", header_lines]
+        args += ["-i", fmt["url"]]
+    for i, fmt in enumerate(formats):
+        if fmt.get("vcodec") != "none":
+            args += ["-map", f"{i}:v:0?"]
+        if fmt.get("acodec") != "none":
+            args += ["-map", f"{i}:a:0?"]
+    args += [
+        "-c",
+        "copy",
+        "-movflags",
+        "frag_keyframe+empty_moov+default_base_moof",
+        "-f",
+        "mp4",
+        "pipe:1",
+    ]
+    return args
+
+
+def stream_download(
+    info: dict[str, Any],
+    cookies: list[Cookie],
+    on_progress: Callable[[DownloadProgress], None] | None = None,
+    cancel_token: CancelToken | None = None,
+    limiter: BandwidthLimiter | None = None,
+) -> File:
+    """Download a video and encrypt it while it is downloaded.
+
+    ffmpeg muxes the selected formats to stdout and the output is encrypted
+    chunk by chunk straight into the storage, so the same bytes are written
+    to disk only once and never unencrypted.
+    on_progress is called with the bytes read from ffmpeg.
+    Cancelling the cancel token kills ffmpeg and removes the partial file.
+    The limiter slows down reading from ffmpeg, which slows down its download.
+    """
+    cancel_token = cancel_token or CancelToken()
+    logger.info("Streaming download: %s", info.get("webpage_url"))
+    with yt_dlp.YoutubeDL(get_ydl_opts(cookies)) as ydl:  # type: ignore[arg-type]
+        filename = ydl.prepare_filename(info)  # type: ignore[arg-type]
+        name = Path(filename).with_suffix(".mp4").name
+        args = get_stream_ffmpeg_args(info, ydl)
+
+    # the log goes to a file, a full stderr pipe would block ffmpeg
+    # while only stdout is read
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(  # noqa: S603  # nosec: B603
+            args, stdout=subprocess.PIPE, stderr=stderr
+        )
+        stdout = cast("BinaryIO", process.stdout)
+        if limiter is not None:
+            stdout = cast("BinaryIO", LimitedReader(stdout, limiter))
+        if on_progress is not None:
+            stdout = cast(
+                "BinaryIO", ProgressReader(stdout, Stage.DOWNLOAD, on_progress)
+            )
+        try:
+            with cancel_token.track_process(process):
+                file = File.create_encrypted_from_stream(
+                    stdout, name, cancel_token, **get_source_fields(info)
+                )
+        except Exception:
+            process.kill()
+            process.communicate()
+            raise
+        process.communicate()
+        # a killed ffmpeg ends the stream early, which looks like the end of the video
+        if cancel_token.is_cancelled:
+            file.delete_file()
+            cancel_token.raise_if_cancelled()
+        if process.returncode != 0:
+            file.delete_file()
+            msg = f"Download failed: {read_tail(stderr)}"
+            raise yt_dlp.utils.DownloadError(msg)
+    return file
+
+
+def read_tail(file: IO[bytes], size: int = ERROR_TAIL_BYTES) -> str:
+    """Read the last bytes of a file as text, e.g. the end of a log."""
+    file.seek(0, os.SEEK_END)
+    file.seek(max(file.tell() - size, 0))
+    return file.read().decode(errors="replace").strip()
+
+
+@cache
+def track_yt_dlp_processes() -> None:
+    """Make the processes yt-dlp starts itself killable by cancelling.
+
+    yt-dlp runs ffmpeg with its own Popen class to merge and convert formats.
+    Its modules get a subclass that adds each process to the CancelToken that is
+    active in the starting thread, so cancelling kills it right away instead of
+    waiting for the next hook. Called once before the first download.
+    """
+    base_cls = yt_dlp.utils.Popen
+
+    class TrackedPopen(base_cls):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.cancel_token = CancelToken.get_active()
+            if self.cancel_token is not None:
+                self.cancel_token.add_process(self)
+
+        def __exit__(self, *args: object) -> None:
+            if self.cancel_token is not None:
+                self.cancel_token.discard_process(self)
+            super().__exit__(*args)
+
+    for name in YT_DLP_PROCESS_MODULES:
+        importlib.import_module(name).Popen = TrackedPopen  # type: ignore[attr-defined]
+
+
+def do_download(  # noqa: PLR0913
+    tempdir: str,
+    info: dict[str, Any],
+    cookies: list[Cookie],
+    on_state: Callable[[DownloadJob.State], None] | None = None,
+    on_progress: Callable[[DownloadProgress], None] | None = None,
+    cancel_token: CancelToken | None = None,
+    limiter: BandwidthLimiter | None = None,
+) -> Path:
+    """Download a video into a directory with yt-dlp.
+
+    The network options come from the NetworkSettings of the video's host.
+    on_state is called with the postprocessing state once yt-dlp starts
+    merging or converting the downloaded formats.
+    on_progress is called from the yt-dlp progress and postprocessor hooks.
+    The cancel token is checked in the same hooks, so yt-dlp stops
+    after the current block or before the next postprocessor,
+    and it kills the ffmpeg processes yt-dlp starts, e.g. while merging.
+    The limiter waits in the progress hook until a block fits into its rate.
+    """
+    cancel_token = cancel_token or CancelToken()
+    conversion = get_conversion(info)
+    webpage_url = info.get("webpage_url") or ""
+    logger.info("Adding download with conversion %s: %s", conversion, webpage_url)
+
+    ydl_opts = get_ydl_opts(cookies)
+    ydl_opts.update(get_network_opts(info))
+    ydl_opts["paths"] = {"home": tempdir}
+    ydl_opts["postprocessors"] = get_postprocessors(conversion)
+    ydl_opts["progress_hooks"] = [cancel_token.check_hook]
+    ydl_opts["postprocessor_hooks"] = [cancel_token.check_hook]
+    if limiter is not None:
+        ydl_opts["progress_hooks"].append(limiter.progress_hook)
+    if on_state is not None:
+        ydl_opts["postprocessor_hooks"].append(
+            lambda _: on_state(DownloadJob.State.POSTPROCESSING)
+        )
+    if on_progress is not None:
+        ydl_opts["progress_hooks"].append(
+            lambda status: on_progress(DownloadProgress.from_progress_hook(status))
+        )
+        ydl_opts["postprocessor_hooks"].append(
+            lambda status: on_progress(DownloadProgress.from_postprocessor_hook(status))
+        )
+    track_yt_dlp_processes()
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore[arg-type]
-            info = ydl.extract_info(url, download=True)
+        with (
+            cancel_token.activate(),
+            yt_dlp.YoutubeDL(ydl_opts) as ydl,  # type: ignore[arg-type]
+        ):
+            info = ydl.process_ie_result(  # type: ignore[assignment]
+                info,  # type: ignore[arg-type]
+                download=True,
+            )
+    except DownloadCancelledError:
+        raise
     except Exception as e:
+        # e.g. yt-dlp reports the killed ffmpeg as a failed postprocessor
+        cancel_token.raise_if_cancelled()
         msg = f"Download failed: {e}"
-        raise DownloadError(msg) from e
+        raise yt_dlp.utils.DownloadError(msg) from e
 
-    return Path(ydl.prepare_filename(info))
+    # postprocessors can change the extension, yt-dlp knows the final path
+    requested_downloads = info.get("requested_downloads") or [{}]
+    filepath = requested_downloads[-1].get("filepath")
+    return Path(filepath or ydl.prepare_filename(info))  # type: ignore[arg-type]
 
 
-def save_download(path: Path) -> File:
+def save_download(
+    path: Path, cancel_token: CancelToken | None = None, **kwargs: Any
+) -> File:
     """Save a download encryped to disk."""
-    return File.create_encrypted(path)
+    return File.create_encrypted(path, cancel_token, **kwargs)
@@ -0,0 +1,169 @@
+"""Encryption module.
+
+This module contains functions to encrypt files chunk by chunk,
+so videos never have to be loaded into memory completely.
+The output has the same chunked format as EncryptedPyQFile,
+so it can be played back by the player without any conversion.
+"""
+
+import hashlib
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import batched
+from pathlib import Path
+from typing import BinaryIO
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from django.core.files.base import File
+from winipyside.src.core.py_qiodevice import EncryptedPyQFile
+
+from video_vault.src.core.cancellation import CancelToken
+
+PLAINTEXT_CHUNK_SIZE = EncryptedPyQFile.CIPHER_SIZE
+
+# chunks per task, a single 64KB chunk is too small to be worth a thread switch
+CHUNKS_PER_BATCH = 16
+
+
+def iter_chunks(
+    stream: BinaryIO, chunk_size: int = PLAINTEXT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield fixed-size chunks from a binary stream.
+
+    Short reads (e.g. from pipes) are filled up, so every chunk
+    except the last one has exactly chunk_size bytes.
+    The chunked format relies on that to map positions.
+    """
+    while chunk := stream.read(chunk_size):
+        while len(chunk) < chunk_size:
+            rest = stream.read(chunk_size - len(chunk))
+            if not rest:
+                break
+            chunk += rest
+        yield chunk
+
+
+def encrypt_chunks(
+    chunks: Iterable[bytes], aes_gcm: AESGCM, max_workers: int | None = None
+) -> Iterator[bytes]:
+    """Encrypt plaintext chunks in parallel and yield them in order.
+
+    AES-GCM releases the GIL, so batches of chunks are encrypted on a thread pool
+    sized to the machine. At most two batches per worker are in flight,
+    which keeps memory bounded no matter how big the input is.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[Future[list[bytes]]] = deque()
+        for batch in batched(chunks, CHUNKS_PER_BATCH):
+            pending.append(executor.submit(encrypt_chunk_batch, batch, aes_gcm))
+            if len(pending) >= max_workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def encrypt_chunk_batch(batch: Iterable[bytes], aes_gcm: AESGCM) -> list[bytes]:
+    """Encrypt a batch of plaintext chunks."""
+    return [EncryptedPyQFile.encrypt_chunk_static(chunk, aes_gcm) for chunk in batch]
+
+
+def hash_chunks(chunks: Iterable[bytes], sha256: "hashlib._Hash") -> Iterator[bytes]:
+    """Yield the chunks and update the hash with them."""
+    for chunk in chunks:
+        sha256.update(chunk)
+        yield chunk
+
+
+def get_encrypted_size(size: int) -> int:
+    """Get the size of the encrypted data for a plaintext size."""
+    num_chunks = -(-size // PLAINTEXT_CHUNK_SIZE)
+    return size + num_chunks * EncryptedPyQFile.CHUNK_OVERHEAD
+
+
+class EncryptedFile(File):  # type: ignore[type-arg]
+    """Django file that encrypts plaintext while it is saved.
+
+    The SHA-256 of the plaintext is computed on the way,
+    so duplicates can be found without reading the file again.
+    A cancel token stops the encryption between two chunks.
+    """
+
+    def __init__(
+        self, name: str, aes_gcm: AESGCM, cancel_token: CancelToken | None = None
+    ) -> None:
+        """Initialize the file."""
+        super().__init__(None, name=name)
+        self.aes_gcm = aes_gcm
+        self.cancel_token = cancel_token or CancelToken()
+        self.sha256 = hashlib.sha256()
+        self.encrypted_size = 0
+
+    def encrypt(self, stream: BinaryIO) -> Iterator[bytes]:
+        """Yield the encrypted chunks of a plaintext stream."""
+        self.sha256 = hashlib.sha256()
+        self.encrypted_size = 0
+        chunks = self.cancel_token.iter_checked(iter_chunks(stream))
+        for chunk in encrypt_chunks(hash_chunks(chunks, self.sha256), self.aes_gcm):
+            self.encrypted_size += len(chunk)
+            yield chunk
+
+    def multiple_chunks(self, chunk_size: int | None = None) -> bool:  # noqa: ARG002
+        """Always stream the file in multiple chunks."""
+        return True
+
+
+class StreamEncryptedFile(EncryptedFile):
+    """Django file that encrypts a plaintext stream while it is saved.
+
+    The stream is read once, so the size is not known in advance.
+    Used to encrypt the output of a process without writing it to disk.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        name: str,
+        aes_gcm: AESGCM,
+        cancel_token: CancelToken | None = None,
+    ) -> None:
+        """Initialize the file."""
+        super().__init__(name, aes_gcm, cancel_token)
+        self.stream = stream
+
+    def chunks(self, chunk_size: int | None = None) -> Iterator[bytes]:  # noqa: ARG002
+        """Yield the encrypted chunks.
+
+        The chunk size is given by the encrypted format, so chunk_size is ignored.
+        """
+        yield from self.encrypt(self.stream)
+
+
+class ChunkEncryptedFile(EncryptedFile):
+    """Django file that encrypts a plaintext file while it is saved.
+
+    Django storages write files via chunks(), so only one chunk
+    of the video is in memory at a time.
+    """
+
+    def __init__(
+        self, path: Path, aes_gcm: AESGCM, cancel_token: CancelToken | None = None
+    ) -> None:
+        """Initialize the file."""
+        super().__init__(path.name, aes_gcm, cancel_token)
+        self.path = path
+
+    @property
+    def size(self) -> int:
+        """Get the encrypted size."""
+        return get_encrypted_size(self.path.stat().st_size)
+
+    def chunks(self, chunk_size: int | None = None) -> Iterator[bytes]:  # noqa: ARG002
+        """Yield the encrypted chunks.
+
+        The chunk size is given by the encrypted format, so chunk_size is ignored.
+        """
+        with self.path.open("rb") as stream:
+            yield from self.encrypt(stream)
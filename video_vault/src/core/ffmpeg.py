@@ -1,15 +1,189 @@
 """module to interact with ffmpeg."""
 
 import logging
+import shutil
+import subprocess  # nosec: B404
+import threading
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import imageio_ffmpeg  # type: ignore[import-untyped]
+from video_vault.src.core.imports import lazy_import
+
+if TYPE_CHECKING:
+    import imageio_ffmpeg  # type: ignore[import-untyped]
+else:
+    imageio_ffmpeg = lazy_import("imageio_ffmpeg")
 
 logger = logging.getLogger(__name__)
 
+# codec prefixes as reported by yt-dlp that can be stored in an mp4 container
+MP4_CODEC_PREFIXES = (
+    # video
+    "avc1",
+    "avc3",
+    "h264",
+    "hev1",
+    "hvc1",
+    "h265",
+    "av01",
+    "vp09",
+    "mp4v",
+    # audio
+    "mp4a",
+    "aac",
+    "mp3",
+    "opus",
+    "ac-3",
+    "ec-3",
+    "alac",
+    "flac",
+)
+
+
+# mp4 muxer flags needed to write a fragmented mp4 to a pipe
+FRAGMENTED_MP4_FLAGS = frozenset({"frag_keyframe", "empty_moov", "default_base_moof"})
+
+PROBE_TIMEOUT_S = 30
+
+# download threads ask for the tools at the same time, only one probes
+FFMPEG_TOOLS_LOCK = threading.Lock()
+
+
+class FFmpegTools:
+    """The resolved ffmpeg binaries and what they can do."""
+
+    __slots__ = ("encoders", "ffmpeg", "ffprobe", "mp4_flags", "version")
+
+    def __init__(
+        self,
+        ffmpeg: Path,
+        ffprobe: Path | None,
+        version: str,
+        encoders: frozenset[str],
+        mp4_flags: frozenset[str],
+    ) -> None:
+        """Initialize the tools."""
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+        self.version = version
+        self.encoders = encoders
+        self.mp4_flags = mp4_flags
+
+    @property
+    def supports_faststart(self) -> bool:
+        """Check if the mp4 muxer can move the index to the start of the file."""
+        return "faststart" in self.mp4_flags
+
+    @property
+    def supports_fragmented_mp4(self) -> bool:
+        """Check if the mp4 muxer can write a fragmented mp4."""
+        return FRAGMENTED_MP4_FLAGS.issubset(self.mp4_flags)
+
+    def has_encoder(self, name: str) -> bool:
+        """Check if ffmpeg was built with an encoder."""
+        return name in self.encoders
+
+
+def get_ffmpeg_tools() -> FFmpegTools:
+    """Get the ffmpeg tools, resolved and probed once per process."""
+    with FFMPEG_TOOLS_LOCK:
+        return probe_ffmpeg_tools()
+
 
-def get_ffmpeg_path() -> Path | None:
+@cache
+def probe_ffmpeg_tools() -> FFmpegTools:
+    """Resolve and probe the ffmpeg tools, called under FFMPEG_TOOLS_LOCK.
+
+    A working ffmpeg on the PATH is preferred over the one bundled with
+    imageio-ffmpeg, which has no ffprobe.
+    If the bundled ffmpeg does not run either, it is used without
+    capabilities, so downloads do not stream and fail in yt-dlp instead.
+    """
+    ffmpeg = find_ffmpeg()
+    ffprobe = shutil.which("ffprobe", path=str(ffmpeg.parent)) or shutil.which(
+        "ffprobe"
+    )
+    try:
+        version = get_ffmpeg_version(ffmpeg)
+        encoders = get_ffmpeg_encoders(ffmpeg)
+        mp4_flags = get_mp4_muxer_flags(ffmpeg)
+    except (OSError, subprocess.SubprocessError):
+        logger.exception("Failed to probe ffmpeg at %s", ffmpeg)
+        version, encoders, mp4_flags = "", frozenset(), frozenset()
+    tools = FFmpegTools(
+        ffmpeg=ffmpeg,
+        ffprobe=Path(ffprobe) if ffprobe else None,
+        version=version,
+        encoders=encoders,
+        mp4_flags=mp4_flags,
+    )
+    logger.info(
+        "Found ffmpeg %s at %s (ffprobe: %s, faststart: %s, fragmented mp4: %s)",
+        tools.version,
+        tools.ffmpeg,
+        tools.ffprobe,
+        tools.supports_faststart,
+        tools.supports_fragmented_mp4,
+    )
+    return tools
+
+
+def find_ffmpeg() -> Path:
+    """Find an ffmpeg that runs, the system one first."""
+    system_ffmpeg = shutil.which("ffmpeg")
+    if system_ffmpeg is not None:
+        try:
+            get_ffmpeg_version(Path(system_ffmpeg))
+        except (OSError, subprocess.SubprocessError):
+            logger.exception("System ffmpeg at %s does not run", system_ffmpeg)
+        else:
+            return Path(system_ffmpeg)
+    return Path(imageio_ffmpeg.get_ffmpeg_exe())
+
+
+def run_ffmpeg(ffmpeg: Path, *args: str) -> str:
+    """Run ffmpeg with args and return its output."""
+    return subprocess.run(  # noqa: S603  # nosec: B603
+        [str(ffmpeg), "-hide_banner", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=PROBE_TIMEOUT_S,
+    ).stdout
+
+
+def get_ffmpeg_version(ffmpeg: Path) -> str:
+    """Get the version of ffmpeg, e.g. 7.0.2-static."""
+    # the first line is "ffmpeg version <version> Copyright ..."
+    words = run_ffmpeg(ffmpeg, "-version").split()
+    return words[2] if len(words) > 2 else ""  # noqa: PLR2004
+
+
+def get_ffmpeg_encoders(ffmpeg: Path) -> frozenset[str]:
+    """Get the names of the encoders ffmpeg was built with."""
+    # encoders are listed after a "------" line as "<flags> <name> <description>"
+    _, _, listing = run_ffmpeg(ffmpeg, "-encoders").partition("------")
+    return frozenset(
+        words[1] for line in listing.splitlines() if len(words := line.split()) > 1
+    )
+
+
+def get_mp4_muxer_flags(ffmpeg: Path) -> frozenset[str]:
+    """Get the names of the options and flags of the mp4 muxer."""
+    # after the "AVOptions:" header options are listed as "-<name> ..."
+    # and their flags below them as "<name> ..."
+    _, _, listing = run_ffmpeg(ffmpeg, "-h", "muxer=mp4").partition("AVOptions:")
+    return frozenset(
+        words[0].lstrip("-") for line in listing.splitlines() if (words := line.split())
+    )
+
+
+def get_ffmpeg_path() -> Path:
     """Get the path to ffmpeg."""
-    path = Path(imageio_ffmpeg.get_ffmpeg_exe())
-    logger.info("Found ffmpeg at %s", path)
-    return path
+    return get_ffmpeg_tools().ffmpeg
+
+
+def is_mp4_codec(codec: str) -> bool:
+    """Check if a codec can be stored in an mp4 container without transcoding."""
+    return codec.lower().startswith(MP4_CODEC_PREFIXES)
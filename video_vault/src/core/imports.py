@@ -0,0 +1,26 @@
+"""Imports module.
+
+This module contains helpers to import heavy dependencies when they are first used.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Module that is imported on the first access of one of its attributes.
+
+    Importing a heavy dependency at the top of a module delays the start of the app,
+    even if the dependency is only needed later, e.g. when a download starts.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """Import the module and get the attribute from it."""
+        # the import system caches the module and locks while importing
+        return getattr(importlib.import_module(self.__name__), name)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Get a module that is imported on first use."""
+    return LazyModule(name)
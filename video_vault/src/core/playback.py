@@ -0,0 +1,104 @@
+"""Playback module.
+
+This module contains the checkpoints of the playback positions.
+"""
+
+import logging
+import threading
+from functools import cache
+from typing import TYPE_CHECKING
+
+from django.db import DatabaseError, connection
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
+from video_vault.src.db.models import File
+from video_vault.src.db.writer import get_writer
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class PositionCheckpoints(QObject):
+    """Checkpoints of the playback positions of files.
+
+    Positions are recorded in memory as often as they are sampled and
+    written in one bulk update on the writer thread every FLUSH_INTERVAL_MS.
+    Scrubbing does not cause a write per change, and a crash loses at most
+    the last interval. The last positions are written when the app quits.
+    Files whose write failed are pending again, so the next flush retries them.
+    """
+
+    FLUSH_INTERVAL_MS = 10_000
+
+    def __init__(self) -> None:
+        """Initialize the checkpoints."""
+        super().__init__()
+        # positions recorded in this session, by file id
+        self.positions: dict[int, int] = {}
+        # ids of the files whose position was not written yet,
+        # guarded by the lock, a failed write on the writer thread adds them again
+        self.lock = threading.Lock()
+        self.dirty: set[int] = set()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.on_about_to_quit)
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "PositionCheckpoints":
+        """Get the checkpoints shared by the whole app."""
+        return cls()
+
+    def record(self, file_id: int, position: int) -> None:
+        """Record the position of a file, it is written with the next flush."""
+        if self.positions.get(file_id) == position:
+            return
+        self.positions[file_id] = position
+        with self.lock:
+            self.dirty.add(file_id)
+
+    def get_position(self, file_id: int, default: int) -> int:
+        """Get the last recorded position of a file.
+
+        The recorded position can be newer than the one in the database.
+        """
+        return self.positions.get(file_id, default)
+
+    def flush(self) -> "Future[int] | None":
+        """Write the recorded positions on the writer thread.
+
+        Returns the future of the write or None if nothing changed.
+        """
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        if not dirty:
+            return None
+        files = [File(pk=pk, last_position=self.positions[pk]) for pk in dirty]
+        return get_writer().submit(self.write, files)
+
+    def write(self, files: list[File]) -> int:
+        """Write the positions of files and return the number of updated rows.
+
+        If the write fails, the files are pending again.
+        """
+        try:
+            # bulk_update reads the query limits from an open connection
+            connection.ensure_connection()
+            return File.objects.bulk_update(files, ["last_position"])
+        except DatabaseError:
+            logger.exception("Failed to write %d playback positions", len(files))
+            with self.lock:
+                self.dirty.update(file.pk for file in files)
+            return 0
+
+    def on_about_to_quit(self) -> None:
+        """Write the last positions before the app quits."""
+        future = self.flush()
+        if future is not None:
+            future.result()
@@ -0,0 +1,189 @@
+"""Progress module.
+
+This module contains the progress reporting of downloads.
+"""
+
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from functools import cache
+from typing import Any, BinaryIO
+
+from PySide6.QtCore import QObject, Signal
+
+# progress of a stage is passed on at most every interval, about 4 times a second
+PROGRESS_INTERVAL_S = 0.25
+
+
+class Stage(StrEnum):
+    """Stages of a download."""
+
+    DOWNLOAD = "download"
+    MERGE = "merge"
+    CONVERT = "convert"
+    ENCRYPT = "encrypt"
+    SAVE = "save"
+
+
+# yt-dlp postprocessors and the stage they run in
+POSTPROCESSOR_STAGES = {
+    "Merger": Stage.MERGE,
+    "VideoRemuxer": Stage.CONVERT,
+    "VideoConvertor": Stage.CONVERT,
+}
+
+
+class DownloadProgress:
+    """Progress of a download, sizes in bytes, speed in bytes per second."""
+
+    __slots__ = ("downloaded_bytes", "eta", "speed", "stage", "total_bytes")
+
+    def __init__(
+        self,
+        stage: Stage,
+        downloaded_bytes: int = 0,
+        total_bytes: int | None = None,
+        speed: float | None = None,
+        eta: int | None = None,
+    ) -> None:
+        """Initialize the progress."""
+        self.stage = stage
+        self.downloaded_bytes = downloaded_bytes
+        self.total_bytes = total_bytes
+        self.speed = speed
+        self.eta = eta
+
+    @classmethod
+    def from_progress_hook(cls, status: dict[str, Any]) -> "DownloadProgress":
+        """Make the progress from the status passed to yt-dlp progress hooks."""
+        return cls(
+            stage=Stage.DOWNLOAD,
+            downloaded_bytes=status.get("downloaded_bytes") or 0,
+            total_bytes=status.get("total_bytes") or status.get("total_bytes_estimate"),
+            speed=status.get("speed"),
+            eta=status.get("eta"),
+        )
+
+    @classmethod
+    def from_postprocessor_hook(cls, status: dict[str, Any]) -> "DownloadProgress":
+        """Make the progress from the status passed to yt-dlp postprocessor hooks."""
+        return cls(
+            stage=POSTPROCESSOR_STAGES.get(
+                status.get("postprocessor", ""), Stage.CONVERT
+            )
+        )
+
+
+class ProgressThrottle:
+    """Callback that passes progress on at a fixed rate.
+
+    yt-dlp calls its hooks for every received block, hundreds of times
+    a second. Progress of the same stage is dropped until the interval passed,
+    a new stage is always passed on.
+    """
+
+    def __init__(
+        self,
+        on_progress: Callable[[DownloadProgress], None],
+        interval_s: float = PROGRESS_INTERVAL_S,
+    ) -> None:
+        """Initialize the throttle."""
+        self.on_progress = on_progress
+        self.interval_s = interval_s
+        self.last_stage: Stage | None = None
+        self.last_time = 0.0
+
+    def __call__(self, progress: DownloadProgress) -> None:
+        """Pass the progress on unless the last one was passed on too recently."""
+        now = time.monotonic()
+        if progress.stage == self.last_stage and now - self.last_time < self.interval_s:
+            return
+        self.last_stage = progress.stage
+        self.last_time = now
+        self.on_progress(progress)
+
+
+class ProgressReader:
+    """Reader that reports the progress of reading a stream.
+
+    Used for streams that yt-dlp does not report on, e.g. the output of ffmpeg.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        stage: Stage,
+        on_progress: Callable[[DownloadProgress], None],
+    ) -> None:
+        """Initialize the reader."""
+        self.stream = stream
+        self.stage = stage
+        self.on_progress = on_progress
+        self.read_bytes = 0
+        self.start = time.monotonic()
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the stream and report the progress."""
+        data = self.stream.read(size)
+        self.read_bytes += len(data)
+        elapsed = time.monotonic() - self.start
+        self.on_progress(
+            DownloadProgress(
+                stage=self.stage,
+                downloaded_bytes=self.read_bytes,
+                speed=self.read_bytes / elapsed if elapsed else None,
+            )
+        )
+        return data
+
+
+class ProgressTracker(QObject):
+    """Tracker of the progress of all active downloads.
+
+    Emits changed with the number of active downloads
+    and their total download speed in bytes per second.
+    """
+
+    changed = Signal(int, float)
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        super().__init__()
+        self.jobs: dict[int, DownloadProgress] = {}
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "ProgressTracker":
+        """Get the tracker shared by the whole app."""
+        return cls()
+
+    def update(self, job_id: int, progress: DownloadProgress) -> None:
+        """Update the progress of a download."""
+        self.jobs[job_id] = progress
+        self.emit_changed()
+
+    def remove(self, job_id: int) -> None:
+        """Remove a download that finished."""
+        if self.jobs.pop(job_id, None) is not None:
+            self.emit_changed()
+
+    def get_total_speed(self) -> float:
+        """Get the total speed of the downloads that are downloading."""
+        return sum(
+            progress.speed or 0.0
+            for progress in self.jobs.values()
+            if progress.stage == Stage.DOWNLOAD
+        )
+
+    def emit_changed(self) -> None:
+        """Emit the number of active downloads and their total speed."""
+        self.changed.emit(len(self.jobs), self.get_total_speed())
+
+
+def format_speed(speed: float) -> str:
+    """Format a speed in bytes per second, e.g. 1.5 MB/s."""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if speed < 1000:  # noqa: PLR2004
+            return f"{speed:.1f} {unit}"
+        speed /= 1000
+    return f"{speed:.1f} GB/s"
@@ -0,0 +1,66 @@
+"""Queries module.
+
+This module runs database queries off the UI thread.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from typing import Any
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRunner(QObject):
+    """Runner of database queries on a small pool of reader threads.
+
+    A query that waits for the SQLite lock would freeze the UI, so slots
+    run it here and get the result in a callback. The result is emitted from
+    the reader thread, Qt queues the signal to the thread of the runner,
+    so callbacks run on the UI thread. Reader threads keep their connection.
+    """
+
+    result_ready = Signal(object, object)
+
+    MAX_WORKERS = 2
+    THREAD_NAME = "db-reader"
+
+    def __init__(self) -> None:
+        """Initialize the runner."""
+        super().__init__()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix=self.THREAD_NAME
+        )
+        self.result_ready.connect(self.on_result_ready)
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "QueryRunner":
+        """Get the runner shared by the whole app."""
+        return cls()
+
+    def run[T](
+        self, query: Callable[[], T], on_result: Callable[[T], None]
+    ) -> Future[T]:
+        """Run a query on a reader thread and call on_result with its result.
+
+        on_result is not called if the query fails, the error is logged.
+        """
+        future = self.executor.submit(query)
+        future.add_done_callback(lambda done: self.on_done(done, on_result))
+        return future
+
+    def on_done[T](self, future: Future[T], on_result: Callable[[T], None]) -> None:
+        """Emit the result of a finished query, runs on the reader thread."""
+        error = future.exception()
+        if error is not None:
+            logger.error("Query failed", exc_info=error)
+            return
+        self.result_ready.emit(on_result, future.result())
+
+    def on_result_ready(self, on_result: Callable[[Any], None], result: Any) -> None:
+        """Pass the result of a query to its callback on the UI thread."""
+        on_result(result)
@@ -0,0 +1,298 @@
+"""Scheduler module.
+
+This module contains the scheduler that limits how many downloads run at once.
+"""
+
+import heapq
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from functools import cache
+from http.cookiejar import Cookie
+from itertools import count
+from urllib.parse import urlparse
+
+from django.utils import timezone
+from PySide6.QtCore import QTimer
+
+from video_vault.src.core.downloads import DownloadWorker, clean_staging_dirs
+from video_vault.src.core.progress import ProgressTracker
+from video_vault.src.db.models import DownloadJob
+from video_vault.src.db.writer import run_write
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedDownload:
+    """Download waiting in the queue of the scheduler.
+
+    Its worker is created when it is started for the first time,
+    a retried download keeps its worker.
+    on_started is called with the worker once it is created.
+    """
+
+    __slots__ = ("cookies", "job", "notify", "on_started", "worker")
+
+    def __init__(
+        self,
+        job: DownloadJob,
+        cookies: list[Cookie],
+        *,
+        notify: bool = True,
+        on_started: Callable[[DownloadWorker], None] | None = None,
+        worker: DownloadWorker | None = None,
+    ) -> None:
+        """Initialize the queued download."""
+        self.job = job
+        self.cookies = cookies
+        self.notify = notify
+        self.on_started = on_started
+        self.worker = worker
+
+    @property
+    def host(self) -> str:
+        """Get the host of the url of the download."""
+        return urlparse(self.job.url).hostname or ""
+
+
+class DownloadScheduler:
+    """Scheduler to run download workers with bounded concurrency.
+
+    Downloads wait in a priority queue (FIFO for the same priority) and are started
+    when a global slot and a slot for their host are free. Their workers are
+    only created then, so a large batch does not hold a thread object per video.
+    All state is guarded by a lock, so jobs can be scheduled from any thread.
+    Cancelled downloads that are still queued are started without a slot,
+    they finish right away, so their finished signal is emitted like for any other.
+    Workers that failed with attempts left are queued again after a delay,
+    which grows with every attempt.
+    """
+
+    MAX_CONCURRENT_DOWNLOADS = 3
+    MAX_CONCURRENT_DOWNLOADS_PER_HOST = 2
+    RETRY_DELAY_MS = 5000
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_DOWNLOADS,
+        max_concurrent_per_host: int = MAX_CONCURRENT_DOWNLOADS_PER_HOST,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_host = max_concurrent_per_host
+        self.lock = threading.RLock()
+        # entries are (-priority, sequence, download) so higher priority goes first
+        self.queue: list[tuple[int, int, QueuedDownload]] = []
+        self.running: list[DownloadWorker] = []
+        # failed workers waiting for their retry delay
+        self.retrying: list[DownloadWorker] = []
+        self.sequence = count()
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "DownloadScheduler":
+        """Get the scheduler shared by the whole app."""
+        return cls()
+
+    def schedule(
+        self,
+        url: str,
+        cookies: list[Cookie],
+        priority: int = 0,
+        *,
+        notify: bool = True,
+        rate_limit: int | None = None,
+    ) -> DownloadJob:
+        """Persist a download job and start it as soon as a slot is free.
+
+        rate_limit caps the speed of this download in bytes per second.
+        """
+        (job,) = self.schedule_many(
+            [(url, cookies)], priority, notify=notify, rate_limit=rate_limit
+        )
+        return job
+
+    def schedule_many(
+        self,
+        downloads: Iterable[tuple[str, list[Cookie]]],
+        priority: int = 0,
+        *,
+        notify: bool = True,
+        rate_limit: int | None = None,
+        on_started: Callable[[DownloadWorker], None] | None = None,
+    ) -> list[DownloadJob]:
+        """Persist the jobs of many downloads with one write and queue them.
+
+        downloads are pairs of a url and its cookies.
+        on_started is called with the worker of each download once it starts.
+        """
+        downloads = list(downloads)
+        jobs = run_write(
+            DownloadJob.objects.bulk_create,
+            [
+                DownloadJob(url=url, priority=priority, rate_limit=rate_limit)
+                for url, _ in downloads
+            ],
+        )
+        logger.info("Queued %d downloads", len(jobs))
+        self.push(
+            *(
+                QueuedDownload(job, cookies, notify=notify, on_started=on_started)
+                for job, (_, cookies) in zip(jobs, downloads, strict=True)
+            )
+        )
+        return jobs
+
+    def push(self, *downloads: QueuedDownload) -> None:
+        """Put downloads into the queue and start them if slots are free."""
+        with self.lock:
+            for download in downloads:
+                heapq.heappush(
+                    self.queue, (-download.job.priority, next(self.sequence), download)
+                )
+        self.dispatch()
+
+    def get_worker(self, download: QueuedDownload) -> DownloadWorker:
+        """Get the worker of a download, it is created on the first call."""
+        if download.worker is not None:
+            return download.worker
+        worker = DownloadWorker(
+            job=download.job, cookies=download.cookies, notify=download.notify
+        )
+        worker.progress.connect(ProgressTracker.get_instance().update)
+        worker.finished.connect(lambda: self.on_worker_finished(worker))
+        download.worker = worker
+        if download.on_started is not None:
+            download.on_started(worker)
+        return worker
+
+    def resume_unfinished(self) -> list[DownloadJob]:
+        """Queue the jobs that did not finish before the app was closed.
+
+        Browser cookies are not persisted, so resumed jobs run without them.
+        Jobs that used up their attempts are marked as failed instead,
+        so a download that keeps crashing the app is not resumed forever.
+        Their staging dirs are kept to resume partial downloads,
+        all other staging dirs are stale and removed.
+        """
+        exhausted = DownloadJob.fail_exhausted()
+        if exhausted:
+            logger.info(
+                "Gave up on %d downloads that used up their attempts", exhausted
+            )
+        jobs = list(DownloadJob.get_unfinished())
+        clean_staging_dirs(job.pk for job in jobs)
+        # one write for all jobs, not a save per job while the UI starts
+        run_write(
+            DownloadJob.get_unfinished().update,
+            state=DownloadJob.State.QUEUED,
+            updated_at=timezone.now(),
+        )
+        for job in jobs:
+            job.state = DownloadJob.State.QUEUED
+        self.push(*(QueuedDownload(job, []) for job in jobs))
+        logger.info("Resumed %d unfinished downloads", len(jobs))
+        return jobs
+
+    def dispatch(self) -> None:
+        """Start queued downloads until the limits are reached."""
+        with self.lock:
+            skipped: list[tuple[int, int, QueuedDownload]] = []
+            while self.queue and len(self.running) < self.max_concurrent:
+                entry = heapq.heappop(self.queue)
+                download = entry[-1]
+                if (
+                    self.get_running_count(download.host)
+                    >= self.max_concurrent_per_host
+                ):
+                    skipped.append(entry)
+                    continue
+                worker = self.get_worker(download)
+                self.running.append(worker)
+                worker.start()
+            for entry in skipped:
+                heapq.heappush(self.queue, entry)
+
+    def on_worker_finished(self, worker: DownloadWorker) -> None:
+        """Free the slot of a finished worker and start the next ones."""
+        # finished is emitted right before the thread ends, wait for it to be safe
+        worker.wait()
+        ProgressTracker.get_instance().remove(worker.job.pk)
+        with self.lock:
+            if worker in self.running:
+                self.running.remove(worker)
+            if worker.retrying:
+                self.retrying.append(worker)
+        if worker.retrying:
+            delay_ms = self.RETRY_DELAY_MS * worker.job.attempts
+            logger.info("Retrying download in %d ms: %s", delay_ms, worker.url)
+            QTimer.singleShot(delay_ms, lambda: self.retry(worker))
+        self.dispatch()
+
+    def retry(self, worker: DownloadWorker) -> None:
+        """Queue a failed worker again, unless it was cancelled meanwhile."""
+        with self.lock:
+            if worker not in self.retrying:
+                return
+            self.retrying.remove(worker)
+        self.push(
+            QueuedDownload(
+                worker.job, worker.cookies, notify=worker.notify, worker=worker
+            )
+        )
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel the queued or running download of a job.
+
+        Returns False if the job is neither queued nor running.
+        """
+        with self.lock:
+            for entry in self.queue:
+                if entry[-1].job.pk == job_id:
+                    self.queue.remove(entry)
+                    heapq.heapify(self.queue)
+                    worker = self.get_worker(entry[-1])
+                    worker.cancel()
+                    worker.start()
+                    return True
+            for worker in self.retrying:
+                if worker.job.pk == job_id:
+                    self.retrying.remove(worker)
+                    worker.cancel()
+                    worker.start()
+                    return True
+            for worker in self.running:
+                if worker.job.pk == job_id:
+                    worker.cancel()
+                    return True
+        return False
+
+    def cancel_all(self) -> int:
+        """Cancel all queued and running downloads.
+
+        Returns the number of cancelled downloads.
+        """
+        with self.lock:
+            queued = [self.get_worker(entry[-1]) for entry in self.queue]
+            queued += self.retrying
+            self.queue.clear()
+            self.retrying.clear()
+            workers = queued + self.running
+            for worker in workers:
+                worker.cancel()
+            for worker in queued:
+                worker.start()
+        logger.info("Cancelled %d downloads", len(workers))
+        return len(workers)
+
+    def get_running_count(self, host: str | None = None) -> int:
+        """Get the number of running workers, optionally only for a host."""
+        with self.lock:
+            if host is None:
+                return len(self.running)
+            return sum(worker.host == host for worker in self.running)
+
+    def get_queued_count(self) -> int:
+        """Get the number of downloads waiting for a slot."""
+        with self.lock:
+            return len(self.queue)
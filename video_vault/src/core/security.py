@@ -3,25 +3,73 @@
 This module contains functions to encrypt and decrypt data.
 """
 
+import logging
+import threading
+from base64 import b64encode
+from functools import cache
+
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from winiutils.src.security.keyring import get_key_as_str, get_or_create_aes_gcm
+from winiutils.src.security.keyring import get_or_create_aes_gcm
 
 from video_vault.src.core.consts import APP_NAME, AUTHOR
 
+logger = logging.getLogger(__name__)
+
+
+class AppKeyProvider:
+    """Provider of the app key that reads the keyring once per process.
+
+    The keyring can be slow (a D-Bus round-trip with Secret Service) or ask
+    to be unlocked, so the key is fetched on first use and the AESGCM is
+    shared by all callers. AESGCM holds no state between calls,
+    so the shared instance can be used from any thread.
+    Call invalidate after rotating the key to fetch it again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the provider."""
+        self.lock = threading.RLock()
+        self.aes_gcm: AESGCM | None = None
+        self.key = b""
+        self.keyring_hits = 0
+
+    @classmethod
+    @cache
+    def get_instance(cls) -> "AppKeyProvider":
+        """Get the provider shared by the whole app."""
+        return cls()
+
+    def get_aes_gcm(self) -> AESGCM:
+        """Get the app AESGCM, fetching the key if it is not cached."""
+        with self.lock:
+            if self.aes_gcm is None:
+                self.aes_gcm, self.key = get_or_create_aes_gcm(APP_NAME, AUTHOR)
+                self.keyring_hits += 1
+                logger.info("Fetched app key from keyring")
+            return self.aes_gcm
+
+    def get_key_as_str(self) -> str:
+        """Get the key base64 encoded, as it is stored in the keyring."""
+        with self.lock:
+            self.get_aes_gcm()
+            return b64encode(self.key).decode("ascii")
+
+    def invalidate(self) -> None:
+        """Drop the cached key, so the next call reads the keyring again."""
+        with self.lock:
+            self.aes_gcm = None
+            self.key = b""
+
 
 def get_or_create_app_aes_gcm() -> AESGCM:
     """Get the app secret using keyring.
 
     If it does not exist, create it with a AESGCM.
+    The key is cached for the lifetime of the process, see AppKeyProvider.
     """
-    return get_or_create_aes_gcm(APP_NAME, AUTHOR)[0]
+    return AppKeyProvider.get_instance().get_aes_gcm()
 
 
 def get_app_key_as_str() -> str:
     """Get the key as a string."""
-    get_or_create_aes_gcm(APP_NAME, AUTHOR)
-    key = get_key_as_str(APP_NAME, AUTHOR, key_class=AESGCM)
-    if key is None:
-        msg = "Key not found"
-        raise ValueError(msg)
-    return key
+    return AppKeyProvider.get_instance().get_key_as_str()
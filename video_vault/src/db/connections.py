@@ -0,0 +1,65 @@
+"""Database connections module.
+
+Django opens a connection per thread and closes it only at the end of a
+request, which never happens in a desktop app. Connections of finished
+worker threads stay open until they are garbage collected, so worker
+threads close them when they exit.
+"""
+
+import functools
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+from weakref import WeakSet
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+# the connections of all threads, see track_connection
+created_connections: WeakSet[BaseDatabaseWrapper] = WeakSet()
+
+
+def track_connection(
+    sender: type[BaseDatabaseWrapper],  # noqa: ARG001
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    """Remember a new connection, receiver of the connection_created signal."""
+    created_connections.add(connection)
+
+
+def get_open_connection_count() -> int:
+    """Get the number of open connections of all threads."""
+    return sum(
+        1 for wrapper in list(created_connections) if wrapper.connection is not None
+    )
+
+
+def close_thread_connections() -> None:
+    """Close the connections of the current thread.
+
+    The main thread keeps its connections for the lifetime of the app.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return
+    connections.close_all()
+    logger.debug("Open database connections: %d", get_open_connection_count())
+
+
+def closes_connections[**P, T](func: Callable[P, T]) -> Callable[P, T]:
+    """Close the connections of the thread when func returns or raises.
+
+    Use it on the run method of worker threads.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_thread_connections()
+
+    return wrapper
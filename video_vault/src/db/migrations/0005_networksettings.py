@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0004_downloadjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetworkSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('domain', models.CharField(blank=True, default='', max_length=255, unique=True)),
+                ('concurrent_fragment_downloads', models.PositiveIntegerField(blank=True, null=True)),
+                ('http_chunk_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('buffersize', models.PositiveIntegerField(blank=True, null=True)),
+                ('retries', models.PositiveIntegerField(blank=True, null=True)),
+                ('fragment_retries', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0005_networksettings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='extractor_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='video_id',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='webpage_url',
+            field=models.URLField(blank=True, db_index=True, default='', max_length=2048),
+        ),
+    ]
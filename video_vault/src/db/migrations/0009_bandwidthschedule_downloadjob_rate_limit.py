@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0008_alter_downloadjob_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BandwidthSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('start', models.TimeField()),
+                ('end', models.TimeField()),
+                ('rate_limit', models.PositiveBigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='downloadjob',
+            name='rate_limit',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
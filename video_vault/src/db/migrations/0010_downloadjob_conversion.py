@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0009_bandwidthschedule_downloadjob_rate_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='downloadjob',
+            name='conversion',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
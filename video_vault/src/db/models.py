@@ -1,14 +1,26 @@
 """Models for the database."""
 
+import logging
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, ClassVar
 
-from django.core.files.base import ContentFile
-from django.db import models
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models.functions import Length
+from django.utils import timezone
 from winidjango.src.db.models import BaseModel
-from winipyside.src.core.py_qiodevice import EncryptedPyQFile
 
+from video_vault.src.core.cancellation import CancelToken
+from video_vault.src.core.encryption import (
+    ChunkEncryptedFile,
+    EncryptedFile,
+    StreamEncryptedFile,
+)
 from video_vault.src.core.security import get_or_create_app_aes_gcm
+from video_vault.src.db.writer import run_write
+
+logger = logging.getLogger(__name__)
 
 
 class File(BaseModel):
@@ -18,26 +30,437 @@ class File(BaseModel):
 
     file = models.FileField(upload_to=UPLOAD_TO)
     last_position: models.BigIntegerField[int, int] = models.BigIntegerField(default=0)
+    # where the video came from and what it contains, to skip duplicates
+    extractor_key: models.CharField[str, str] = models.CharField(
+        max_length=100, blank=True, default="", db_index=True
+    )
+    video_id: models.CharField[str, str] = models.CharField(
+        max_length=255, blank=True, default="", db_index=True
+    )
+    webpage_url: models.URLField[str, str] = models.URLField(
+        max_length=2048, blank=True, default="", db_index=True
+    )
+    sha256: models.CharField[str, str] = models.CharField(
+        max_length=64, blank=True, default="", db_index=True
+    )
 
     def delete_file(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
         """Delete a file."""
         # delete the file from the filesystem
         self.file.delete(save=False)
         # delete the file from the database
-        return self.delete(*args, **kwargs)
+        return run_write(self.delete, *args, **kwargs)
 
     @classmethod
-    def create_encrypted(cls, path: Path, **kwargs: Any) -> "File":
-        """Create a file."""
+    def create_encrypted(
+        cls, path: Path, cancel_token: CancelToken | None = None, **kwargs: Any
+    ) -> "File":
+        """Create a file.
+
+        The file is encrypted chunk by chunk while it is written to the storage,
+        so memory usage does not depend on the size of the file.
+        """
         aes_gcm = get_or_create_app_aes_gcm()
 
-        decrypted_data = path.read_bytes()
+        return cls.create_from_encrypted_file(
+            ChunkEncryptedFile(path, aes_gcm, cancel_token), **kwargs
+        )
+
+    @classmethod
+    def create_encrypted_from_stream(
+        cls,
+        stream: BinaryIO,
+        name: str,
+        cancel_token: CancelToken | None = None,
+        **kwargs: Any,
+    ) -> "File":
+        """Create a file from a plaintext stream.
+
+        The stream is encrypted while it is read, so the plaintext never touches disk.
+        """
+        aes_gcm = get_or_create_app_aes_gcm()
+
+        return cls.create_from_encrypted_file(
+            StreamEncryptedFile(stream, name, aes_gcm, cancel_token), **kwargs
+        )
+
+    @classmethod
+    def create_from_encrypted_file(
+        cls, encrypted_file: EncryptedFile, **kwargs: Any
+    ) -> "File":
+        """Create a file with the plaintext hash computed while encrypting.
+
+        If encrypting fails or is cancelled, the partial file is removed.
+        """
+        file = cls(**kwargs)
+        field = file.file.field
+        # the name is chosen before saving, so the partial file can be found
+        name = file.file.storage.get_available_name(
+            field.generate_filename(file, encrypted_file.name),
+            max_length=field.max_length,
+        )
+        try:
+            file.file.name = file.file.storage.save(
+                name, encrypted_file, max_length=field.max_length
+            )
+        except Exception:
+            file.delete_partial_file(name, encrypted_file.encrypted_size)
+            raise
+        file.sha256 = encrypted_file.sha256.hexdigest()
+        run_write(file.save)
+        return file
+
+    def delete_partial_file(self, name: str, size: int) -> None:
+        """Delete a partially written file from the storage.
 
-        encrypted_data = EncryptedPyQFile.encrypt_data_static(decrypted_data, aes_gcm)
+        The size is checked, so a file that another download saved under
+        the same name at the same time is not deleted.
+        """
+        storage = self.file.storage
+        if storage.exists(name) and storage.size(name) == size:
+            logger.info("Removing partial file %s", name)
+            storage.delete(name)
 
-        return cls.objects.create(file=ContentFile(encrypted_data, path.name), **kwargs)
+    @classmethod
+    def get_by_source(
+        cls, extractor_key: str, video_id: str, webpage_url: str
+    ) -> "File | None":
+        """Get a file that was downloaded from the same video or page."""
+        query = models.Q()
+        if extractor_key and video_id:
+            query |= models.Q(extractor_key=extractor_key, video_id=video_id)
+        if webpage_url:
+            query |= models.Q(webpage_url=webpage_url)
+        if not query:
+            return None
+        return cls.objects.filter(query).order_by("created_at").first()
+
+    def get_duplicate(self) -> "File | None":
+        """Get the oldest other file with the same content."""
+        if not self.sha256:
+            return None
+        return (
+            File.objects.filter(sha256=self.sha256)
+            .exclude(pk=self.pk)
+            .order_by("created_at")
+            .first()
+        )
 
     @property
     def display_name(self) -> str:
         """Get the display name."""
-        return Path(self.file.name).with_suffix("").name
+        return self.get_display_name(self.file.name)
+
+    @staticmethod
+    def get_display_name(name: str) -> str:
+        """Get the display name from the stored name of a file."""
+        return Path(name).with_suffix("").name
+
+
+class DownloadJob(BaseModel):
+    """Download job model.
+
+    Persists downloads from being queued until they are done or failed,
+    so unfinished downloads can be resumed after the app was closed.
+    """
+
+    class State(models.TextChoices):
+        """States of a download job."""
+
+        QUEUED = "queued"
+        RUNNING = "running"
+        POSTPROCESSING = "postprocessing"
+        ENCRYPTING = "encrypting"
+        DONE = "done"
+        FAILED = "failed"
+        CANCELLED = "cancelled"
+
+    UNFINISHED_STATES = (
+        State.QUEUED,
+        State.RUNNING,
+        State.POSTPROCESSING,
+        State.ENCRYPTING,
+    )
+
+    # a job that failed or was interrupted this often is not tried again
+    MAX_ATTEMPTS = 5
+
+    url: models.TextField[str, str] = models.TextField()
+    state: models.CharField[str, str] = models.CharField(
+        max_length=20, choices=State.choices, default=State.QUEUED, db_index=True
+    )
+    priority: models.IntegerField[int, int] = models.IntegerField(default=0)
+    # bytes per second for this download, empty for its fair share only
+    rate_limit: models.PositiveBigIntegerField[int | None, int | None] = (
+        models.PositiveBigIntegerField(null=True, blank=True)
+    )
+    attempts: models.PositiveIntegerField[int, int] = models.PositiveIntegerField(
+        default=0
+    )
+    error: models.TextField[str, str] = models.TextField(blank=True, default="")
+    # the Conversion of core.downloads that made the download an mp4,
+    # empty until it is known
+    conversion: models.CharField[str, str] = models.CharField(
+        max_length=20, blank=True, default=""
+    )
+    started_at: models.DateTimeField[datetime | None, datetime | None] = (
+        models.DateTimeField(null=True, blank=True)
+    )
+    finished_at: models.DateTimeField[datetime | None, datetime | None] = (
+        models.DateTimeField(null=True, blank=True)
+    )
+    file: models.ForeignKey[File | None, File | None] = models.ForeignKey(
+        File, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    @classmethod
+    def get_unfinished(cls) -> models.QuerySet["DownloadJob"]:
+        """Get the unfinished jobs in the order they should run."""
+        return cls.objects.filter(state__in=cls.UNFINISHED_STATES).order_by(
+            "-priority", "created_at"
+        )
+
+    @classmethod
+    def fail_exhausted(cls) -> int:
+        """Mark the unfinished jobs that used up their attempts as failed.
+
+        Returns the number of failed jobs.
+        """
+        now = timezone.now()
+        exhausted = cls.objects.filter(
+            state__in=cls.UNFINISHED_STATES, attempts__gte=cls.MAX_ATTEMPTS
+        )
+        return run_write(
+            exhausted.update,
+            state=cls.State.FAILED,
+            error=f"Gave up after {cls.MAX_ATTEMPTS} attempts",
+            finished_at=now,
+            updated_at=now,
+        )
+
+    def set_state(self, state: str) -> None:
+        """Set and save the state if it changed."""
+        if self.state == state:
+            return
+        self.state = state
+        run_write(self.save, update_fields=["state", "updated_at"])
+
+    def set_conversion(self, conversion: str) -> None:
+        """Set and save how the download is converted to mp4."""
+        self.conversion = conversion
+        run_write(self.save, update_fields=["conversion", "updated_at"])
+
+    def mark_running(self) -> None:
+        """Mark the job as running and count the attempt."""
+        self.state = self.State.RUNNING
+        self.attempts += 1
+        self.started_at = timezone.now()
+        run_write(
+            self.save, update_fields=["state", "attempts", "started_at", "updated_at"]
+        )
+
+    def can_retry(self) -> bool:
+        """Check if the job has attempts left after a failed one."""
+        return self.attempts < self.MAX_ATTEMPTS
+
+    def mark_retrying(self, error: str) -> None:
+        """Queue the job again after a failed attempt, keeping the error."""
+        self.state = self.State.QUEUED
+        self.error = error
+        run_write(self.save, update_fields=["state", "error", "updated_at"])
+
+    def mark_done(self, file: File) -> None:
+        """Mark the job as done with the downloaded file."""
+        self.state = self.State.DONE
+        self.file = file
+        self.error = ""
+        self.finished_at = timezone.now()
+        run_write(
+            self.save,
+            update_fields=["state", "file", "error", "finished_at", "updated_at"],
+        )
+
+    def mark_failed(self, error: str) -> None:
+        """Mark the job as failed with the error."""
+        self.state = self.State.FAILED
+        self.error = error
+        self.finished_at = timezone.now()
+        run_write(
+            self.save, update_fields=["state", "error", "finished_at", "updated_at"]
+        )
+
+    def mark_cancelled(self) -> None:
+        """Mark the job as cancelled, it is not resumed."""
+        self.state = self.State.CANCELLED
+        self.finished_at = timezone.now()
+        run_write(self.save, update_fields=["state", "finished_at", "updated_at"])
+
+
+class NetworkSettings(BaseModel):
+    """Network settings for yt-dlp.
+
+    The row with an empty domain overrides the built-in defaults for all downloads,
+    rows with a domain override them for that domain and its subdomains.
+    Empty fields fall back to the less specific row.
+    """
+
+    DEFAULT_DOMAIN = ""
+
+    # yt-dlp downloads DASH/HLS fragments one at a time by default
+    DEFAULTS: ClassVar[dict[str, int]] = {
+        "concurrent_fragment_downloads": 4,
+        "http_chunk_size": 10 * 1024 * 1024,
+        "buffersize": 64 * 1024,
+        "retries": 10,
+        "fragment_retries": 10,
+    }
+
+    domain: models.CharField[str, str] = models.CharField(
+        max_length=255, unique=True, blank=True, default=DEFAULT_DOMAIN
+    )
+    concurrent_fragment_downloads: models.PositiveIntegerField[
+        int | None, int | None
+    ] = models.PositiveIntegerField(null=True, blank=True)
+    http_chunk_size: models.PositiveBigIntegerField[int | None, int | None] = (
+        models.PositiveBigIntegerField(null=True, blank=True)
+    )
+    buffersize: models.PositiveIntegerField[int | None, int | None] = (
+        models.PositiveIntegerField(null=True, blank=True)
+    )
+    retries: models.PositiveIntegerField[int | None, int | None] = (
+        models.PositiveIntegerField(null=True, blank=True)
+    )
+    fragment_retries: models.PositiveIntegerField[int | None, int | None] = (
+        models.PositiveIntegerField(null=True, blank=True)
+    )
+
+    @classmethod
+    def get_for_host(cls, host: str) -> models.QuerySet["NetworkSettings"]:
+        """Get the rows that apply to a host from the least to the most specific."""
+        labels = host.lower().split(".") if host else []
+        domains = [".".join(labels[i:]) for i in range(len(labels))]
+        rows = cls.objects.filter(domain__in=[cls.DEFAULT_DOMAIN, *domains])
+        return rows.annotate(domain_length=Length("domain")).order_by("domain_length")
+
+    @classmethod
+    def get_ydl_opts(cls, host: str) -> dict[str, int]:
+        """Get the yt-dlp network options for a host."""
+        opts = dict(cls.DEFAULTS)
+        for row in cls.get_for_host(host):
+            opts.update(row.get_overrides())
+        return opts
+
+    @classmethod
+    def save_overrides(
+        cls, domain: str, overrides: dict[str, int | None]
+    ) -> "NetworkSettings":
+        """Save the options of a domain, None leaves an option empty."""
+        settings, _ = run_write(
+            cls.objects.update_or_create, domain=domain, defaults=overrides
+        )
+        return settings
+
+    def get_overrides(self) -> dict[str, int]:
+        """Get the options that are set in this row."""
+        return {
+            name: value
+            for name in self.DEFAULTS
+            if (value := getattr(self, name)) is not None
+        }
+
+
+class BandwidthSchedule(BaseModel):
+    """Bandwidth schedule model.
+
+    Limits the total speed of all downloads during a time of day.
+    A window wraps around midnight if it ends before it starts
+    and covers the whole day if it starts and ends at the same time.
+    If windows overlap the shortest one wins, so e.g. an unlimited night window
+    overrides an all-day limit. Without a matching window downloads are unlimited.
+    """
+
+    start: models.TimeField[time, time] = models.TimeField()
+    end: models.TimeField[time, time] = models.TimeField()
+    # bytes per second for all downloads together, empty for unlimited
+    rate_limit: models.PositiveBigIntegerField[int | None, int | None] = (
+        models.PositiveBigIntegerField(null=True, blank=True)
+    )
+
+    @classmethod
+    def get_active(cls, at: time | None = None) -> "BandwidthSchedule | None":
+        """Get the window that applies at a time of day, by default now."""
+        at = at or datetime.now().astimezone().time()
+        windows = [row for row in cls.objects.all() if row.contains(at)]
+        return min(windows, key=lambda row: row.get_duration(), default=None)
+
+    @classmethod
+    def get_rate_limit(cls, at: time | None = None) -> int | None:
+        """Get the total rate limit at a time of day, None if unlimited."""
+        active = cls.get_active(at)
+        return None if active is None else active.rate_limit
+
+    @classmethod
+    def add_window(
+        cls, start: time, end: time, rate_limit: int | None
+    ) -> "BandwidthSchedule":
+        """Add a window, rate_limit None leaves it unlimited."""
+        return run_write(
+            cls.objects.create, start=start, end=end, rate_limit=rate_limit
+        )
+
+    @classmethod
+    def remove_window(cls, pk: int) -> None:
+        """Remove a window."""
+        run_write(cls.objects.filter(pk=pk).delete)
+
+    def contains(self, at: time) -> bool:
+        """Check if a time of day is in the window."""
+        if self.start == self.end:
+            return True
+        if self.start < self.end:
+            return self.start <= at < self.end
+        return at >= self.start or at < self.end
+
+    def get_duration(self) -> timedelta:
+        """Get the length of the window."""
+        day = timedelta(days=1)
+        duration = (
+            datetime.combine(date.min, self.end)
+            - datetime.combine(date.min, self.start)
+        ) % day
+        return duration or day
+
+
+class PendingDeletion(BaseModel):
+    """Pending deletion model.
+
+    A stored file of a deleted download that still has to be removed,
+    so removals continue after the app was closed.
+    """
+
+    name: models.CharField[str, str] = models.CharField(max_length=255)
+
+    @classmethod
+    def delete_files(cls, queryset: models.QuerySet[File]) -> int:
+        """Delete files from the database and queue their removal from the storage.
+
+        The rows are deleted and their stored files are queued in one transaction,
+        so a stored file is never left without a row or a queued removal.
+        Returns the number of queued files.
+        """
+        with transaction.atomic():
+            names = list(queryset.exclude(file="").values_list("file", flat=True))
+            PendingDeletion.objects.bulk_create(
+                [PendingDeletion(name=name) for name in names]
+            )
+            queryset.delete()
+        return len(names)
+
+    def remove(self) -> None:
+        """Remove the stored file and the row from the queue."""
+        try:
+            default_storage.delete(self.name)
+        except OSError:
+            # keep going, a file that can not be removed must not block the queue
+            logger.exception("Failed to remove file: %s", self.name)
+        run_write(self.delete)
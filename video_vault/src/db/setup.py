@@ -5,27 +5,53 @@ In the init we setup django settings and create the db if not existent.
 """
 
 import logging
+import pkgutil
 import sys
+import time
 from io import StringIO
 from pathlib import Path
+from typing import Any
 
 import django
 from django.conf import settings
 from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.backends.signals import connection_created
 from platformdirs import user_data_dir
 from pyrig.src.modules.module import make_obj_importpath
 
 from video_vault.src import db
 from video_vault.src.core.consts import APP_NAME, AUTHOR
 from video_vault.src.core.security import get_app_key_as_str
+from video_vault.src.db import migrations
+from video_vault.src.db.connections import track_connection
 
 logger = logging.getLogger(__name__)
 
+# django uses the last part of the app path as label
+APP_LABEL = "db"
+
+# run on every new connection
+SQLITE_PRAGMAS = (
+    # readers do not block the writer and the writer does not block readers
+    "PRAGMA journal_mode=WAL",
+    # in WAL mode only a power loss can lose the last commits, never corrupt
+    "PRAGMA synchronous=NORMAL",
+    # 64 MB page cache, negative values are KiB
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# seconds a write waits for the lock before failing with "database is locked"
+BUSY_TIMEOUT_S = 20
+
 
 def setup_django() -> None:
     """Setup the database."""
     if settings.configured:
         return
+    start = time.perf_counter()
 
     # can be None in frozen apps and django needs it to be writable
     if sys.stdout is None:
@@ -45,6 +71,7 @@ def setup_django() -> None:
             "default": {
                 "ENGINE": "django.db.backends.sqlite3",
                 "NAME": str(db_path),
+                "OPTIONS": get_sqlite_options(),
             }
         },
         INSTALLED_APPS=[
@@ -55,8 +82,68 @@ def setup_django() -> None:
         SECRET_KEY=get_app_key_as_str(),
     )
 
+    connection_created.connect(track_connection)
     django.setup()
+    logger.info("Django setup took %.1f ms", (time.perf_counter() - start) * 1000)
+
+    migrate()
+
+    logger.info(
+        "Django setup complete in %.1f ms", (time.perf_counter() - start) * 1000
+    )
+
+
+def get_sqlite_options() -> dict[str, Any]:
+    """Get the options of the sqlite backend.
+
+    Transactions take the write lock when they begin, so a transaction that
+    reads first can not fail halfway when it upgrades to a write.
+    """
+    return {
+        "init_command": ";".join(SQLITE_PRAGMAS),
+        "transaction_mode": "IMMEDIATE",
+        "timeout": BUSY_TIMEOUT_S,
+    }
 
+
+def migrate() -> None:
+    """Apply the migrations unless the schema is already current.
+
+    Checking the applied migrations is one query, while the migrate command
+    loads the migration graph and introspects the schema on every start.
+    """
+    start = time.perf_counter()
+    if is_schema_current():
+        logger.info(
+            "Schema is current, skipped migrate (checked in %.1f ms)",
+            (time.perf_counter() - start) * 1000,
+        )
+        return
     call_command("migrate")
+    logger.info("Migrate took %.1f ms", (time.perf_counter() - start) * 1000)
+
+
+def is_schema_current() -> bool:
+    """Check if all migrations on disk are applied."""
+    try:
+        applied = get_applied_migration_names()
+    except DatabaseError:
+        # the migrations table does not exist in a new database
+        return False
+    return get_migration_names() <= applied
+
+
+def get_migration_names() -> set[str]:
+    """Get the names of the migrations of the app on disk."""
+    return {
+        module.name
+        for module in pkgutil.iter_modules(migrations.__path__)
+        if not module.ispkg and module.name[:4].isdigit()
+    }
+
 
-    logger.info("Django setup complete")
+def get_applied_migration_names() -> set[str]:
+    """Get the names of the applied migrations of the app from the database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM django_migrations WHERE app = %s", [APP_LABEL])
+        return {name for (name,) in cursor.fetchall()}
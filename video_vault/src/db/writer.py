@@ -0,0 +1,46 @@
+"""Database writer module.
+
+SQLite allows one writer at a time. Writes from worker threads are run one
+after another on a single writer thread, so concurrent downloads queue their
+writes instead of competing for the lock and failing with
+"database is locked". Readers are not affected, the database runs in WAL mode.
+"""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Any
+
+from django.db import connection
+
+WRITER_THREAD_NAME = "db-writer"
+
+
+@cache
+def get_writer() -> ThreadPoolExecutor:
+    """Get the executor with the single writer thread."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix=WRITER_THREAD_NAME)
+
+
+def run_write[T](func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a database write and return its result.
+
+    Writes from worker threads wait for their turn on the writer thread.
+    The main thread writes directly, so the UI never waits behind the queue,
+    the busy timeout covers the single write that may run at the same time.
+    Writes inside a transaction stay on its thread, the transaction holds
+    the lock the writer thread would wait for.
+    """
+    if (
+        is_writer_thread()
+        or threading.current_thread() is threading.main_thread()
+        or connection.in_atomic_block
+    ):
+        return func(*args, **kwargs)
+    return get_writer().submit(func, *args, **kwargs).result()
+
+
+def is_writer_thread() -> bool:
+    """Check if the current thread is the writer thread."""
+    return threading.current_thread().name.startswith(WRITER_THREAD_NAME)
@@ -0,0 +1,153 @@
+"""Downloads model module.
+
+This module contains the list model of the downloads for the downloads page.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    Qt,
+)
+
+from video_vault.src.db.models import File
+
+ModelIndex = QModelIndex | QPersistentModelIndex
+
+
+class DownloadRow:
+    """Row of the downloads list.
+
+    Holds only what the list shows, the full file is fetched when it is
+    played or deleted.
+    """
+
+    __slots__ = ("created_at", "display_name", "pk")
+
+    def __init__(self, pk: int, display_name: str, created_at: datetime) -> None:
+        """Initialize the row."""
+        self.pk = pk
+        self.display_name = display_name
+        self.created_at = created_at
+
+    @classmethod
+    def from_file(cls, file: File) -> "DownloadRow":
+        """Create the row of a file."""
+        return cls(file.pk, file.display_name, file.created_at)
+
+    def get_file(self) -> File | None:
+        """Get the file of the row, None if it was deleted."""
+        return File.objects.filter(pk=self.pk).first()
+
+
+class DownloadsListModel(QAbstractListModel):
+    """List model of the downloads, newest first.
+
+    Rows are loaded page by page as the view scrolls (fetchMore) with keyset
+    pagination, so memory and build time depend on the rows that were shown,
+    not on the size of the library.
+    """
+
+    PAGE_SIZE = 100
+
+    ROW_ROLE = Qt.ItemDataRole.UserRole
+
+    def __init__(
+        self, page_size: int = PAGE_SIZE, parent: QObject | None = None
+    ) -> None:
+        """Initialize the model."""
+        super().__init__(parent)
+        self.page_size = page_size
+        self.rows: list[DownloadRow] = []
+        self.has_more = True
+
+    def rowCount(self, parent: ModelIndex = QModelIndex()) -> int:  # noqa: B008, N802
+        """Get the number of loaded rows."""
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index: ModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """Get the display name or the row of an index."""
+        if not index.isValid() or not 0 <= index.row() < len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.display_name
+        if role == self.ROW_ROLE:
+            return row
+        return None
+
+    def canFetchMore(self, parent: ModelIndex) -> bool:  # noqa: N802
+        """Check if there are more rows in the database."""
+        return not parent.isValid() and self.has_more
+
+    def fetchMore(self, parent: ModelIndex) -> None:  # noqa: N802
+        """Load the next page of rows."""
+        if parent.isValid():
+            return
+        rows = self.get_next_page()
+        self.has_more = len(rows) == self.page_size
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def get_next_page(self) -> list[DownloadRow]:
+        """Get the rows after the last loaded one.
+
+        Ids grow with the creation time, so ordering by id is newest first
+        and the page after the last id uses the primary key index
+        instead of an OFFSET that scans all previous rows.
+        Only the shown columns are selected, no model instances are built.
+        """
+        queryset = File.objects.order_by("-pk")
+        if self.rows:
+            queryset = queryset.filter(pk__lt=self.rows[-1].pk)
+        values = queryset.values_list("pk", "file", "created_at")[: self.page_size]
+        return [
+            DownloadRow(pk, File.get_display_name(name), created_at)
+            for pk, name, created_at in values
+        ]
+
+    def get_download_row(self, index: ModelIndex) -> DownloadRow | None:
+        """Get the row of an index."""
+        row: DownloadRow | None = self.data(index, self.ROW_ROLE)
+        return row
+
+    def get_row_number(self, pk: int) -> int | None:
+        """Get the number of the loaded row of a file."""
+        for number, row in enumerate(self.rows):
+            if row.pk == pk:
+                return number
+        return None
+
+    def add_file(self, file: File) -> None:
+        """Add a new download at the top, unless it is already listed."""
+        if self.get_row_number(file.pk) is not None:
+            return
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.rows.insert(0, DownloadRow.from_file(file))
+        self.endInsertRows()
+
+    def remove_row(self, pk: int) -> None:
+        """Remove the row of a file."""
+        number = self.get_row_number(pk)
+        if number is None:
+            return
+        self.beginRemoveRows(QModelIndex(), number, number)
+        del self.rows[number]
+        self.endRemoveRows()
+
+    def reload(self) -> None:
+        """Drop all loaded rows, the view fetches them again."""
+        self.beginResetModel()
+        self.rows = []
+        self.has_more = True
+        self.endResetModel()
@@ -3,27 +3,97 @@
 This module contains the add downloads page class for the VideoVault application.
 """
 
-from PySide6.QtCore import Qt
+from http.cookiejar import Cookie
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QTimer, QUrl
+from PySide6.QtGui import QHideEvent, QShowEvent
 from PySide6.QtWidgets import (
+    QFileDialog,
+    QInputDialog,
+    QMenu,
+    QProgressBar,
     QPushButton,
     QSizePolicy,
+    QSpinBox,
 )
-from winipyside.src.ui.pages.browser import Browser as BrowserPage
 
-from video_vault.src.core.downloads import DownloadWorker
+from video_vault.src.core.batch import BatchImportWorker, DownloadBatch, parse_urls
+from video_vault.src.core.scheduler import DownloadScheduler
+from video_vault.src.ui.pages.base import Base as BasePage
+
+
+class AddDownloads(BasePage):
+    """Add downloads page for the VideoVault application.
 
+    The browser runs a Chromium renderer that uses a lot of memory,
+    so the page is removed after it was hidden for a while.
+    """
 
-class AddDownloads(BrowserPage):
-    """Add downloads page for the VideoVault application."""
+    IDLE_TIMEOUT_MS = 10 * 60 * 1000
+
+    # the largest value a QSpinBox holds
+    MAX_RATE_KBPS = 2**31 - 1
 
     def pre_setup(self) -> None:
         """Setup the UI."""
         # add a download button in the top right
         self.add_download_button()
+        self.add_batch_button()
+        self.add_rate_limit_box()
+        self.add_batch_progress_bar()
+        self.batch_import_workers: list[BatchImportWorker] = []
+        self.batch: DownloadBatch | None = None
+
+    def setup(self) -> None:
+        """Setup the UI."""
+        self.add_browser()
+        self.add_idle_timer()
 
     def post_setup(self) -> None:
         """Setup the UI."""
 
+    def add_browser(self) -> None:
+        """Add a browser to find the videos to download.
+
+        QtWebEngine is imported here and not at the top of the module,
+        because loading it is slow and it is not needed to start the app.
+        """
+        from winipyside.src.ui.widgets.browser import (  # noqa: PLC0415
+            Browser as BrowserWidget,
+        )
+
+        self.browser = BrowserWidget(self.v_layout)
+
+    def add_idle_timer(self) -> None:
+        """Add a timer that removes the page when it was hidden for a while."""
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(self.IDLE_TIMEOUT_MS)
+        self.idle_timer.timeout.connect(self.on_idle)
+
+    def showEvent(self, event: QShowEvent) -> None:  # noqa: N802
+        """Stop the idle timer while the page is shown."""
+        self.idle_timer.stop()
+        super().showEvent(event)
+
+    def hideEvent(self, event: QHideEvent) -> None:  # noqa: N802
+        """Start the idle timer when the page is hidden."""
+        self.idle_timer.start()
+        super().hideEvent(event)
+
+    def on_idle(self) -> None:
+        """Remove the page unless it is shown or a batch is still running."""
+        if self.isVisible() or self.is_batch_running():
+            return
+        self.remove_from_window()
+
+    def is_batch_running(self) -> bool:
+        """Check if a batch is being imported or downloaded."""
+        return bool(self.batch_import_workers) or (
+            self.batch is not None and not self.batch.is_done
+        )
+
     def add_download_button(self) -> None:
         """Add a download button."""
         download_arrow_icon = self.get_svg_icon("download_arrow")
@@ -45,5 +115,112 @@ class AddDownloads(BrowserPage):
         url = self.browser.url()
         domain = url.host()
         http_cookies = self.browser.get_domain_http_cookies(domain)
-        worker = DownloadWorker(url=url.toString(), cookies=http_cookies)
+        DownloadScheduler.get_instance().schedule(
+            url=url.toString(), cookies=http_cookies, rate_limit=self.get_rate_limit()
+        )
+
+    def add_batch_button(self) -> None:
+        """Add a button to import many downloads at once."""
+        button = QPushButton("Batch")
+        button.setIcon(self.get_svg_icon("download_arrow"))
+        button.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
+        menu = QMenu(button)
+
+        page_action = menu.addAction("This Page")
+        page_action.triggered.connect(self.on_batch_import_page)
+
+        paste_action = menu.addAction("Paste URLs")
+        paste_action.triggered.connect(self.on_batch_import_paste)
+
+        file_action = menu.addAction("From File")
+        file_action.triggered.connect(self.on_batch_import_file)
+
+        button.setMenu(menu)
+        self.h_layout.addWidget(button)
+        self.h_layout.setAlignment(
+            button, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop
+        )
+
+    def add_rate_limit_box(self) -> None:
+        """Add a spin box for the speed limit of each new download."""
+        self.rate_limit_box = QSpinBox()
+        self.rate_limit_box.setRange(0, self.MAX_RATE_KBPS)
+        self.rate_limit_box.setSuffix(" KB/s")
+        # 0 is shown as No limit, the download only gets its share of the total
+        self.rate_limit_box.setSpecialValueText("No limit")
+        self.rate_limit_box.setToolTip("Speed limit of each new download")
+        self.h_layout.addWidget(self.rate_limit_box)
+
+    def get_rate_limit(self) -> int | None:
+        """Get the speed limit of new downloads in bytes per second."""
+        return self.rate_limit_box.value() * 1000 or None
+
+    def add_batch_progress_bar(self) -> None:
+        """Add a progress bar for the downloads of the batch, hidden until used."""
+        self.batch_progress_bar = QProgressBar()
+        self.batch_progress_bar.setSizePolicy(
+            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum
+        )
+        self.batch_progress_bar.hide()
+        self.h_layout.addWidget(self.batch_progress_bar)
+
+    def on_batch_import_page(self) -> None:
+        """Import all videos of the current page, e.g. a playlist or channel."""
+        self.start_batch_import([self.browser.url().toString()])
+
+    def on_batch_import_paste(self) -> None:
+        """Import pasted urls."""
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Batch Import", "URLs (one per line):"
+        )
+        if ok:
+            self.start_batch_import(parse_urls(text))
+
+    def on_batch_import_file(self) -> None:
+        """Import the urls of a text file."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Batch Import", "", "Text files (*.txt);;All files (*)"
+        )
+        if path:
+            self.start_batch_import(parse_urls(Path(path).read_text(errors="replace")))
+
+    def get_url_cookies(self, url: str) -> list[Cookie]:
+        """Get the browser cookies for the domain of a url."""
+        return self.browser.get_domain_http_cookies(QUrl(url).host())
+
+    def start_batch_import(self, urls: list[str]) -> None:
+        """Expand the urls in the background and schedule their videos."""
+        if not urls:
+            return
+        # playlists are extracted with the cookies of the first url's site
+        worker = BatchImportWorker(urls, self.get_url_cookies(urls[0]))
+        worker.finished.connect(lambda: self.on_batch_expanded(worker))
+        self.batch_import_workers.append(worker)
         worker.start()
+
+    def on_batch_expanded(self, worker: BatchImportWorker) -> None:
+        """Schedule a download for each video of an expanded batch.
+
+        The jobs are created with one write, their workers only when they start.
+        While a batch is running, new imports are added to it,
+        so there is always one progress view.
+        """
+        worker.wait()
+        self.batch_import_workers.remove(worker)
+        if self.batch is None or self.batch.is_done:
+            self.batch = DownloadBatch()
+            self.batch.progress.connect(self.on_batch_progress)
+        self.batch.add_downloads(len(worker.entry_urls))
+        DownloadScheduler.get_instance().schedule_many(
+            [(url, self.get_url_cookies(url)) for url in worker.entry_urls],
+            notify=False,
+            rate_limit=self.get_rate_limit(),
+            on_started=self.batch.add_worker,
+        )
+
+    def on_batch_progress(self, succeeded: int, failed: int, total: int) -> None:
+        """Show the progress of the batch."""
+        self.batch_progress_bar.setMaximum(total)
+        self.batch_progress_bar.setValue(succeeded + failed)
+        self.batch_progress_bar.setFormat(f"Batch: %v/%m done, {failed} failed")
+        self.batch_progress_bar.show()
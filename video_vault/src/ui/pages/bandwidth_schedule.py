@@ -0,0 +1,130 @@
+"""Bandwidth schedule page module.
+
+This module contains the bandwidth schedule page class for the VideoVault
+application.
+"""
+
+from datetime import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QFormLayout,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QSpinBox,
+    QTimeEdit,
+)
+
+from video_vault.src.core.bandwidth import BandwidthGovernor
+from video_vault.src.core.progress import format_speed
+from video_vault.src.core.queries import QueryRunner
+from video_vault.src.db.models import BandwidthSchedule as BandwidthScheduleModel
+from video_vault.src.ui.pages.base import Base as BasePage
+
+
+class BandwidthSchedule(BasePage):
+    """Bandwidth schedule page for the VideoVault application.
+
+    Lists the windows that limit the total download speed during a time of day
+    and adds or removes them. Running downloads get the new limit right away.
+    """
+
+    # the largest value a QSpinBox holds
+    MAX_RATE_KBPS = 2**31 - 1
+
+    def pre_setup(self) -> None:
+        """Setup the UI."""
+
+    def setup(self) -> None:
+        """Setup the UI."""
+        self.add_windows_list()
+        self.add_window_form()
+
+    def post_setup(self) -> None:
+        """Setup the UI."""
+        self.load_windows()
+
+    def add_windows_list(self) -> None:
+        """Add the list of the windows and a button to remove the selected one."""
+        self.windows_list = QListWidget()
+        self.v_layout.addWidget(self.windows_list)
+
+        self.remove_button = QPushButton("Remove")
+        self.remove_button.clicked.connect(self.on_remove)
+        self.v_layout.addWidget(self.remove_button)
+
+    def add_window_form(self) -> None:
+        """Add the start, end and rate limit of a new window."""
+        self.form_layout = QFormLayout()
+
+        self.start_edit = QTimeEdit()
+        self.start_edit.setDisplayFormat("HH:mm")
+        self.form_layout.addRow("Start", self.start_edit)
+
+        self.end_edit = QTimeEdit()
+        self.end_edit.setDisplayFormat("HH:mm")
+        self.form_layout.addRow("End", self.end_edit)
+
+        self.rate_limit_box = QSpinBox()
+        self.rate_limit_box.setRange(0, self.MAX_RATE_KBPS)
+        self.rate_limit_box.setSuffix(" KB/s")
+        # 0 is shown as Unlimited and saved as an empty rate limit
+        self.rate_limit_box.setSpecialValueText("Unlimited")
+        self.form_layout.addRow("Rate limit", self.rate_limit_box)
+
+        self.v_layout.addLayout(self.form_layout)
+
+        self.add_button = QPushButton("Add")
+        self.add_button.clicked.connect(self.on_add)
+        self.v_layout.addWidget(self.add_button)
+
+    def load_windows(self) -> None:
+        """Load the windows off the UI thread."""
+        QueryRunner.get_instance().run(
+            lambda: list(BandwidthScheduleModel.objects.order_by("start", "end")),
+            self.on_windows_loaded,
+        )
+
+    def on_windows_loaded(self, windows: list[BandwidthScheduleModel]) -> None:
+        """Show the loaded windows."""
+        self.windows_list.clear()
+        for window in windows:
+            item = QListWidgetItem(self.format_window(window))
+            item.setData(Qt.ItemDataRole.UserRole, window.pk)
+            self.windows_list.addItem(item)
+
+    @staticmethod
+    def format_window(window: BandwidthScheduleModel) -> str:
+        """Format a window, e.g. 08:00 - 20:00: 2.0 MB/s."""
+        rate = (
+            "Unlimited"
+            if window.rate_limit is None
+            else format_speed(window.rate_limit)
+        )
+        return f"{window.start:%H:%M} - {window.end:%H:%M}: {rate}"
+
+    def on_add(self) -> None:
+        """Add a window with the entered values."""
+        start = self.start_edit.time()
+        end = self.end_edit.time()
+        BandwidthScheduleModel.add_window(
+            time(start.hour(), start.minute()),
+            time(end.hour(), end.minute()),
+            self.rate_limit_box.value() * 1000 or None,
+        )
+        self.on_windows_changed()
+
+    def on_remove(self) -> None:
+        """Remove the selected window."""
+        items = self.windows_list.selectedItems()
+        if not items:
+            return
+        for item in items:
+            BandwidthScheduleModel.remove_window(item.data(Qt.ItemDataRole.UserRole))
+        self.on_windows_changed()
+
+    def on_windows_changed(self) -> None:
+        """Apply the changed windows to the running downloads and show them."""
+        BandwidthGovernor.get_instance().refresh_schedule(force=True)
+        self.load_windows()
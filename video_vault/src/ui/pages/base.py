@@ -0,0 +1,32 @@
+"""Base page module.
+
+This module contains the base page class for the pages of the VideoVault application.
+"""
+
+from typing import TYPE_CHECKING, cast
+
+from winipyside.src.ui.pages.base.base import Base as BasePage
+
+if TYPE_CHECKING:
+    from video_vault.src.ui.windows.main import VideoVault as VideoVaultWindow
+
+
+class Base(BasePage):
+    """Base page for the VideoVault application.
+
+    The window makes pages when they are first used,
+    so pages get other pages through the window.
+    """
+
+    def get_page[T: BasePage](self, page_cls: type[T]) -> T:
+        """Get a page, it is made if it was not used before."""
+        return self.base_window.get_page(page_cls)
+
+    def find_page[T: BasePage](self, page_cls: type[T]) -> T | None:
+        """Get a page if it was already made."""
+        return cast("VideoVaultWindow", self.base_window).find_page(page_cls)
+
+    def remove_from_window(self) -> None:
+        """Remove the page from the window, it is made again when it is used."""
+        self.get_stack().removeWidget(self)
+        self.deleteLater()
@@ -4,22 +4,26 @@ This module contains the downloads page class for the VideoVault application.
 """
 
 from functools import partial
-from pathlib import Path
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QModelIndex, Qt
 from PySide6.QtWidgets import (
+    QLabel,
+    QListView,
     QMenu,
+    QProgressBar,
     QPushButton,
-    QScrollArea,
     QSizePolicy,
-    QVBoxLayout,
-    QWidget,
 )
-from winipyside.src.ui.pages.base.base import Base as BasePage
-from winiutils.src.data.structures.dicts import reverse_dict
 
+from video_vault.src.core.deletion import DeletionQueue
+from video_vault.src.core.playback import PositionCheckpoints
+from video_vault.src.core.progress import ProgressTracker, format_speed
+from video_vault.src.core.queries import QueryRunner
+from video_vault.src.core.scheduler import DownloadScheduler
 from video_vault.src.db.models import File
+from video_vault.src.ui.models.downloads import DownloadRow, DownloadsListModel
 from video_vault.src.ui.pages.add_downloads import AddDownloads as AddDownloadsPage
+from video_vault.src.ui.pages.base import Base as BasePage
 from video_vault.src.ui.pages.player import Player as PlayerPage
 
 
@@ -33,8 +37,11 @@ class Downloads(BasePage):
         """Setup the UI."""
         # add button in the top right to add a download
         self.add_delete_all_downloads_button()
+        self.add_deletion_progress_bar()
+        self.add_download_progress_label()
+        self.add_cancel_downloads_button()
         self.add_add_downloads_button()
-        self.add_download_buttons_scroll_area()
+        self.add_downloads_list_view()
 
     def post_setup(self) -> None:
         """Setup the UI."""
@@ -54,11 +61,66 @@ class Downloads(BasePage):
         button.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum)
 
     def on_delete_all_downloads(self) -> None:
-        """Delete all downloads."""
-        download_to_button = reverse_dict(self.button_to_download)
-        for download in File.objects.all():
-            button = download_to_button[download]
-            self.remove_download_and_button(button)
+        """Delete all downloads.
+
+        The rows are deleted at once, the files are removed in the background.
+        """
+        self.stop_playback()
+        DeletionQueue.get_instance().delete(File.objects.all())
+        self.downloads_model.reload()
+
+    def add_deletion_progress_bar(self) -> None:
+        """Add a progress bar for the removal of files, hidden until used."""
+        self.deletion_progress_bar = QProgressBar()
+        self.deletion_progress_bar.setSizePolicy(
+            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum
+        )
+        self.deletion_progress_bar.hide()
+        self.h_layout.addWidget(self.deletion_progress_bar)
+        DeletionQueue.get_instance().progress.connect(self.on_deletion_progress)
+
+    def on_deletion_progress(self, removed: int, total: int) -> None:
+        """Show the progress of the removal of files until it is done."""
+        if removed >= total:
+            self.deletion_progress_bar.hide()
+            return
+        self.deletion_progress_bar.setMaximum(total)
+        self.deletion_progress_bar.setValue(removed)
+        self.deletion_progress_bar.setFormat("Removing files: %v/%m")
+        self.deletion_progress_bar.show()
+
+    def add_download_progress_label(self) -> None:
+        """Add a label with the total speed of the downloads, hidden until used."""
+        self.download_progress_label = QLabel()
+        self.download_progress_label.hide()
+        self.h_layout.addWidget(self.download_progress_label)
+        ProgressTracker.get_instance().changed.connect(self.on_download_progress)
+
+    def on_download_progress(self, active: int, speed: float) -> None:
+        """Show the number of active downloads and their total speed."""
+        if not active:
+            self.download_progress_label.hide()
+            self.cancel_downloads_button.hide()
+            return
+        self.download_progress_label.setText(
+            f"Downloading {active}: {format_speed(speed)}"
+        )
+        self.download_progress_label.show()
+        self.cancel_downloads_button.show()
+
+    def add_cancel_downloads_button(self) -> None:
+        """Add a button to cancel all downloads, hidden while none are active."""
+        self.cancel_downloads_button = QPushButton("Cancel")
+        self.cancel_downloads_button.setSizePolicy(
+            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Minimum
+        )
+        self.cancel_downloads_button.clicked.connect(self.on_cancel_downloads)
+        self.cancel_downloads_button.hide()
+        self.h_layout.addWidget(self.cancel_downloads_button)
+
+    def on_cancel_downloads(self) -> None:
+        """Cancel all queued and running downloads."""
+        DownloadScheduler.get_instance().cancel_all()
 
     def add_add_downloads_button(self) -> None:
         """Add a button to add a download."""
@@ -75,73 +137,121 @@ class Downloads(BasePage):
             button, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop
         )
 
-    def add_download_buttons_scroll_area(self) -> None:
-        """Add a list of downloads to scroll through and on click the video plays."""
-        self.downloads = File.objects.all().order_by("-created_at")
+    def add_downloads_list_view(self) -> None:
+        """Add a list of downloads to scroll through and on click a menu to play.
+
+        The list is a view over a model that loads the downloads page by page
+        while scrolling, so only the shown rows are queried and painted.
+        """
+        self.downloads_model = DownloadsListModel()
+
+        self.downloads_view = QListView()
+        self.downloads_view.setModel(self.downloads_model)
+        # all rows have the same height, so the view does not measure each row
+        self.downloads_view.setUniformItemSizes(True)
+        self.downloads_view.setSpacing(5)
+        self.downloads_view.clicked.connect(self.on_download_clicked)
 
-        self.downloads_widget = QWidget()
-        self.downloads_layout = QVBoxLayout(self.downloads_widget)
-        self.downloads_layout.setSpacing(10)
-        self.downloads_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.add_download_menu()
 
-        # for each download add a button with the name of the download
-        self.button_to_download: dict[QPushButton, File] = {}
-        for download in self.downloads:
-            self.add_download_button(download)
+        self.v_layout.addWidget(self.downloads_view)
 
-        # Scroll area setup
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.downloads_widget)
+    def add_download_menu(self) -> None:
+        """Add the menu with play and delete, shared by all downloads."""
+        self.menu_row: DownloadRow | None = None
+        self.menu_file: File | None = None
+        self.download_menu = QMenu(self)
 
-        # Add the scroll area to the main layout
-        self.v_layout.addWidget(scroll_area)
+        play_action = self.download_menu.addAction("Play")
+        play_action.setIcon(self.get_svg_icon("play_icon"))
+        play_action.triggered.connect(self.on_play_action)
+
+        delete_action = self.download_menu.addAction("Delete")
+        delete_action.setIcon(self.get_svg_icon("delete_garbage_can"))
+        delete_action.triggered.connect(self.on_delete_action)
+
+    def on_download_clicked(self, index: QModelIndex) -> None:
+        """Show the menu for the clicked download below its row."""
+        self.menu_row = self.downloads_model.get_download_row(index)
+        if self.menu_row is None:
+            return
+        # fetch the file while the menu is open, so the actions do not wait for it
+        self.menu_file = None
+        QueryRunner.get_instance().run(
+            self.menu_row.get_file, partial(self.on_menu_file_loaded, self.menu_row)
+        )
+        row_rect = self.downloads_view.visualRect(index)
+        self.download_menu.popup(
+            self.downloads_view.viewport().mapToGlobal(row_rect.bottomLeft())
+        )
+
+    def on_menu_file_loaded(self, row: DownloadRow, file: File | None) -> None:
+        """Keep the file fetched for the menu, a row whose file is gone is removed."""
+        if file is None:
+            self.downloads_model.remove_row(row.pk)
+        if row is self.menu_row:
+            self.menu_file = file
+
+    def get_menu_file(self) -> File | None:
+        """Get the file of the row the menu was opened for.
+
+        Only the row is listed, the full file is fetched when the menu opens.
+        If it has not arrived yet, it is fetched now.
+        A row whose file is gone is removed.
+        """
+        if self.menu_row is None:
+            return None
+        if self.menu_file is not None and self.menu_file.pk == self.menu_row.pk:
+            return self.menu_file
+        file = self.menu_row.get_file()
+        if file is None:
+            self.downloads_model.remove_row(self.menu_row.pk)
+        return file
+
+    def on_play_action(self) -> None:
+        """Play the download the menu was opened for."""
+        file = self.get_menu_file()
+        if file is not None:
+            self.play_download(file)
+
+    def on_delete_action(self) -> None:
+        """Delete the download the menu was opened for."""
+        file = self.get_menu_file()
+        if file is not None:
+            self.remove_download(file)
+        self.menu_row = None
+        self.menu_file = None
 
     def play_download(self, download: File) -> None:
         """Play the video."""
-        download.refresh_from_db()
-
         player_page = self.get_page(PlayerPage)
 
         # if already a video is playing then save its position
-        if player_page.current_file is not None:
-            player_page.current_file.last_position = player_page.media_player.position()
-            player_page.current_file.save()
-        player_page.current_file = download
-
-        player_page.start_playback(Path(download.file.path), download.last_position)
-
-    def add_download_button(self, download: File) -> None:
-        """Add a download to the list."""
-        # check if display name
-        button = QPushButton(download.display_name)
-        self.button_to_download[button] = download
-        self.downloads_layout.addWidget(button)
-        # give the button a QMenu with play and delete
-        menu = QMenu(button)
-
-        play_action = menu.addAction("Play")
-        play_action.setIcon(self.get_svg_icon("play_icon"))
-        play_action.triggered.connect(partial(self.play_download, download))
+        player_page.record_position()
+        PositionCheckpoints.get_instance().flush()
 
-        delete_action = menu.addAction("Delete")
-        delete_action.setIcon(self.get_svg_icon("delete_garbage_can"))
-        delete_action.triggered.connect(
-            partial(self.remove_download_and_button, button)
-        )
+        player_page.play_cached_download(download)
 
-        button.setMenu(menu)
+    def add_download(self, download: File) -> None:
+        """Add a new download to the top of the list."""
+        self.downloads_model.add_file(download)
 
-    def remove_download_and_button(self, download_button: QPushButton) -> None:
-        """Remove a download from the list."""
+    def remove_download(self, download: File) -> None:
+        """Delete a download and remove it from the list."""
         # stop the player if the current file is the one being deleted
+        self.stop_playback(download)
 
-        file = self.button_to_download[download_button]
-        player_page = self.get_page(PlayerPage)
-        if player_page.current_file == file:
-            player_page.stop_playback()
+        DeletionQueue.get_instance().delete(File.objects.filter(pk=download.pk))
+        self.downloads_model.remove_row(download.pk)
+
+    def stop_playback(self, download: File | None = None) -> None:
+        """Stop the player if it plays the download or, without one, anything.
 
-        file.delete_file()
-        self.downloads_layout.removeWidget(download_button)
-        download_button.deleteLater()
-        del self.button_to_download[download_button]
+        The player page is not made just to stop it, if it was not made
+        nothing is playing.
+        """
+        player_page = self.find_page(PlayerPage)
+        if player_page is None:
+            return
+        if download is None or player_page.current_file == download:
+            player_page.stop_playback()
@@ -0,0 +1,94 @@
+"""Network settings page module.
+
+This module contains the network settings page class for the VideoVault application.
+"""
+
+from functools import partial
+
+from PySide6.QtWidgets import QFormLayout, QLineEdit, QPushButton, QSpinBox
+
+from video_vault.src.core.queries import QueryRunner
+from video_vault.src.db.models import NetworkSettings as NetworkSettingsModel
+from video_vault.src.ui.pages.base import Base as BasePage
+
+
+class NetworkSettings(BasePage):
+    """Network settings page for the VideoVault application.
+
+    Edits the NetworkSettings of a domain, an empty domain edits the settings
+    of all downloads. A setting left at Default falls back to the less specific
+    settings and then to the built-in defaults.
+    """
+
+    # the largest value a QSpinBox holds, e.g. a chunk size of 2 GB
+    MAX_VALUE = 2**31 - 1
+
+    def pre_setup(self) -> None:
+        """Setup the UI."""
+
+    def setup(self) -> None:
+        """Setup the UI."""
+        self.add_settings_form()
+        self.add_save_button()
+
+    def post_setup(self) -> None:
+        """Setup the UI."""
+        self.load_settings()
+
+    def add_settings_form(self) -> None:
+        """Add the domain and a spin box per setting."""
+        self.form_layout = QFormLayout()
+
+        self.domain_edit = QLineEdit()
+        self.domain_edit.setPlaceholderText("All domains")
+        self.domain_edit.editingFinished.connect(self.load_settings)
+        self.form_layout.addRow("Domain", self.domain_edit)
+
+        self.spin_boxes: dict[str, QSpinBox] = {}
+        for name in NetworkSettingsModel.DEFAULTS:
+            spin_box = QSpinBox()
+            spin_box.setRange(0, self.MAX_VALUE)
+            # 0 is shown as Default and saved as an empty setting
+            spin_box.setSpecialValueText("Default")
+            self.spin_boxes[name] = spin_box
+            self.form_layout.addRow(name.replace("_", " ").capitalize(), spin_box)
+
+        self.v_layout.addLayout(self.form_layout)
+
+    def add_save_button(self) -> None:
+        """Add a button to save the settings of the domain."""
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.on_save)
+        self.v_layout.addWidget(self.save_button)
+
+    def get_domain(self) -> str:
+        """Get the entered domain, hosts are matched in lowercase."""
+        return self.domain_edit.text().strip().lower()
+
+    def load_settings(self) -> None:
+        """Load the settings of the entered domain off the UI thread."""
+        domain = self.get_domain()
+        QueryRunner.get_instance().run(
+            NetworkSettingsModel.objects.filter(domain=domain).first,
+            partial(self.on_settings_loaded, domain),
+        )
+
+    def on_settings_loaded(
+        self, domain: str, settings: NetworkSettingsModel | None
+    ) -> None:
+        """Show the loaded settings, unless another domain was entered meanwhile."""
+        if domain != self.get_domain():
+            return
+        overrides = settings.get_overrides() if settings is not None else {}
+        for name, spin_box in self.spin_boxes.items():
+            spin_box.setValue(overrides.get(name, 0))
+
+    def on_save(self) -> None:
+        """Save the settings of the entered domain."""
+        NetworkSettingsModel.save_overrides(
+            self.get_domain(),
+            {
+                name: spin_box.value() or None
+                for name, spin_box in self.spin_boxes.items()
+            },
+        )
@@ -3,16 +3,27 @@
 This module contains the player page class for the VideoVault application.
 """
 
+from functools import partial
 from pathlib import Path
 
+from PySide6.QtCore import QTimer
 from winipyside.src.ui.pages.player import Player as PlayerPage
 
+from video_vault.src.core.playback import PositionCheckpoints
+from video_vault.src.core.queries import QueryRunner
 from video_vault.src.core.security import get_or_create_app_aes_gcm
 from video_vault.src.db.models import File
+from video_vault.src.ui.pages.base import Base as BasePage
 
 
-class Player(PlayerPage):
-    """Player page for the VideoVault application."""
+class Player(BasePage, PlayerPage):
+    """Player page for the VideoVault application.
+
+    The position of the current file is sampled every POSITION_INTERVAL_MS
+    and checkpointed, so it survives a crash.
+    """
+
+    POSITION_INTERVAL_MS = 1000
 
     def pre_setup(self) -> None:
         """Setup the UI."""
@@ -20,13 +31,61 @@ class Player(PlayerPage):
     def post_setup(self) -> None:
         """Setup the UI."""
         self.current_file: File | None = None
+        self.add_position_timer()
+
+    def add_position_timer(self) -> None:
+        """Add the timer that samples the playback position."""
+        self.position_timer = QTimer(self)
+        self.position_timer.setInterval(self.POSITION_INTERVAL_MS)
+        self.position_timer.timeout.connect(self.record_position)
+        self.position_timer.start()
+
+    def record_position(self) -> None:
+        """Record the position of the current file as a checkpoint."""
+        if self.current_file is None:
+            return
+        self.current_file.last_position = self.media_player.position()
+        PositionCheckpoints.get_instance().record(
+            self.current_file.pk, self.current_file.last_position
+        )
 
     def play_download(self, download: File) -> None:
         """Play the video."""
         self.stop_playback()
-        download.refresh_from_db()
+        self.play_cached_download(download)
+
+    def play_cached_download(self, download: File) -> None:
+        """Play the video from the given row without waiting for the database.
+
+        The row is refreshed off the UI thread and reconciled
+        in on_download_refreshed.
+        """
+        download.last_position = PositionCheckpoints.get_instance().get_position(
+            download.pk, download.last_position
+        )
         self.current_file = download
         self.start_playback(Path(download.file.path), download.last_position)
+        QueryRunner.get_instance().run(
+            File.objects.filter(pk=download.pk).first,
+            partial(self.on_download_refreshed, download),
+        )
+
+    def on_download_refreshed(self, download: File, fresh: File | None) -> None:
+        """Reconcile the playing video with its row from the database."""
+        if self.current_file is not download:
+            # another video was started in the meantime
+            return
+        if fresh is None:
+            # deleted while it was refreshed
+            self.current_file = None
+            self.media_player.stop_and_close_io_device()
+            return
+        position = PositionCheckpoints.get_instance().get_position(
+            fresh.pk, fresh.last_position
+        )
+        if position != download.last_position:
+            download.last_position = position
+            self.media_player.setPosition(position)
 
     def start_playback(self, path: Path, position: int = 0) -> None:
         """Start playback."""
@@ -37,7 +96,7 @@ class Player(PlayerPage):
         """Stop playback."""
         if self.current_file is None:
             return
-        self.current_file.last_position = self.media_player.position()
-        self.current_file.save()
+        self.record_position()
+        PositionCheckpoints.get_instance().flush()
         self.current_file = None
         self.media_player.stop_and_close_io_device()
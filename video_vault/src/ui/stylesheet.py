@@ -44,6 +44,26 @@ QPushButton:pressed {{
     background-color: {ACCENT_PRESSED};
 }}
 
+QListView {{
+    border: none;
+}}
+
+QListView::item {{
+    background-color: {ACCENT_PRIMARY};
+    color: {TEXT_PRIMARY};
+    border-radius: {RADIUS_SMALL};
+    padding: {PADDING_BUTTON};
+    font-weight: bold;
+}}
+
+QListView::item:hover {{
+    background-color: {ACCENT_HOVER};
+}}
+
+QListView::item:selected {{
+    background-color: {ACCENT_PRESSED};
+}}
+
 QMenu {{
     background-color: {ACCENT_PRIMARY};
     color: {TEXT_PRIMARY};
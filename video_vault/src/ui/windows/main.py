@@ -3,15 +3,33 @@
 This module contains the main window class for the VideoVault application.
 """
 
+import logging
+import time
+from typing import ClassVar
+
+from PySide6.QtCore import QTimer
 from winipyside.src.ui.pages.base.base import Base as BasePage
 from winipyside.src.ui.windows.base.base import Base as BaseWindow
 
+from video_vault.src.core.deletion import DeletionQueue
+from video_vault.src.core.scheduler import DownloadScheduler
 from video_vault.src.ui import pages
 from video_vault.src.ui.pages.downloads import Downloads as DownloadsPage
+from video_vault.src.ui.pages.player import Player as PlayerPage
+
+logger = logging.getLogger(__name__)
 
 
 class VideoVault(BaseWindow):
-    """Main window for the VideoVault application."""
+    """Main window for the VideoVault application.
+
+    Only the start page is made with the window, the other pages are made
+    when they are first used or warmed up after the window is shown.
+    """
+
+    # pages to make in the background, the browser is left out on purpose
+    WARM_UP_PAGE_CLASSES: ClassVar[tuple[type[BasePage], ...]] = (PlayerPage,)
+    WARM_UP_DELAY_MS = 1000
 
     @classmethod
     def get_all_page_classes(cls) -> list[type[BasePage]]:
@@ -34,3 +52,37 @@ class VideoVault(BaseWindow):
 
     def post_setup(self) -> None:
         """Setup the UI."""
+        # continue downloads that were queued or running when the app was closed
+        DownloadScheduler.get_instance().resume_unfinished()
+        # remove the files of downloads that were deleted before the app was closed
+        DeletionQueue.get_instance().resume()
+        QTimer.singleShot(self.WARM_UP_DELAY_MS, self.warm_up_pages)
+
+    def make_pages(self) -> None:
+        """Make the start page, the other pages are made when they are first used."""
+        self.get_page(self.get_start_page_cls())
+
+    def get_page[T: BasePage](self, page_cls: type[T]) -> T:
+        """Get a page, it is made if it was not used before."""
+        page = self.find_page(page_cls)
+        if page is None:
+            start = time.perf_counter()
+            page = page_cls(base_window=self)
+            logger.info(
+                "Made page %s in %.1f ms",
+                page_cls.__name__,
+                (time.perf_counter() - start) * 1000,
+            )
+        return page
+
+    def find_page[T: BasePage](self, page_cls: type[T]) -> T | None:
+        """Get a page if it was already made."""
+        for page in self.get_stack_pages():
+            if page.__class__ is page_cls:
+                return page
+        return None
+
+    def warm_up_pages(self) -> None:
+        """Make the pages that should be ready before they are first used."""
+        for page_cls in self.WARM_UP_PAGE_CLASSES:
+            self.get_page(page_cls)